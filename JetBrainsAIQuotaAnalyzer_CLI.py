@@ -8,19 +8,65 @@ JetBrains AI Assistant Quota Analyzer (CLI Version)
 """
 
 import argparse
+import contextlib
+import copy
+import heapq
+import importlib.util
+import itertools
 import json
+import mmap
 import os
-import platform
-import socket
-import sqlite3
-import subprocess
+import queue
+import re
+import select
+import struct
 import sys
-import traceback
-import xml.etree.ElementTree as ET
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from typing import Optional
 
-from translations import get_translations
+
+def _lazy_import(name):
+    """
+    延迟导入模块：返回的模块对象在第一次访问属性时才真正执行导入。
+    只有部分命令才用到的模块（sqlite3、ElementTree、zipfile 等）不再拖慢每次启动，
+    在 shell 提示符或钩子中频繁调用本工具时尤其明显
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or not hasattr(spec.loader, "exec_module"):
+        # 不支持延迟加载的加载器（例如部分打包环境）直接导入
+        return importlib.import_module(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def _load_lazy_modules(*modules):
+    """
+    在当前线程中完成延迟导入模块的加载。Python 3.11 及更早版本的 LazyLoader 不是线程安全的：
+    多个线程同时第一次访问同一个模块时，其他线程可能看到只初始化了一半的模块，
+    因此在线程池中使用的延迟导入模块要在启动线程池之前加载
+    """
+    for module in modules:
+        getattr(module, "__name__")
+
+
+ET = _lazy_import("xml.etree.ElementTree")
+concurrent_futures = _lazy_import("concurrent.futures")
+gzip = _lazy_import("gzip")
+hashlib = _lazy_import("hashlib")
+pathlib = _lazy_import("pathlib")
+platform = _lazy_import("platform")
+sqlite3 = _lazy_import("sqlite3")
+traceback = _lazy_import("traceback")
+zipfile = _lazy_import("zipfile")
 
 # 语言设置
 DEFAULT_LANGUAGE = "zh_cn"  # 默认使用中文
@@ -28,8 +74,11 @@ SUPPORTED_LANGUAGES = ["zh_cn", "en"]  # 支持的语言列表
 current_language = DEFAULT_LANGUAGE
 
 # 导入颜色支持
+# colorama 的颜色常量就是 ANSI 转义序列，直接使用相同的字面量即可；只有 Windows 控制台需要
+# colorama 转换转义序列，所以只在 Windows 上导入并初始化，其他平台只检查 colorama 是否已安装
 try:
-    from colorama import init, Fore, Back, Style
+    if importlib.util.find_spec("colorama") is None:
+        raise ImportError("colorama")
 
     colorama_initialized = False
 
@@ -37,42 +86,63 @@ try:
     def init_colorama():
         global colorama_initialized
         if not colorama_initialized:
+            from colorama import init
             init(autoreset=True, strip=False)  # 确保颜色代码被正确处理
             colorama_initialized = True
 
 
-    # 立即初始化 colorama
-    init_colorama()
+    if sys.platform == "win32":
+        init_colorama()
+
+
+    class _Fore:
+        RED = "\033[31m"
+        GREEN = "\033[32m"
+        YELLOW = "\033[33m"
+        BLUE = "\033[34m"
+        CYAN = "\033[36m"
+        WHITE = "\033[37m"
+
+
+    class _Back:
+        BLACK = "\033[40m"
+        BLUE = "\033[44m"
+
+
+    class _Style:
+        BRIGHT = "\033[1m"
+        DIM = "\033[2m"
+        RESET_ALL = "\033[0m"
 
 
     # 定义颜色常量
     class Colors:
-        HEADER = Fore.CYAN + Style.BRIGHT
-        INFO = Fore.BLUE + Style.BRIGHT
-        SUCCESS = Fore.GREEN + Style.BRIGHT
-        WARNING = Fore.YELLOW + Style.BRIGHT
-        ERROR = Fore.RED + Style.BRIGHT
-        RESET = Style.RESET_ALL
+        HEADER = _Fore.CYAN + _Style.BRIGHT
+        INFO = _Fore.BLUE + _Style.BRIGHT
+        SUCCESS = _Fore.GREEN + _Style.BRIGHT
+        WARNING = _Fore.YELLOW + _Style.BRIGHT
+        ERROR = _Fore.RED + _Style.BRIGHT
+        RESET = _Style.RESET_ALL
 
         # 进度条颜色
-        PROGRESS_LOW = Fore.GREEN
-        PROGRESS_MEDIUM = Fore.YELLOW
-        PROGRESS_HIGH = Fore.RED
+        PROGRESS_LOW = _Fore.GREEN
+        PROGRESS_MEDIUM = _Fore.YELLOW
+        PROGRESS_HIGH = _Fore.RED
 
         # 菜单颜色
-        MENU_TITLE = Fore.CYAN + Style.BRIGHT
-        MENU_ITEM = Fore.WHITE + Style.BRIGHT
-        MENU_PROMPT = Fore.YELLOW + Style.BRIGHT
+        MENU_TITLE = _Fore.CYAN + _Style.BRIGHT
+        MENU_ITEM = _Fore.WHITE + _Style.BRIGHT
+        MENU_PROMPT = _Fore.YELLOW + _Style.BRIGHT
 
         # 其他样式
-        BG_BLACK = Back.BLACK
-        DIM = Style.DIM
-        BOLD = Style.BRIGHT
+        BG_BLACK = _Back.BLACK
+        DIM = _Style.DIM
+        BOLD = _Style.BRIGHT
 
         # 表格样式
-        TABLE_HEADER = Fore.CYAN + Style.BRIGHT + Back.BLUE
-        TABLE_ROW_ODD = Back.BLACK  # 奇数行使用黑色背景
-        TABLE_ROW_EVEN = Back.BLUE + Style.DIM  # 偶数行使用暗蓝色背景
+        TABLE_HEADER = _Fore.CYAN + _Style.BRIGHT + _Back.BLUE
+        TABLE_ROW_ODD = _Back.BLACK  # 奇数行使用黑色背景
+        TABLE_ROW_EVEN = _Back.BLUE + _Style.DIM  # 偶数行使用暗蓝色背景
 except ImportError:
     # 如果colorama不可用，使用空字符串作为替代
     class Colors:
@@ -91,10 +161,56 @@ except ImportError:
 VERSION = "1.0.0"
 
 # 全局变量
-LOCK_PORT = 12345  # 用于确保只有一个实例运行的端口
-
-# 翻译字典，使用语义化键
-TRANSLATIONS = get_translations()
+SCHEMA_VERSION = 10  # 数据库结构版本，保存在 PRAGMA user_version 中
+LOCK_FILE_NAME = "app.lock"  # 配置目录中的应用程序锁文件
+QUOTA_FILE_NAME = "AIAssistantQuotaManager2.xml"  # 配额文件名
+QUOTA_OPTION_NAMES = ("quotaInfo", "nextRefill")  # 配额文件中需要解析的 option
+XML_STREAM_CHUNK_SIZE = 64 * 1024  # 流式解析XML时每次读取的字节数
+HASH_CHUNK_SIZE = 64 * 1024  # 计算文件指纹时每次读取的字节数
+DISCOVERY_MAX_WORKERS = 8  # 查找配额文件时的并发线程数
+ANALYSIS_MAX_WORKERS = 8  # 批量分析配额文件时的并发线程数
+WATCH_DEBOUNCE_SECONDS = 1.0  # 监视模式下文件变化后的默认防抖时间
+WATCH_POLL_INTERVAL = 2.0  # 监视模式下轮询文件状态的默认间隔
+LOG_DEFAULT_ENTRIES = 20  # --logs 默认显示的事件数，与 scripts/check_quota_logs.sh 一致
+LOG_READ_BLOCK_SIZE = 64 * 1024  # 从末尾倒序读取日志时每次读取的字节数
+LOG_SCAN_CHUNK_SIZE = 64 * 1024 * 1024  # 多进程扫描大日志时每个块的大小
+LOG_DECOMPRESS_BLOCK_SIZE = 1024 * 1024  # 流式解压日志包时每次读取的字节数
+COMPRESSED_LOG_SUFFIXES = (".gz", ".zip")  # 支持直接读取的日志包格式
+DB_BUSY_TIMEOUT = 10.0  # 数据库被其他进程锁定时的最长等待时间（秒）
+DB_CACHE_SIZE_KB = 8192  # SQLite 页缓存大小（KB）
+HISTORY_WRITER_BATCH_SIZE = 256  # 后台写入器每批最多写入的历史记录数
+HISTORY_WRITER_MAX_DELAY = 0.5  # 后台写入器收到第一条记录后最长等待多久提交（秒）
+HISTORY_WRITER_QUEUE_SIZE = 4096  # 后台写入器队列容量，队列满时调用方阻塞
+HISTORY_JOURNAL_KEEP = 100  # 历史日志压缩后保留的记录数（与旧版 history.json 相同）
+HISTORY_JOURNAL_MAX_BYTES = 256 * 1024  # 历史日志超过该大小时压缩
+HISTORY_MIGRATION_BATCH_SIZE = 500  # 把 JSON 历史日志导入数据库时每批读取的记录数
+FRECENCY_DECAY_DAYS = 14  # 推荐路径的使用次数权重按 1 / (1 + 未使用天数 / N) 衰减，未使用 N 天时降为一半、2N 天时降为三分之一
+HISTORY_PAGE_SIZE = 100  # 分页读取历史记录时每页的默认行数
+HISTORY_RETENTION_DAYS = 90  # 默认保留原始历史记录的天数，更早的记录汇总到小时和天统计表
+HISTORY_COMPACTION_BATCH_SIZE = 500  # 每个压缩事务最多汇总的原始记录数
+HISTORY_COMPACTION_MAX_BATCHES = 20  # 每次压缩最多执行的事务数，剩余的留到下次
+ROLLUP_TABLES = {"hourly": "history_hourly", "daily": "history_daily"}  # 汇总粒度及对应的表
+ROLLUP_HOURLY_MAX_DAYS = 3  # 查询超出保留期的时间范围不超过该天数时显示小时统计，否则显示天统计
+QUOTA_LOG_MARKER = b"QuotaManager2"  # idea.log 中配额相关日志的标记
+QUOTA_LOG_KEYWORDS = ("New quota state", "quota refill", "Quota update requested")  # 需要显示的配额事件
+QUOTA_LOG_AVAILABLE = "New quota state is: Available"  # 包含配额数值的事件
+TOOLBOX_SCAN_DEPTH = 5  # 在 Toolbox 安装目录中查找 bin/idea.properties 的最大深度
+DISCOVERY_INDEX_RACY_SECONDS = 2  # 修改时间距今不足该秒数的目录不写入发现索引，避免同一时间戳内的再次修改被忽略
+CONFIG_DIR_MARKER = ".writable"  # 配置目录通过写入测试后留下的标记文件，之后启动时不再重复测试
+
+# 当前语言的扁平翻译目录 {键: 文本}，第一次调用 t() 时才加载，切换语言后重新加载
+_catalog = None
+_catalog_language = None
+
+
+def _get_catalog():
+    """返回当前语言的翻译目录（只加载当前语言，其他语言的文本不会被导入）"""
+    global _catalog, _catalog_language
+    if _catalog_language != current_language:
+        from translations import load_catalog
+        _catalog = load_catalog(current_language)
+        _catalog_language = current_language
+    return _catalog
 
 
 def set_language(language: str):
@@ -122,8 +238,9 @@ def t(key: str, default: Optional[str] = None) -> str:
     Returns:
         翻译后的文本
     """
-    if key in TRANSLATIONS and current_language in TRANSLATIONS[key]:
-        return TRANSLATIONS[key][current_language]
+    text = (_catalog if _catalog_language == current_language else _get_catalog()).get(key)
+    if text is not None:
+        return text
     return default or key
 
 
@@ -149,87 +266,144 @@ def print_diagnostic_info():
             f"{Colors.INFO}{t('file_system_permissions')} {Colors.RESET}{t('error_with_msg').format(error=e)}{Colors.RESET}")
 
 
-# 使用套接字实现单例模式
-class SocketSingleInstance:
+class AppLock:
     """
-    使用套接字实现单例模式，确保应用程序只有一个实例在运行
+    应用程序锁：对配置目录中的锁文件加咨询锁（fcntl.flock，Windows 上为 LockFileEx）。
+    每个实例运行期间都持有共享锁，只在压缩历史记录时短暂转换为排他锁，因此压缩只会在没有其他实例
+    运行时进行；锁随文件描述符关闭或进程退出自动释放，不会像端口一样被其他程序占用，也不需要检查残留进程
     """
 
-    def __init__(self, port=LOCK_PORT):
-        self.port = port
-        self.sock = None
-        self.locked = False
-        self._try_lock()
+    SHARED = "shared"
+    EXCLUSIVE = "exclusive"
+
+    def __init__(self, lock_file):
+        self.lock_file = lock_file
+        self.mode = None  # 当前持有的锁模式，None 表示未持有
+        self.acquire_ms = 0.0  # 最近一次获取锁的耗时（毫秒）
+        self._fd = None
+
+    def acquire(self, exclusive=False, blocking=False):
+        """
+        获取共享锁或排他锁（已持有锁时转换锁模式），成功返回 True
 
-    def _try_lock(self):
-        """尝试获取锁"""
+        Args:
+            blocking: 是否等待其他实例释放排他锁；为 False 时无法立即获取就返回 False
+        """
+        start = time.perf_counter()
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.sock.bind(('127.0.0.1', self.port))
-            self.sock.listen(1)
-            self.locked = True
-            print(f"{Colors.INFO}{t('app_lock_success').format(port=self.port)}{Colors.RESET}")
-        except socket.error as e:
-            self.sock = None
-            self.locked = False
-            print(f"{Colors.INFO}{t('app_lock_failure').format(port=self.port, error=e)}{Colors.RESET}")
-
-    def is_running(self):
-        """检查应用程序是否已经在运行"""
-        return not self.locked
+            if self._fd is None:
+                self._fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+            self._lock(exclusive, blocking)
+            self.mode = self.EXCLUSIVE if exclusive else self.SHARED
+            return True
+        except OSError:
+            if self.mode == self.SHARED and exclusive:
+                # flock 转换锁模式不是原子操作，转换失败后重新获取原来的共享锁（等待正在压缩的实例完成）
+                try:
+                    self._lock(False, True)
+                except OSError:
+                    self.mode = None
+            return False
+        finally:
+            self.acquire_ms = (time.perf_counter() - start) * 1000
+
+    def _lock(self, exclusive, blocking=False):
+        """对锁文件加锁，非阻塞方式无法立即获取时抛出 OSError"""
+        if sys.platform == "win32":
+            self._lock_windows(exclusive, blocking)
+            return
+        import fcntl
+        flags = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        fcntl.flock(self._fd, flags if blocking else flags | fcntl.LOCK_NB)
+
+    def _lock_windows(self, exclusive, blocking):
+        """
+        Windows 没有 flock：用 LockFileEx 对锁文件的第一个字节加共享锁或排他锁（msvcrt.locking 只支持排他锁）。
+        同一句柄上的锁不会互相转换，转换模式时先解除原来的锁，与 flock 一样不是原子操作
+        """
+        import ctypes
+        import msvcrt
+        from ctypes import wintypes
+
+        class Overlapped(ctypes.Structure):
+            _fields_ = [("Internal", ctypes.c_size_t), ("InternalHigh", ctypes.c_size_t),
+                        ("Offset", wintypes.DWORD), ("OffsetHigh", wintypes.DWORD), ("hEvent", wintypes.HANDLE)]
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        handle = wintypes.HANDLE(msvcrt.get_osfhandle(self._fd))
+        if self.mode is not None:
+            # 原来的锁已经解除时（转换失败后重新获取）UnlockFileEx 返回失败，忽略即可
+            kernel32.UnlockFileEx(handle, 0, 1, 0, ctypes.byref(Overlapped()))
+        flags = (0x2 if exclusive else 0) | (0 if blocking else 0x1)  # LOCKFILE_EXCLUSIVE_LOCK, LOCKFILE_FAIL_IMMEDIATELY
+        if not kernel32.LockFileEx(handle, flags, 0, 1, 0, ctypes.byref(Overlapped())):
+            raise ctypes.WinError(ctypes.get_last_error())
 
     def release(self):
-        """释放锁"""
-        if self.sock:
-            try:
-                self.sock.close()
-                print(f"{Colors.INFO}{t('app_lock_released').format(port=self.port)}{Colors.RESET}")
-            except:
-                pass
-            self.sock = None
-            self.locked = False
+        """释放锁并关闭锁文件（关闭文件时操作系统释放它持有的锁）"""
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        self.mode = None
+
+    def print_status(self):
+        """打印锁的模式和获取耗时（诊断信息）"""
+        if self.mode:
+            message = t('app_lock_success').format(mode=t('lock_mode_' + self.mode), path=self.lock_file,
+                                                   ms=self.acquire_ms)
+            print(f"{Colors.INFO}{message}{Colors.RESET}")
+        else:
+            print(f"{Colors.INFO}{t('app_lock_failure').format(path=self.lock_file, ms=self.acquire_ms)}{Colors.RESET}")
+
 
-    def __del__(self):
-        """析构函数，释放锁"""
-        self.release()
+def _unescape_option_value(value):
+    """还原 option 值中残留的转义字符（只有包含 & 时才需要替换）"""
+    if "&" in value:
+        value = value.replace("&#10;", "\n").replace("&quot;", "\"")
+    return value
 
 
-# 进程检查和清理功能
-def check_and_clean_processes():
-    """检查并清理残留进程"""
-    print(f"{Colors.INFO}{t('checking_processes_simple')}{Colors.RESET}")
+def _iso_to_epoch_ms(value):
+    """将 ISO 格式的时间字符串转换为毫秒时间戳（不带时区的时间按本地时间处理），无法解析时返回 0"""
     try:
-        # 根据操作系统执行不同的命令
-        if platform.system() == "Windows":
-            # Windows
-            cmd = f'netstat -ano | findstr ":{LOCK_PORT}"'
-            output = subprocess.check_output(cmd, shell=True).decode('utf-8')
-            if output:
-                print(f"{Colors.INFO}{t('found_processes_simple')}{Colors.RESET}")
-                print(output)
-                # 可以添加自动清理逻辑
-            else:
-                print(f"{Colors.INFO}{t('no_processes_found_simple')}{Colors.RESET}")
-        elif platform.system() == "Darwin" or platform.system() == "Linux":
-            # macOS or Linux
-            cmd = f"lsof -i :{LOCK_PORT}"
-            try:
-                output = subprocess.check_output(cmd, shell=True).decode('utf-8')
-                if output:
-                    print(f"{Colors.INFO}{t('found_processes_simple')}{Colors.RESET}")
-                    print(output)
-                    # 可以添加自动清理逻辑
-                else:
-                    print(f"{Colors.INFO}{t('no_processes_found_simple')}{Colors.RESET}")
-            except subprocess.CalledProcessError:
-                # 如果命令返回非零状态，通常意味着没有找到匹配的进程
-                print(f"{Colors.INFO}{t('no_processes_found_simple')}{Colors.RESET}")
-        else:
-            print(f"{Colors.INFO}{t('unsupported_os').format(os=platform.system())}{Colors.RESET}")
-    except Exception as e:
-        print(f"{Colors.INFO}{t('process_check_failed').format(error=e)}{Colors.RESET}")
-        traceback.print_exc()
+        return int(datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp() * 1000)
+    except (ValueError, TypeError, OverflowError, OSError):
+        return 0
+
+
+def _epoch_ms_to_iso(value):
+    """将毫秒时间戳转换为本地时间的 ISO 格式字符串"""
+    return datetime.fromtimestamp(value / 1000).isoformat()
+
+
+# JetBrains IDE 配置目录名，例如 PyCharm2024.1、IntelliJIdea2023.3、旧版的 .WebStorm2019.3
+IDE_DIR_PATTERN = re.compile(r"^\.?([A-Za-z][A-Za-z-]*?)(\d{4}\.\d+)$")
+
+
+def _parse_ide_product(file_path):
+    """从配额文件路径中解析 IDE 产品名和版本，例如 ("PyCharm", "2024.1")，无法识别时返回 (None, None)"""
+    for part in reversed(re.split(r"[\\/]", file_path or "")):
+        match = IDE_DIR_PATTERN.match(part)
+        if match:
+            return match.group(1), match.group(2)
+    return None, None
+
+
+def _prefix_upper_bound(prefix):
+    """
+    返回以 prefix 开头的字符串的上界：所有以 prefix 开头的字符串 s 都满足 prefix <= s < 上界，
+    用于把前缀匹配改写为可以使用索引的半开区间查询
+    """
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _hash_file(file_path):
+    """计算文件内容的哈希值，用作文件指纹"""
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 class QuotaInfo:
@@ -247,54 +421,110 @@ class QuotaInfo:
         self.refill_duration = ""
         self.timestamp = datetime.now().isoformat()
         self.file_path = ""
+        # 连续相同快照合并存储时，该记录代表的快照次数
+        self.seen_count = 1
+        # 解析配额文件失败时的错误；这样的记录不保存到历史记录，也不记录文件指纹
+        self.parse_error = None
 
     @classmethod
-    def from_xml_file(cls, file_path):
-        """从XML文件解析配额信息"""
+    def from_xml_file(cls, file_path, streaming=True):
+        """
+        从XML文件解析配额信息
+
+        Args:
+            file_path: 配额文件路径
+            streaming: 是否使用流式解析（找到 quotaInfo 和 nextRefill 后立即停止读取）；
+                       为 False 时使用完整的 ElementTree 解析
+
+        Returns:
+            QuotaInfo 对象；解析失败时其 parse_error 为异常对象
+        """
         quota = cls()
         # 确保存储完整的绝对路径
         quota.file_path = os.path.abspath(file_path)
 
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-
-            # 查找配额信息
-            for option in root.findall(".//option"):
-                if option.get("name") == "quotaInfo":
-                    quota_info_str = option.get("value")
-                    quota_info_str = quota_info_str.replace("&#10;", "\n").replace("&quot;", "\"")
-                    quota_info = json.loads(quota_info_str)
-
-                    quota.type = quota_info.get("type", "Unknown")
-                    quota.current = float(quota_info.get("current", "0"))
-                    quota.maximum = float(quota_info.get("maximum", "0"))
-                    quota.until = quota_info.get("until", "")
-
-                    # 计算百分比
-                    if quota.maximum > 0:
-                        quota.percentage = (quota.current / quota.maximum) * 100
-
-                elif option.get("name") == "nextRefill":
-                    refill_str = option.get("value")
-                    refill_str = refill_str.replace("&#10;", "\n").replace("&quot;", "\"")
-
-                    try:
-                        refill_info = json.loads(refill_str)
-                        quota.refill_type = refill_info.get("type", "Unknown")
-
-                        if quota.refill_type != "Unknown":
-                            quota.next_refill = refill_info.get("next", "")
-                            quota.refill_amount = float(refill_info.get("amount", "0"))
-                            quota.refill_duration = refill_info.get("duration", "")
-                    except:
-                        pass
+            if streaming:
+                options = cls._iter_options_streaming(file_path)
+            else:
+                options = cls._iter_options_tree(file_path)
+
+            for name, value in options:
+                quota._apply_option(name, value)
 
             return quota
         except Exception as e:
             print(f"{Colors.INFO}{t('xml_parse_error').format(error=e)}{Colors.RESET}")
+            quota.parse_error = e
             return quota
 
+    @staticmethod
+    def _iter_options_tree(file_path):
+        """使用完整的 ElementTree 遍历配额相关的 option 节点"""
+        tree = ET.parse(file_path)
+        root = tree.getroot()
+
+        for option in root.findall(".//option"):
+            name = option.get("name")
+            if name in QUOTA_OPTION_NAMES:
+                yield name, option.get("value")
+
+    @staticmethod
+    def _iter_options_streaming(file_path):
+        """
+        使用增量解析器遍历配额相关的 option 节点
+
+        按块读取文件并喂给 XMLPullParser，已处理完的元素会被立即清空；
+        quotaInfo 和 nextRefill 都出现后停止读取，不再解析文件剩余部分。
+        """
+        parser = ET.XMLPullParser(events=("start", "end"))
+        pending = set(QUOTA_OPTION_NAMES)
+
+        with open(file_path, "rb") as f:
+            while pending:
+                chunk = f.read(XML_STREAM_CHUNK_SIZE)
+                if not chunk:
+                    # 文件已读完，检查XML是否完整
+                    parser.close()
+                    break
+
+                parser.feed(chunk)
+                for event, elem in parser.read_events():
+                    if event == "start":
+                        if elem.tag == "option":
+                            name = elem.get("name")
+                            if name in pending:
+                                pending.discard(name)
+                                yield name, elem.get("value")
+                    else:
+                        elem.clear()
+
+    def _apply_option(self, name, value):
+        """将单个 option 的值写入配额信息"""
+        if name == "quotaInfo":
+            quota_info = json.loads(_unescape_option_value(value))
+
+            self.type = quota_info.get("type", "Unknown")
+            self.current = float(quota_info.get("current", "0"))
+            self.maximum = float(quota_info.get("maximum", "0"))
+            self.until = quota_info.get("until", "")
+
+            # 计算百分比
+            if self.maximum > 0:
+                self.percentage = (self.current / self.maximum) * 100
+
+        elif name == "nextRefill":
+            try:
+                refill_info = json.loads(_unescape_option_value(value))
+                self.refill_type = refill_info.get("type", "Unknown")
+
+                if self.refill_type != "Unknown":
+                    self.next_refill = refill_info.get("next", "")
+                    self.refill_amount = float(refill_info.get("amount", "0"))
+                    self.refill_duration = refill_info.get("duration", "")
+            except:
+                pass
+
     def to_dict(self):
         """转换为字典"""
         return {
@@ -352,7 +582,18 @@ class ConfigManager:
 
         # 配置文件路径
         self.config_file = os.path.join(self.config_dir, "config.json")
-        self.history_file = os.path.join(self.config_dir, "history.json")
+        # 历史记录以 NDJSON 追加写入，旧版的 history.json 在第一次压缩时并入
+        self.history_file = os.path.join(self.config_dir, "history.ndjson")
+        self.legacy_history_file = os.path.join(self.config_dir, "history.json")
+
+        # 配置缓存：只有 config.json 的 mtime_ns 或大小变化时才重新读取
+        self._config = None
+        self._config_stat = None
+        # 最后一次从 config.json 读到或写入的内容（独立副本），与缓存比较即可找出本进程尚未写入的修改
+        self._config_base = None
+        # batch_updates() 嵌套层数，以及是否有未写入的修改
+        self._batch_depth = 0
+        self._config_dirty = False
 
     def print_config_paths(self):
         """打印配置路径信息"""
@@ -389,43 +630,124 @@ class ConfigManager:
             os.path.join(os.path.expanduser("~"), "Library", "Caches",
                          "jetbrains_ai_quota_analyzer") if sys.platform == "darwin" else
             os.path.join(os.path.expanduser("~"), ".jetbrains_ai_quota_analyzer"),
-            # 4. 当前目录
-            os.path.abspath(".")
         ]
 
         # 尝试每个路径，返回第一个可写的路径
         for path in paths:
+            # 之前已经通过写入测试的目录只检查标记文件和写权限，不再重复写入测试文件
+            if os.path.isfile(os.path.join(path, CONFIG_DIR_MARKER)) and os.access(path, os.W_OK):
+                return path
             try:
                 # 尝试创建目录
                 os.makedirs(path, exist_ok=True)
-                # 尝试写入测试文件
-                test_file = os.path.join(path, ".write_test")
-                with open(test_file, "w") as f:
-                    f.write("test")
-                # 删除测试文件
-                os.remove(test_file)
+                # 写入测试文件，测试通过后保留为标记文件
+                with open(os.path.join(path, CONFIG_DIR_MARKER), "w") as f:
+                    f.write("ok")
                 return path
             except Exception as e:
                 print(f"{Colors.INFO}{t('path_not_writable').format(path=path, error=e)}{Colors.RESET}")
                 continue
 
-        # 如果所有路径都失败，返回当前目录
-        return os.path.abspath(".")
+        # 4. 如果所有路径都失败，使用当前目录；它不是工具自己的目录，测试文件写入后删除，不留下标记文件
+        path = os.path.abspath(".")
+        try:
+            test_file = os.path.join(path, ".write_test")
+            with open(test_file, "w") as f:
+                f.write("test")
+            os.remove(test_file)
+        except Exception as e:
+            print(f"{Colors.INFO}{t('path_not_writable').format(path=path, error=e)}{Colors.RESET}")
+        return path
 
     def save_config(self, config):
-        """保存配置"""
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        """保存配置；在 batch_updates() 中只更新缓存，退出时统一写入一次"""
+        self._config = config
+        self._config_dirty = True
+        if self._batch_depth:
+            return
+        self._write_config()
+
+    def _write_config(self):
+        """
+        把缓存的配置写入临时文件后原子替换 config.json，避免中断时留下不完整的文件
+
+        写入前重新检查文件，其他进程在此期间写入的修改会先合并进来，不会被覆盖。
+        """
+        config = self.load_config()
+        content = json.dumps(config, indent=2)
+        temp_file = f"{self.config_file}.{os.getpid()}.tmp"
+        try:
+            with open(temp_file, 'w') as f:
+                f.write(content)
+            os.replace(temp_file, self.config_file)
+        except OSError:
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+            raise
+        self._config_base = json.loads(content)
+        self._config_dirty = False
+        stat_result = os.stat(self.config_file)
+        self._config_stat = (stat_result.st_mtime_ns, stat_result.st_size)
+
+    def _merge_config_changes(self, config):
+        """把本进程尚未写入的修改（与 _config_base 不同的顶层键）合并到从文件读到的配置上"""
+        base = self._config_base or {}
+        for key, value in self._config.items():
+            if key not in base or base[key] != value:
+                config[key] = value
+        for key in base:
+            if key not in self._config:
+                config.pop(key, None)
+        return config
+
+    @contextlib.contextmanager
+    def batch_updates(self):
+        """
+        批量修改配置：期间的所有 save_config 合并为退出时的一次写入
+
+        只用于一个非交互式命令或一个菜单操作，进程在批量修改期间被终止时这些修改会丢失。
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._config_dirty:
+                self._write_config()
 
     def load_config(self):
-        """加载配置"""
-        if os.path.exists(self.config_file):
+        """
+        加载配置
+
+        返回缓存的配置字典，只有文件的 mtime_ns 或大小变化时才重新解析；
+        修改返回的字典后需要调用 save_config。有尚未写入的修改时（批量修改期间），
+        文件被其他进程修改后重新读取，并把本进程的修改合并到新内容上。
+        """
+        try:
+            stat_result = os.stat(self.config_file)
+            key = (stat_result.st_mtime_ns, stat_result.st_size)
+        except OSError:
+            key = None
+        if self._config is not None and key == self._config_stat:
+            return self._config
+
+        content = "{}"
+        if key is not None:
             try:
                 with open(self.config_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+                    content = f.read()
+                json.loads(content)
+            except (OSError, ValueError):
+                content = "{}"
+        config = json.loads(content)
+        if self._config_dirty:
+            config = self._merge_config_changes(config)
+        self._config = config
+        self._config_base = json.loads(content)
+        self._config_stat = key
+        return self._config
 
     def get_recent_paths(self):
         """获取最近使用的路径"""
@@ -451,25 +773,94 @@ class ConfigManager:
         self.save_config(config)
 
     def save_history(self, quota_info):
-        """保存历史记录"""
-        history = self.load_history()
-        history.append(quota_info.to_dict())
+        """
+        保存历史记录
+
+        每条记录作为一行 JSON 追加到日志末尾，不需要读取已有记录；
+        日志超过 HISTORY_JOURNAL_MAX_BYTES 或仍有旧版 history.json 时压缩。
+        """
+        with open(self.history_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(quota_info.to_dict(), ensure_ascii=False) + "\n")
+
+        try:
+            needs_compaction = (os.path.getsize(self.history_file) > HISTORY_JOURNAL_MAX_BYTES
+                                or os.path.exists(self.legacy_history_file))
+        except OSError:
+            needs_compaction = False
+        if needs_compaction:
+            self.compact_history()
+
+    def compact_history(self):
+        """只保留最近的 HISTORY_JOURNAL_KEEP 条记录：写入临时文件后原子替换日志，再删除旧版 history.json"""
+        recent = deque(self.iter_history(), maxlen=HISTORY_JOURNAL_KEEP)
+        temp_file = f"{self.history_file}.{os.getpid()}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                for item in recent:
+                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.history_file)
+            if os.path.exists(self.legacy_history_file):
+                os.remove(self.legacy_history_file)
+        except OSError as e:
+            print(f"{Colors.INFO}{t('history_journal_compact_failed').format(error=e)}{Colors.RESET}")
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+    def iter_history(self):
+        """
+        按写入顺序逐条读取历史记录：先读旧版 history.json，再逐行读取日志
 
-        # 只保留最近的100条记录
-        history = history[-100:]
+        无法解析的行（例如写入时被中断的最后一行）会被跳过。
+        """
+        if os.path.exists(self.legacy_history_file):
+            try:
+                with open(self.legacy_history_file, 'r') as f:
+                    yield from json.load(f)
+            except (OSError, ValueError):
+                pass
 
-        with open(self.history_file, 'w') as f:
-            json.dump(history, f, indent=2)
+        if not os.path.exists(self.history_file):
+            return
+        with open(self.history_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
 
     def load_history(self):
-        """加载历史记录"""
-        if os.path.exists(self.history_file):
+        """加载最近的 HISTORY_JOURNAL_KEEP 条历史记录"""
+        try:
+            return list(deque(self.iter_history(), maxlen=HISTORY_JOURNAL_KEEP))
+        except OSError:
+            return []
+
+    def get_history_journal_state(self):
+        """
+        返回旧版 history.json 和历史日志的 [大小, 修改时间]（不存在时为 None），
+        用于判断上次导入数据库之后日志是否有变化；两个文件都不存在时返回 None
+        """
+        state = []
+        for path in (self.legacy_history_file, self.history_file):
             try:
-                with open(self.history_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
+                stat = os.stat(path)
+                state.append([stat.st_size, stat.st_mtime_ns])
+            except OSError:
+                state.append(None)
+        return state if any(state) else None
+
+    def get_history_journal_migrated(self):
+        """获取上次把历史日志导入数据库时日志的状态"""
+        config = self.load_config()
+        return config.get("history_journal_migrated")
+
+    def set_history_journal_migrated(self, state):
+        """记录历史日志已导入数据库时的状态，日志没有变化时下次启动不再读取"""
+        config = self.load_config()
+        config["history_journal_migrated"] = state
+        self.save_config(config)
 
     def get_unique_paths(self):
         """获取历史记录中的唯一路径"""
@@ -483,6 +874,36 @@ class ConfigManager:
 
         return sorted(list(paths))
 
+    def get_discovery_roots(self):
+        """获取配置文件中额外指定的配额文件查找根目录"""
+        config = self.load_config()
+        return config.get("discovery_roots", [])
+
+    def get_history_run_length(self):
+        """是否合并存储连续相同的配额快照（默认开启）"""
+        config = self.load_config()
+        return bool(config.get("history_run_length", True))
+
+    def get_history_retention_days(self):
+        """获取原始历史记录的保留天数，0 表示永久保留；配置值无效时使用默认值"""
+        config = self.load_config()
+        try:
+            days = int(config.get("history_retention_days", HISTORY_RETENTION_DAYS))
+        except (TypeError, ValueError):
+            return HISTORY_RETENTION_DAYS
+        return days if days >= 0 else HISTORY_RETENTION_DAYS
+
+    def get_log_file(self):
+        """获取上次分析的 idea.log 路径"""
+        config = self.load_config()
+        return config.get("log_file", "")
+
+    def set_log_file(self, log_file):
+        """缓存 idea.log 路径，下次分析日志时可以省略路径"""
+        config = self.load_config()
+        config["log_file"] = log_file
+        self.save_config(config)
+
     def get_language(self):
         """获取语言设置"""
         config = self.load_config()
@@ -497,78 +918,191 @@ class ConfigManager:
         config["language"] = language
         self.save_config(config)
 
-    def get_recommended_paths(self, max_count=5):
-        """获取推荐的历史路径，基于使用频率和最近使用情况
-        
-        Args:
-            max_count: 最多返回的推荐路径数量
-        
-        Returns:
-            推荐路径列表，按推荐度排序
-        """
-        # 获取历史记录
-        history = self.load_history()
 
-        # 获取最近使用的路径
-        recent_paths = self.get_recent_paths()
+# 查询历史记录时使用的列，顺序与 DatabaseManager._row_to_quota_info 对应
+HISTORY_COLUMNS = ("h.type, h.current, h.maximum, h.until, h.percentage, h.refill_type, "
+                   "h.next_refill, h.refill_amount, h.refill_duration, h.ts, p.path, "
+                   "h.last_seen_ts, h.seen_count")
+# 判断两个快照是否相同时比较的列（percentage 由 current 和 maximum 计算得出，不需要比较）
+RUN_LENGTH_COLUMNS = ("type, current, maximum, until, refill_type, "
+                      "next_refill, refill_amount, refill_duration")
+# 查询历史记录时使用的表，文件路径保存在 paths 表中，history 只引用 path_id
+HISTORY_FROM = "history h JOIN paths p ON p.id = h.path_id"
+# 合并存储的记录最后一次看到快照的时间，历史记录按该时间排序和过滤；与 idx_history_seen 等索引的表达式一致才能走索引
+HISTORY_SEEN_TS = "COALESCE(h.last_seen_ts, h.ts)"
 
-        # 统计每个路径的使用频率
-        path_frequency = {}
-        for item in history:
-            path = item.get("file_path", "")
-            if path:
-                path_frequency[path] = path_frequency.get(path, 0) + 1
 
-        # 如果没有历史记录，返回空列表
-        if not path_frequency:
-            return []
+class HistoryWriter:
+    """
+    历史记录后台写入器
+
+    记录先放入有界队列，由后台线程使用独立连接攒批写入：
+    攒够 batch_size 条或第一条记录等待超过 max_delay 秒时用 executemany 写入并提交一次。
+    记录附带的文件指纹与记录在同一个事务中写入，进程在提交前退出时两者都不会保存，
+    下次运行不会因为指纹匹配而跳过这个文件。队列满时 put 会阻塞调用方，避免内存无限增长。
+    """
+
+    def __init__(self, db_manager, batch_size=HISTORY_WRITER_BATCH_SIZE,
+                 max_delay=HISTORY_WRITER_MAX_DELAY, queue_size=HISTORY_WRITER_QUEUE_SIZE):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.batches = 0
+        self.rows_written = 0
+        self.last_batch_latency = 0.0
+        self.max_batch_latency = 0.0
+        self.total_batch_latency = 0.0
+        self.max_queue_depth = 0
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self):
+        """当前等待写入的记录数"""
+        return self.queue.qsize()
+
+    def put(self, quota_info, fingerprint=None):
+        """把一条配额信息（以及对应的文件指纹 (路径, stat 结果, 内容哈希)）放入写入队列"""
+        self.queue.put((quota_info, fingerprint))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def flush(self):
+        """等待队列中已有的记录全部写入并提交"""
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+
+    def close(self):
+        """写入剩余记录并停止后台线程"""
+        self.queue.put(None)
+        self._thread.join()
 
-        # 计算推荐得分：结合使用频率和最近使用情况
-        path_scores = {}
-        max_frequency = max(path_frequency.values()) if path_frequency else 1
+    def stats(self):
+        """返回写入统计：批次数、记录数、平均/最大/最近一批耗时（毫秒）和最大队列深度"""
+        return {
+            "batches": self.batches,
+            "rows": self.rows_written,
+            "avg_ms": self.total_batch_latency * 1000 / self.batches if self.batches else 0.0,
+            "max_ms": self.max_batch_latency * 1000,
+            "last_ms": self.last_batch_latency * 1000,
+            "max_depth": self.max_queue_depth,
+        }
 
-        for path, freq in path_frequency.items():
-            # 基础分数：使用频率的归一化值（0-1之间）
-            base_score = freq / max_frequency
+    def _run(self):
+        """后台线程：攒批、写入、提交"""
+        conn = self.db_manager.open_write_connection()
+        pending = []
+        waiters = []
+        deadline = None
 
-            # 最近使用加成：如果在最近使用列表中，根据位置给予额外加分
-            recency_bonus = 0
-            if path in recent_paths:
-                # 最近使用列表中的位置（0是最近的）
-                position = recent_paths.index(path)
-                # 位置越靠前，加分越多（最大加分为1，随位置递减）
-                recency_bonus = 1 * (1 - position / len(recent_paths)) if len(recent_paths) > 0 else 0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else None
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+
+            stop = item is None
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif isinstance(item, tuple):
+                if not pending:
+                    deadline = time.monotonic() + self.max_delay
+                pending.append(item)
+
+            if pending and (stop or waiters or len(pending) >= self.batch_size
+                            or time.monotonic() >= deadline):
+                self._write_batch(conn, pending)
+                pending = []
+
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+
+            if stop:
+                break
+
+        if conn:
+            conn.close()
+
+    def _write_batch(self, conn, items):
+        """在一个事务中写入一批记录及其文件指纹并统计耗时"""
+        if conn is None:
+            print(f"{Colors.INFO}{t('save_history_failed')}{Colors.RESET}")
+            return
 
-            # 总分 = 使用频率分数 + 最近使用加成
-            # 权重可以调整：这里使用频率占60%，最近使用占40%
-            path_scores[path] = base_score * 0.6 + recency_bonus * 0.4
+        start = time.perf_counter()
+        try:
+            cursor = conn.cursor()
+            self.db_manager.insert_history_rows(cursor, [quota_info for quota_info, _ in items])
+            for _, fingerprint in items:
+                if fingerprint is not None:
+                    self.db_manager.upsert_file_fingerprint(cursor, *fingerprint)
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"{Colors.INFO}{t('save_record_failed').format(error=e)}{Colors.RESET}")
+            return
 
-        # 按得分排序，返回推荐路径
-        recommended_paths = sorted(path_scores.items(), key=lambda x: x[1], reverse=True)
-        return [path for path, score in recommended_paths[:max_count]]
+        latency = time.perf_counter() - start
+        self.batches += 1
+        self.rows_written += len(items)
+        self.last_batch_latency = latency
+        self.max_batch_latency = max(self.max_batch_latency, latency)
+        self.total_batch_latency += latency
 
 
 class DatabaseManager:
     """数据库管理器"""
 
-    def __init__(self, config_manager):
-        """初始化数据库管理器"""
+    def __init__(self, config_manager, read_only=False, app_lock=None):
+        """
+        初始化数据库管理器
+
+        参数:
+            config_manager: 配置管理器
+            read_only: 是否只读打开数据库（用于 --history 等只读命令，不会阻塞其他写入进程）
+            app_lock: 本实例持有共享锁的 AppLock；压缩历史记录前需要转换为排他锁，为 None 时不检查
+        """
         self.config_manager = config_manager
+        self.app_lock = app_lock
         self.db_file = os.path.join(config_manager.config_dir, "database.db")
         self.conn = None
+        self.read_conn = None
         self.connected = False
+        self.in_memory = False
+        self.read_only = read_only
+        self.writer = None
+        # 连续相同的快照只延长上一条记录的最后看到时间，而不是插入新记录
+        self.run_length = config_manager.get_history_run_length()
 
         # 初始化数据库
         self._connect_db()
-        if self.connected:
+        if self.connected and not self.read_only:
             self.init_db()
             self._migrate_from_json()
 
     def _connect_db(self):
         """连接数据库"""
+        if self.read_only:
+            # 只读模式下数据库需要已存在且结构是最新的，否则退回读写模式完成初始化
+            try:
+                self.conn = self._open_read_only()
+                if self.conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+                    self.connected = True
+                    print(f"{Colors.INFO}{t('db_connected_read_only').format(path=self.db_file)}{Colors.RESET}")
+                    return
+                self.conn.close()
+            except sqlite3.Error:
+                pass
+            self.read_only = False
+
         try:
-            self.conn = sqlite3.connect(self.db_file)
+            self.conn = sqlite3.connect(self.db_file, timeout=DB_BUSY_TIMEOUT)
+            self._configure_connection(self.conn)
             self.connected = True
+            self.in_memory = False
             print(f"{Colors.INFO}{t('db_connected').format(path=self.db_file)}{Colors.RESET}")
         except sqlite3.Error as e:
             self.connected = False
@@ -577,10 +1111,80 @@ class DatabaseManager:
             try:
                 self.conn = sqlite3.connect(":memory:")
                 self.connected = True
+                self.in_memory = True
                 print(f"{Colors.INFO}{t('use_memory_db')}{Colors.RESET}")
             except sqlite3.Error as e2:
                 print(f"{Colors.INFO}{t('memory_db_failed').format(error=e2)}{Colors.RESET}")
 
+    @staticmethod
+    def _configure_connection(conn):
+        """
+        设置连接参数：WAL 日志模式让读者不阻塞写者，忙等待超时让多个写入进程排队而不是直接报错
+        """
+        conn.execute(f"PRAGMA busy_timeout = {int(DB_BUSY_TIMEOUT * 1000)}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        # WAL 模式下 NORMAL 同步级别不会损坏数据库，只可能丢失断电前最后一次提交
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{DB_CACHE_SIZE_KB}")
+
+    def open_write_connection(self):
+        """为后台写入线程打开独立的读写连接，失败时返回 None"""
+        try:
+            conn = sqlite3.connect(self.db_file, timeout=DB_BUSY_TIMEOUT)
+            self._configure_connection(conn)
+            return conn
+        except sqlite3.Error as e:
+            print(f"{Colors.INFO}{t('db_connect_failed').format(error=e)}{Colors.RESET}")
+            return None
+
+    def start_history_writer(self):
+        """
+        启用后台写入器，之后 save_history_item 只把记录放入队列
+
+        内存数据库无法被其他连接共享，只读模式不能写入，这两种情况下保持同步写入。
+        """
+        if self.writer is None and self.connected and not self.in_memory and not self.read_only:
+            self.writer = HistoryWriter(self)
+            print(f"{Colors.INFO}{t('history_writer_started').format(batch=self.writer.batch_size, delay=self.writer.max_delay)}{Colors.RESET}")
+        return self.writer is not None
+
+    def stop_history_writer(self):
+        """写入队列中剩余的记录，停止后台写入器并打印统计信息"""
+        if self.writer is None:
+            return
+        writer, self.writer = self.writer, None
+        writer.close()
+        print(f"{Colors.INFO}{t('history_writer_stats').format(**writer.stats())}{Colors.RESET}")
+
+    def flush_history(self):
+        """等待后台写入器把已排队的记录写入数据库"""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def _open_read_only(self):
+        """以只读方式打开数据库文件，文件不存在时抛出 sqlite3.Error"""
+        uri = pathlib.Path(os.path.abspath(self.db_file)).as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=DB_BUSY_TIMEOUT)
+        conn.execute(f"PRAGMA busy_timeout = {int(DB_BUSY_TIMEOUT * 1000)}")
+        conn.execute(f"PRAGMA cache_size = -{DB_CACHE_SIZE_KB}")
+        return conn
+
+    def _reader(self):
+        """
+        返回用于查询的连接
+
+        读写模式下查询使用单独的只读连接，不会持有写锁；
+        内存数据库或只读连接打开失败时使用主连接。
+        """
+        if self.read_only or self.in_memory:
+            return self.conn
+        if self.read_conn is None:
+            try:
+                self.read_conn = self._open_read_only()
+            except sqlite3.Error:
+                return self.conn
+        return self.read_conn
+
     def ensure_connection(self):
         """确保数据库连接有效，如果无效则尝试重新连接"""
         try:
@@ -600,200 +1204,1324 @@ class DatabaseManager:
         return self.connected
 
     def init_db(self):
-        """初始化数据库，创建表结构"""
+        """
+        初始化数据库
+
+        通过 PRAGMA user_version 记录数据库结构版本，只执行尚未应用的迁移；
+        数据库已是最新版本时不会执行任何 DDL。
+        """
         if not self.ensure_connection():
             print(f"{Colors.INFO}{t('db_init_failed')}{Colors.RESET}")
             return False
 
         try:
             cursor = self.conn.cursor()
-            # 创建历史记录表
-            cursor.execute('''
-                           CREATE TABLE IF NOT EXISTS history
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                return True
+
+            # 旧版本创建的数据库没有设置 user_version，但已经有表
+            existing = version > 0 or cursor.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] > 0
+            if existing:
+                print(f"{Colors.INFO}{t('db_schema_upgrade').format(old=version, new=SCHEMA_VERSION)}{Colors.RESET}")
+
+            migrations = {
+                1: self._migrate_schema_v1,
+                2: self._migrate_schema_v2,
+                3: self._migrate_schema_v3,
+                4: self._migrate_schema_v4,
+                5: self._migrate_schema_v5,
+                6: self._migrate_schema_v6,
+                7: self._migrate_schema_v7,
+                8: self._migrate_schema_v8,
+                9: self._migrate_schema_v9,
+                10: self._migrate_schema_v10,
+            }
+            # 每个迁移在独立的事务中执行，并同时更新版本号。BEGIN IMMEDIATE 先取得写锁，
+            # 再在事务中重新读取版本号：同时启动的其他实例已经执行过的迁移直接跳过
+            for target in range(version + 1, SCHEMA_VERSION + 1):
+                cursor.execute("BEGIN IMMEDIATE")
+                if cursor.execute("PRAGMA user_version").fetchone()[0] >= target:
+                    self.conn.rollback()
+                    continue
+                migrations[target](cursor)
+                cursor.execute(f"PRAGMA user_version = {target}")
+                self.conn.commit()
+
+            return True
+        except sqlite3.Error as e:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            print(f"{Colors.INFO}{t('db_init_error').format(error=e)}{Colors.RESET}")
+            return False
+
+    def _migrate_schema_v1(self, cursor):
+        """版本 1：创建初始表结构（历史记录使用 ISO 文本时间戳）"""
+        # 创建历史记录表
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS history
+                       (
+                           id
+                               INTEGER
+                               PRIMARY
+                                   KEY
+                               AUTOINCREMENT,
+                           type
+                               TEXT,
+                           current
+                               REAL,
+                           maximum
+                               REAL,
+                           until
+                               TEXT,
+                           percentage
+                               REAL,
+                           refill_type
+                               TEXT,
+                           next_refill
+                               TEXT,
+                           refill_amount
+                               REAL,
+                           refill_duration
+                               TEXT,
+                           timestamp
+                               TEXT,
+                           file_path
+                               TEXT
+                       )
+                       ''')
+
+        # 创建文件指纹表，用于跳过未变化的配额文件
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS file_fingerprints
+                       (
+                           file_path
+                               TEXT
+                               PRIMARY
+                                   KEY,
+                           inode
+                               INTEGER,
+                           mtime_ns
+                               INTEGER,
+                           size
+                               INTEGER,
+                           content_hash
+                               TEXT,
+                           last_seen
+                               TEXT
+                       )
+                       ''')
+
+        # 创建配额文件发现索引表，记录已扫描目录的修改时间和扫描结果
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS discovery_index
+                       (
+                           path
+                               TEXT
+                               PRIMARY
+                                   KEY,
+                           mtime_ns
+                               INTEGER,
+                           entries
+                               TEXT
+                       )
+                       ''')
+
+        # 创建配额日志事件表，保存从 idea.log 导入的事件
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS log_events
+                       (
+                           id
+                               INTEGER
+                               PRIMARY
+                                   KEY
+                               AUTOINCREMENT,
+                           log_path
+                               TEXT,
+                           timestamp
+                               TEXT,
+                           message
+                               TEXT,
+                           current
+                               REAL,
+                           maximum
+                               REAL,
+                           until
+                               TEXT,
+                           UNIQUE
+                               (
+                               log_path,
+                               timestamp,
+                               message
+                               )
+                       )
+                       ''')
+
+        # 创建日志导入检查点表，记录每个日志文件已读取到的位置
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS log_checkpoints
+                       (
+                           log_path
+                               TEXT
+                               PRIMARY
+                                   KEY,
+                           inode
+                               INTEGER,
+                           offset
+                               INTEGER,
+                           updated
+                               TEXT
+                       )
+                       ''')
+
+        # 创建配置表
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS config
+                       (
+                           id
+                               INTEGER
+                               PRIMARY
+                                   KEY
+                               AUTOINCREMENT,
+                           key
+                               TEXT
+                               UNIQUE,
+                           value
+                               TEXT
+                       )
+                       ''')
+
+    def _migrate_schema_v2(self, cursor):
+        """版本 2：历史记录改用毫秒整数时间戳 ts，并为路径和时间查询建立索引"""
+        self.conn.create_function("iso_to_epoch_ms", 1, _iso_to_epoch_ms)
+        cursor.execute('''
+                       CREATE TABLE history_v2
+                       (
+                           id
+                               INTEGER
+                               PRIMARY
+                                   KEY
+                               AUTOINCREMENT,
+                           type
+                               TEXT,
+                           current
+                               REAL,
+                           maximum
+                               REAL,
+                           until
+                               TEXT,
+                           percentage
+                               REAL,
+                           refill_type
+                               TEXT,
+                           next_refill
+                               TEXT,
+                           refill_amount
+                               REAL,
+                           refill_duration
+                               TEXT,
+                           ts
+                               INTEGER
+                               NOT
+                                   NULL,
+                           file_path
+                               TEXT
+                       )
+                       ''')
+        cursor.execute('''
+                       INSERT INTO history_v2
+                       (id, type, current, maximum, until, percentage, refill_type,
+                        next_refill, refill_amount, refill_duration, ts, file_path)
+                       SELECT id, type, current, maximum, until, percentage, refill_type,
+                              next_refill, refill_amount, refill_duration, iso_to_epoch_ms(timestamp), file_path
+                       FROM history
+                       ''')
+        cursor.execute('DROP TABLE history')
+        cursor.execute('ALTER TABLE history_v2 RENAME TO history')
+        cursor.execute('CREATE INDEX idx_history_path_ts ON history (file_path, ts)')
+        cursor.execute('CREATE INDEX idx_history_ts ON history (ts)')
+
+    def _migrate_schema_v3(self, cursor):
+        """版本 3：文件路径保存到 paths 字典表（附带解析出的 IDE 产品和版本），history 改为引用 path_id"""
+        self.conn.create_function("ide_product", 1, lambda path: _parse_ide_product(path)[0])
+        self.conn.create_function("ide_version", 1, lambda path: _parse_ide_product(path)[1])
+        cursor.execute('''
+                       CREATE TABLE paths
+                       (
+                           id
+                               INTEGER
+                               PRIMARY
+                                   KEY,
+                           path
+                               TEXT
+                               NOT
+                                   NULL
+                               UNIQUE,
+                           product
+                               TEXT,
+                           version
+                               TEXT
+                       )
+                       ''')
+        cursor.execute('''
+                       INSERT INTO paths (path, product, version)
+                       SELECT file_path, ide_product(file_path), ide_version(file_path)
+                       FROM (SELECT DISTINCT COALESCE(file_path, '') AS file_path FROM history)
+                       ORDER BY file_path
+                       ''')
+        cursor.execute('''
+                       CREATE TABLE history_v3
+                       (
+                           id
+                               INTEGER
+                               PRIMARY
+                                   KEY
+                               AUTOINCREMENT,
+                           type
+                               TEXT,
+                           current
+                               REAL,
+                           maximum
+                               REAL,
+                           until
+                               TEXT,
+                           percentage
+                               REAL,
+                           refill_type
+                               TEXT,
+                           next_refill
+                               TEXT,
+                           refill_amount
+                               REAL,
+                           refill_duration
+                               TEXT,
+                           ts
+                               INTEGER
+                               NOT
+                                   NULL,
+                           path_id
+                               INTEGER
+                               NOT
+                                   NULL
+                               REFERENCES
+                                   paths
+                                   (
+                                       id
+                                   )
+                       )
+                       ''')
+        cursor.execute('''
+                       INSERT INTO history_v3
+                       (id, type, current, maximum, until, percentage, refill_type,
+                        next_refill, refill_amount, refill_duration, ts, path_id)
+                       SELECT h.id, h.type, h.current, h.maximum, h.until, h.percentage, h.refill_type,
+                              h.next_refill, h.refill_amount, h.refill_duration, h.ts, p.id
+                       FROM history h
+                                JOIN paths p ON p.path = COALESCE(h.file_path, '')
+                       ''')
+        cursor.execute('DROP TABLE history')
+        cursor.execute('ALTER TABLE history_v3 RENAME TO history')
+        cursor.execute('CREATE INDEX idx_history_path_ts ON history (path_id, ts)')
+        cursor.execute('CREATE INDEX idx_history_ts ON history (ts)')
+
+    def _migrate_schema_v4(self, cursor):
+        """
+        版本 4：支持合并存储连续相同的快照
+
+        last_seen_ts 是最后一次看到该快照的时间（NULL 表示与 ts 相同），seen_count 是合并的快照次数。
+        """
+        cursor.execute('ALTER TABLE history ADD COLUMN last_seen_ts INTEGER')
+        cursor.execute('ALTER TABLE history ADD COLUMN seen_count INTEGER NOT NULL DEFAULT 1')
+
+    def _migrate_schema_v5(self, cursor):
+        """版本 5：按小时和按天汇总的历史统计表，保存每个路径在每个时间段内 current 和 percentage 的最小、最大和最后值"""
+        for table in ROLLUP_TABLES.values():
+            cursor.execute(f'''
+                           CREATE TABLE {table}
                            (
-                               id
+                               path_id
+                                   INTEGER
+                                   NOT
+                                       NULL
+                                   REFERENCES
+                                       paths
+                                       (
+                                           id
+                                       ),
+                               bucket
                                    INTEGER
-                                   PRIMARY
-                                       KEY
-                                   AUTOINCREMENT,
-                               type
-                                   TEXT,
-                               current
+                                   NOT
+                                       NULL,
+                               current_min
                                    REAL,
-                               maximum
+                               current_max
                                    REAL,
-                               until
-                                   TEXT,
-                               percentage
+                               current_last
                                    REAL,
-                               refill_type
-                                   TEXT,
-                               next_refill
-                                   TEXT,
-                               refill_amount
+                               percentage_min
                                    REAL,
-                               refill_duration
-                                   TEXT,
-                               timestamp
-                                   TEXT,
-                               file_path
-                                   TEXT
-                           )
-                           ''')
-
-            # 创建配置表
-            cursor.execute('''
-                           CREATE TABLE IF NOT EXISTS config
-                           (
-                               id
-                                   INTEGER
-                                   PRIMARY
-                                       KEY
-                                   AUTOINCREMENT,
-                               key
-                                   TEXT
-                                   UNIQUE,
-                               value
-                                   TEXT
-                           )
+                               percentage_max
+                                   REAL,
+                               percentage_last
+                                   REAL,
+                               maximum_last
+                                   REAL,
+                               last_ts
+                                   INTEGER,
+                               samples
+                                   INTEGER,
+                               PRIMARY
+                                   KEY
+                                   (
+                                       path_id,
+                                       bucket
+                                   )
+                           ) WITHOUT ROWID
                            ''')
+            cursor.execute(f'CREATE INDEX idx_{table}_bucket ON {table} (bucket)')
+
+    def _migrate_schema_v6(self, cursor):
+        """版本 6：为按 IDE 产品名（不区分大小写）过滤历史记录建立索引"""
+        cursor.execute('CREATE INDEX idx_paths_product ON paths (product COLLATE NOCASE, version)')
+
+    def _migrate_schema_v7(self, cursor):
+        """版本 7：latest_snapshot 表保存每个路径最新的快照，与历史记录在同一事务中更新"""
+        cursor.execute('''
+                       CREATE TABLE latest_snapshot
+                       (
+                           path_id
+                               INTEGER
+                               PRIMARY
+                                   KEY
+                               REFERENCES
+                                   paths
+                                   (
+                                       id
+                                   ),
+                           type
+                               TEXT,
+                           current
+                               REAL,
+                           maximum
+                               REAL,
+                           until
+                               TEXT,
+                           percentage
+                               REAL,
+                           refill_type
+                               TEXT,
+                           next_refill
+                               TEXT,
+                           refill_amount
+                               REAL,
+                           refill_duration
+                               TEXT,
+                           ts
+                               INTEGER
+                               NOT
+                                   NULL
+                       )
+                       ''')
+        cursor.execute('''
+                       INSERT INTO latest_snapshot
+                       (path_id, type, current, maximum, until, percentage, refill_type,
+                        next_refill, refill_amount, refill_duration, ts)
+                       SELECT h.path_id, h.type, h.current, h.maximum, h.until, h.percentage, h.refill_type,
+                              h.next_refill, h.refill_amount, h.refill_duration, COALESCE(h.last_seen_ts, h.ts)
+                       FROM history h
+                       WHERE h.id = (SELECT id
+                                     FROM history
+                                     WHERE path_id = h.path_id
+                                     ORDER BY ts DESC, id DESC
+                                     LIMIT 1)
+                       ''')
+
+    def _migrate_schema_v8(self, cursor):
+        """
+        版本 8：path_usage 表保存每个路径的使用次数和最后使用时间，用于计算推荐路径
 
-            self.conn.commit()
-            return True
-        except sqlite3.Error as e:
-            print(f"{Colors.INFO}{t('db_init_error').format(error=e)}{Colors.RESET}")
-            return False
+        初始值来自配置文件中最近使用的路径，每个路径计为使用一次；之后每次在菜单中使用路径时加一。
+        历史记录的快照数与使用次数不是同一单位，不用于初始化。
+        """
+        cursor.execute('''
+                       CREATE TABLE path_usage
+                       (
+                           path
+                               TEXT
+                               PRIMARY
+                                   KEY,
+                           use_count
+                               INTEGER
+                               NOT
+                                   NULL,
+                           last_used
+                               INTEGER
+                               NOT
+                                   NULL
+                       ) WITHOUT ROWID
+                       ''')
+        now = int(time.time() * 1000)
+        # 最近使用列表中越靠前的路径最后使用时间越新
+        for position, path in enumerate(self.config_manager.get_recent_paths()):
+            self._upsert_path_usage(cursor, path, now - position)
+
+    def _migrate_schema_v9(self, cursor):
+        """版本 9：按最后一次看到快照的时间（COALESCE(last_seen_ts, ts)）排序和过滤历史记录的索引"""
+        cursor.execute('CREATE INDEX idx_history_seen ON history (COALESCE(last_seen_ts, ts))')
+        cursor.execute('CREATE INDEX idx_history_path_seen ON history (path_id, COALESCE(last_seen_ts, ts))')
+
+    def _migrate_schema_v10(self, cursor):
+        """版本 10：按目录过滤历史记录时不区分大小写（与之前的 LIKE 一致），为此建立 NOCASE 排序的路径索引"""
+        cursor.execute('CREATE INDEX idx_paths_path_nocase ON paths (path COLLATE NOCASE)')
 
     def _migrate_from_json(self):
-        """从JSON文件迁移数据到SQLite"""
-        if not self.ensure_connection():
-            return
-
-        # 检查是否已经有数据
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM history")
-        count = cursor.fetchone()[0]
+        """
+        把 JSON 历史日志中还不在数据库里的记录迁移到SQLite
 
-        # 如果已经有数据，不进行迁移
-        if count > 0:
+        日志包括旧版 history.json，以及数据库无法打开、使用内存数据库时追加的记录。
+        同一路径上已有记录（包括合并存储的区间和已汇总到统计表的时间段）覆盖该时间点时跳过，
+        因此数据库已有数据时也只导入缺少的记录；日志自上次导入后没有变化时不读取日志。
+        """
+        if not self.ensure_connection():
             return
 
-        # 从JSON文件加载历史记录
-        history = self.config_manager.load_history()
-        if not history:
+        journal_state = self.config_manager.get_history_journal_state()
+        if journal_state is None or journal_state == self.config_manager.get_history_journal_migrated():
             return
 
-        print(f"{Colors.INFO}{t('migrate_from_json').format(count=len(history))}{Colors.RESET}")
-
-        # 插入历史记录
+        # 逐条读取 JSON 历史日志，分批插入，全部在一个事务中完成
         try:
-            for item in history:
-                self.save_history_item(QuotaInfo.from_dict(item))
-            print(f"{Colors.INFO}{t('migration_complete')}{Colors.RESET}")
+            cursor = self.conn.cursor()
+            migrated = 0
+            rolled_up = {}
+            items = self.config_manager.iter_history()
+            while True:
+                batch = [QuotaInfo.from_dict(item) for item in itertools.islice(items, HISTORY_MIGRATION_BATCH_SIZE)]
+                if not batch:
+                    break
+                batch = [quota_info for quota_info in batch if not self._history_covers(cursor, quota_info, rolled_up)]
+                if batch:
+                    self.insert_history_rows(cursor, batch)
+                    migrated += len(batch)
+
+            if migrated:
+                print(f"{Colors.INFO}{t('migrate_from_json').format(count=migrated)}{Colors.RESET}")
+            self.conn.commit()
+            if migrated:
+                print(f"{Colors.INFO}{t('migration_complete')}{Colors.RESET}")
+            # 导入内存数据库的记录退出后会丢失，下次启动时仍需要导入
+            if not self.in_memory:
+                self.config_manager.set_history_journal_migrated(journal_state)
         except Exception as e:
+            if self.conn.in_transaction:
+                self.conn.rollback()
             print(f"{Colors.INFO}{t('migration_failed').format(error=e)}{Colors.RESET}")
 
-    def save_history_item(self, quota_info):
-        """保存单个历史记录项"""
-        if not self.ensure_connection():
-            print(f"{Colors.INFO}{t('save_history_failed')}{Colors.RESET}")
+    def _history_covers(self, cursor, quota_info, rolled_up):
+        """
+        判断数据库中是否已有该快照：同一路径上不晚于该时间的最后一条记录的区间包含该时间，
+        或者该时间不晚于已汇总到统计表的最后时间
+
+        Args:
+            rolled_up: {path_id: 汇总表中的最后时间} 缓存，同一次迁移中复用
+        """
+        path_id = self._lookup_path_id(cursor, quota_info.file_path or "")
+        if path_id is None:
             return False
+        ts = _iso_to_epoch_ms(quota_info.timestamp)
 
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                           INSERT INTO history
-                           (type, current, maximum, until, percentage, refill_type,
-                            next_refill, refill_amount, refill_duration, timestamp, file_path)
-                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                           ''', (
-                               quota_info.type, quota_info.current, quota_info.maximum,
-                               quota_info.until, quota_info.percentage, quota_info.refill_type,
-                               quota_info.next_refill, quota_info.refill_amount,
-                               quota_info.refill_duration, quota_info.timestamp, quota_info.file_path
-                           ))
-            self.conn.commit()
+        if path_id not in rolled_up:
+            cursor.execute(f'SELECT MAX(last_ts) FROM {ROLLUP_TABLES["hourly"]} WHERE path_id = ?', (path_id,))
+            rolled_up[path_id] = cursor.fetchone()[0]
+        if rolled_up[path_id] is not None and ts <= rolled_up[path_id]:
             return True
-        except sqlite3.Error as e:
-            print(f"{Colors.INFO}{t('save_record_failed').format(error=e)}{Colors.RESET}")
-            return False
 
-    def load_history(self, limit=50, file_path=None):
-        """从数据库加载历史记录"""
-        if not self.ensure_connection():
-            print(f"{Colors.INFO}{t('load_history_failed')}{Colors.RESET}")
-            return []
+        cursor.execute('''
+                       SELECT COALESCE(last_seen_ts, ts)
+                       FROM history
+                       WHERE path_id = ?
+                         AND ts <= ?
+                       ORDER BY ts DESC
+                       LIMIT 1
+                       ''', (path_id, ts))
+        row = cursor.fetchone()
+        return row is not None and row[0] >= ts
+
+    @staticmethod
+    def intern_paths(cursor, file_paths):
+        """
+        确保路径都已保存在 paths 表中，返回 {路径: path_id}
 
-        try:
-            cursor = self.conn.cursor()
+        新路径会同时保存解析出的 IDE 产品名和版本；不提交事务。
+        """
+        path_ids = {}
+        for file_path in set(file_paths):
+            product, version = _parse_ide_product(file_path)
+            cursor.execute('INSERT OR IGNORE INTO paths (path, product, version) VALUES (?, ?, ?)',
+                           (file_path, product, version))
+            cursor.execute('SELECT id FROM paths WHERE path = ?', (file_path,))
+            path_ids[file_path] = cursor.fetchone()[0]
+        return path_ids
+
+    def insert_history_rows(self, cursor, quota_infos):
+        """
+        使用 executemany 写入多条历史记录，不提交事务
 
-            if file_path:
-                # 检查是否是目录，如果是则使用 LIKE 进行模糊匹配
-                if os.path.isdir(file_path):
-                    # 确保目录路径以 / 结尾，以便正确匹配子路径
-                    dir_path = os.path.join(file_path, '')  # 添加路径分隔符
-                    cursor.execute('''
-                                   SELECT *
-                                   FROM history
-                                   WHERE file_path LIKE ? || '%'
-                                   ORDER BY timestamp DESC
-                                   LIMIT ?
-                                   ''', (dir_path, limit))
-                else:
-                    # 精确匹配文件路径
-                    cursor.execute('''
-                                   SELECT *
-                                   FROM history
-                                   WHERE file_path = ?
-                                   ORDER BY timestamp DESC
-                                   LIMIT ?
-                                   ''', (file_path, limit))
+        开启合并存储时，与同一路径上一条记录内容相同的快照只更新该记录的
+        last_seen_ts 和 seen_count，内容变化时才插入新记录。
+        """
+        path_ids = self.intern_paths(cursor, [quota_info.file_path or "" for quota_info in quota_infos])
+        rows = [(
+            quota_info.type, quota_info.current, quota_info.maximum,
+            quota_info.until, quota_info.percentage, quota_info.refill_type,
+            quota_info.next_refill, quota_info.refill_amount,
+            quota_info.refill_duration, _iso_to_epoch_ms(quota_info.timestamp),
+            path_ids[quota_info.file_path or ""]
+        ) for quota_info in quota_infos]
+
+        if not self.run_length:
+            new_runs = [{"row": row, "last_ts": row[9], "count": 1} for row in rows]
+            updated_runs = []
+        else:
+            new_runs, updated_runs = self._merge_runs(cursor, rows)
+
+        cursor.executemany('''
+                           UPDATE history
+                           SET last_seen_ts = ?,
+                               seen_count   = ?
+                           WHERE id = ?
+                           ''', [(run["last_ts"], run["count"], run["id"]) for run in updated_runs])
+        cursor.executemany('''
+                           INSERT INTO history
+                           (type, current, maximum, until, percentage, refill_type,
+                            next_refill, refill_amount, refill_duration, ts, path_id,
+                            last_seen_ts, seen_count)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                           ''', [run["row"] + (run["last_ts"] if run["count"] > 1 else None, run["count"])
+                                 for run in new_runs])
+
+        # 在同一事务中更新每个路径的最新快照，乱序到达的旧快照不会覆盖更新的快照
+        latest = {}
+        for row in rows:
+            if row[10] not in latest or row[9] >= latest[row[10]][9]:
+                latest[row[10]] = row
+        cursor.executemany('''
+                           INSERT INTO latest_snapshot
+                           (type, current, maximum, until, percentage, refill_type,
+                            next_refill, refill_amount, refill_duration, ts, path_id)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                           ON CONFLICT (path_id) DO UPDATE SET
+                               type            = excluded.type,
+                               current         = excluded.current,
+                               maximum         = excluded.maximum,
+                               until           = excluded.until,
+                               percentage      = excluded.percentage,
+                               refill_type     = excluded.refill_type,
+                               next_refill     = excluded.next_refill,
+                               refill_amount   = excluded.refill_amount,
+                               refill_duration = excluded.refill_duration,
+                               ts              = excluded.ts
+                           WHERE excluded.ts >= latest_snapshot.ts
+                           ''', list(latest.values()))
+
+    @staticmethod
+    def _merge_runs(cursor, rows):
+        """
+        把连续相同的快照合并为区间
+
+        返回 (需要插入的新区间, 需要更新的已有记录)，每个区间是
+        {"id": 已有记录 id 或 None, "row": 第一次看到时的行, "key": 比较用的列, "last_ts": 最后看到时间, "count": 次数}
+        """
+        latest = {}
+        new_runs = []
+        updated_runs = {}
+        for row in rows:
+            key = row[:4] + row[5:9]
+            ts, path_id = row[9], row[10]
+            if path_id not in latest:
+                cursor.execute(f'''
+                               SELECT id, {RUN_LENGTH_COLUMNS}, COALESCE(last_seen_ts, ts), seen_count
+                               FROM history
+                               WHERE path_id = ?
+                               ORDER BY ts DESC, id DESC
+                               LIMIT 1
+                               ''', (path_id,))
+                last_row = cursor.fetchone()
+                latest[path_id] = {"id": last_row[0], "key": tuple(last_row[1:9]), "last_ts": last_row[9],
+                                   "count": last_row[10]} if last_row else None
+
+            run = latest[path_id]
+            # 只合并时间上连续的相同快照，乱序到达的旧快照仍单独保存
+            if run and run["key"] == key and ts >= run["last_ts"]:
+                run["last_ts"] = ts
+                run["count"] += 1
+                if run["id"] is not None:
+                    updated_runs[run["id"]] = run
             else:
-                # 加载所有记录
+                run = {"id": None, "row": row, "key": key, "last_ts": ts, "count": 1}
+                latest[path_id] = run
+                new_runs.append(run)
+        return new_runs, list(updated_runs.values())
+
+    @staticmethod
+    def _lookup_path_id(cursor, file_path):
+        """返回路径在 paths 表中的 id，不存在时返回 None"""
+        cursor.execute('SELECT id FROM paths WHERE path = ?', (file_path,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def save_history_item(self, quota_info, commit=True, fingerprint=None):
+        """
+        保存单个历史记录项
+
+        启用了后台写入器时只把记录放入队列，由写入器攒批提交。
+
+        Args:
+            quota_info: 配额信息
+            commit: 是否立即提交事务；批量写入时传 False，最后统一调用 commit()
+            fingerprint: 配额文件的指纹 (路径, stat 结果, 内容哈希)，与记录在同一个事务中保存
+        """
+        if self.writer is not None:
+            self.writer.put(quota_info, fingerprint)
+            return True
+
+        # 内存数据库退出后数据会丢失，同时写入 JSON 历史日志，下次启动时再迁移
+        if self.in_memory:
+            try:
+                self.config_manager.save_history(quota_info)
+            except OSError as e:
+                print(f"{Colors.INFO}{t('save_record_failed').format(error=e)}{Colors.RESET}")
+
+        if not self.ensure_connection():
+            print(f"{Colors.INFO}{t('save_history_failed')}{Colors.RESET}")
+            return False
+
+        try:
+            cursor = self.conn.cursor()
+            self.insert_history_rows(cursor, [quota_info])
+            if fingerprint is not None:
+                self.upsert_file_fingerprint(cursor, *fingerprint)
+            if commit:
+                self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"{Colors.INFO}{t('save_record_failed').format(error=e)}{Colors.RESET}")
+            return False
+
+    def commit(self):
+        """提交当前事务"""
+        if not self.ensure_connection():
+            return False
+
+        try:
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"{Colors.INFO}{t('save_record_failed').format(error=e)}{Colors.RESET}")
+            return False
+
+    def compact_history(self, max_batches=HISTORY_COMPACTION_MAX_BATCHES):
+        """
+        把超过保留期的原始历史记录汇总到小时和天统计表并删除
+
+        每个事务最多处理 HISTORY_COMPACTION_BATCH_SIZE 条记录，最多执行 max_batches 个事务，
+        因此不会长时间占用写锁；没处理完的记录留到下次压缩。
+
+        Returns:
+            本次汇总并删除的原始记录数
+        """
+        retention_days = self.config_manager.get_history_retention_days()
+        if retention_days <= 0 or self.read_only or not self.ensure_connection():
+            return 0
+
+        # 压缩会删除原始记录：只在其他实例都没有持有应用程序锁时进行，期间持有排他锁，
+        # 避免两个实例同时压缩，或者删除另一个实例正在分页读取的记录
+        if self.app_lock is not None and not self.app_lock.acquire(exclusive=True):
+            return 0
+        try:
+            return self._compact_expired(retention_days, max_batches)
+        finally:
+            if self.app_lock is not None:
+                # 恢复共享锁；转换锁模式不是原子操作，其他实例恰好开始压缩时等待它完成
+                self.app_lock.acquire(exclusive=False, blocking=True)
+
+    def _compact_expired(self, retention_days, max_batches):
+        """执行压缩的事务，见 compact_history"""
+        cutoff = int((time.time() - retention_days * 86400) * 1000)
+        compacted = 0
+        try:
+            cursor = self.conn.cursor()
+            for _ in range(max_batches):
+                # 最后看到时间仍在保留期内的合并区间不压缩，它可能还会被延长
                 cursor.execute('''
-                               SELECT *
+                               SELECT id, path_id, ts, COALESCE(last_seen_ts, ts), current, percentage, maximum, seen_count
                                FROM history
-                               ORDER BY timestamp DESC
+                               WHERE ts < ?
+                                 AND COALESCE(last_seen_ts, ts) < ?
+                               ORDER BY ts
                                LIMIT ?
-                               ''', (limit,))
+                               ''', (cutoff, cutoff, HISTORY_COMPACTION_BATCH_SIZE))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
 
-            rows = cursor.fetchall()
+                for granularity, table in ROLLUP_TABLES.items():
+                    cursor.executemany(f'''
+                                       INSERT INTO {table}
+                                       (path_id, bucket, current_min, current_max, current_last,
+                                        percentage_min, percentage_max, percentage_last, maximum_last, last_ts, samples)
+                                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                       ON CONFLICT (path_id, bucket) DO UPDATE SET
+                                           current_min     = MIN(current_min, excluded.current_min),
+                                           current_max     = MAX(current_max, excluded.current_max),
+                                           percentage_min  = MIN(percentage_min, excluded.percentage_min),
+                                           percentage_max  = MAX(percentage_max, excluded.percentage_max),
+                                           current_last    = CASE WHEN excluded.last_ts >= last_ts
+                                                                  THEN excluded.current_last ELSE current_last END,
+                                           percentage_last = CASE WHEN excluded.last_ts >= last_ts
+                                                                  THEN excluded.percentage_last ELSE percentage_last END,
+                                           maximum_last    = CASE WHEN excluded.last_ts >= last_ts
+                                                                  THEN excluded.maximum_last ELSE maximum_last END,
+                                           last_ts         = MAX(last_ts, excluded.last_ts),
+                                           samples         = samples + excluded.samples
+                                       ''', self._aggregate_rollup(rows, granularity))
+                cursor.executemany('DELETE FROM history WHERE id = ?', [(row[0],) for row in rows])
+                self.conn.commit()
+                compacted += len(rows)
+        except sqlite3.Error as e:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            print(f"{Colors.INFO}{t('history_compaction_failed').format(error=e)}{Colors.RESET}")
+
+        if compacted:
+            print(f"{Colors.INFO}{t('history_compacted').format(count=compacted, days=retention_days)}{Colors.RESET}")
+        return compacted
+
+    @staticmethod
+    def _bucket_start(ts, granularity):
+        """返回毫秒时间戳所在本地小时或本地自然日的起始时间（毫秒）"""
+        dt = datetime.fromtimestamp(ts / 1000).replace(minute=0, second=0, microsecond=0)
+        if granularity == "daily":
+            dt = dt.replace(hour=0)
+        return int(dt.timestamp() * 1000)
+
+    @classmethod
+    def _aggregate_rollup(cls, rows, granularity):
+        """
+        把一批原始记录按 (path_id, 时间段) 汇总，返回与汇总表列顺序一致的行
+
+        合并存储的区间计入第一次看到时所在的时间段，最后值以最后看到时间为准。
+        """
+        buckets = {}
+        for _, path_id, ts, last_ts, current, percentage, maximum, seen_count in rows:
+            key = (path_id, cls._bucket_start(ts, granularity))
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [current, current, current, percentage, percentage, percentage, maximum,
+                                last_ts, seen_count]
+                continue
+            bucket[0] = min(bucket[0], current)
+            bucket[1] = max(bucket[1], current)
+            bucket[3] = min(bucket[3], percentage)
+            bucket[4] = max(bucket[4], percentage)
+            if last_ts >= bucket[7]:
+                bucket[2], bucket[5], bucket[6], bucket[7] = current, percentage, maximum, last_ts
+            bucket[8] += seen_count
+        return [key + tuple(values) for key, values in buckets.items()]
+
+    @staticmethod
+    def _upsert_path_usage(cursor, path, used_at):
+        """路径使用次数加一并更新最后使用时间，不提交事务"""
+        cursor.execute('''
+                       INSERT INTO path_usage (path, use_count, last_used)
+                       VALUES (?, 1, ?)
+                       ON CONFLICT (path) DO UPDATE SET
+                           use_count = use_count + 1,
+                           last_used = MAX(last_used, excluded.last_used)
+                       ''', (path, used_at))
+
+    def record_path_use(self, path):
+        """记录用户使用了某个路径（分析文件或查看其历史记录）"""
+        if not path or not self.ensure_connection():
+            return False
+
+        try:
+            self._upsert_path_usage(self.conn.cursor(), path, int(time.time() * 1000))
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            print(f"{Colors.INFO}{t('save_record_failed').format(error=e)}{Colors.RESET}")
+            return False
+
+    def get_recommended_paths(self, max_count=5):
+        """
+        获取推荐的历史路径，按 frecency 得分排序
+
+        得分 = 使用次数 / (1 + 距最后使用的天数 / FRECENCY_DECAY_DAYS)，
+        即使用次数的权重随时间双曲衰减。只读取 path_usage 表，耗时与历史记录数量无关。
+
+        Args:
+            max_count: 最多返回的推荐路径数量
+
+        Returns:
+            推荐路径列表，按推荐度排序
+        """
+        if not self.ensure_connection():
+            return []
+
+        try:
+            cursor = self._reader().cursor()
+            cursor.execute('''
+                           SELECT path
+                           FROM path_usage
+                           ORDER BY use_count / (1.0 + (? - last_used) / 86400000.0 / ?) DESC, last_used DESC
+                           LIMIT ?
+                           ''', (int(time.time() * 1000), FRECENCY_DECAY_DAYS, max_count))
+            return [row[0] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"{Colors.INFO}{t('get_paths_failed').format(error=e)}{Colors.RESET}")
+            return []
+
+    def get_file_fingerprint(self, file_path):
+        """
+        获取配额文件上次记录时的指纹
+
+        Returns:
+            (inode, mtime_ns, size, content_hash) 元组，没有记录时返回 None
+        """
+        if not self.ensure_connection():
+            return None
+
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                           SELECT inode, mtime_ns, size, content_hash
+                           FROM file_fingerprints
+                           WHERE file_path = ?
+                           ''', (file_path,))
+            return cursor.fetchone()
+        except sqlite3.Error as e:
+            print(f"{Colors.INFO}{t('fingerprint_error').format(error=e)}{Colors.RESET}")
+            return None
+
+    def load_file_fingerprints(self):
+        """
+        加载所有配额文件的指纹
+
+        Returns:
+            {文件路径: (inode, mtime_ns, size, content_hash)} 字典
+        """
+        if not self.ensure_connection():
+            return {}
+
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT file_path, inode, mtime_ns, size, content_hash FROM file_fingerprints')
+            return {row[0]: row[1:] for row in cursor.fetchall()}
+        except sqlite3.Error as e:
+            print(f"{Colors.INFO}{t('fingerprint_error').format(error=e)}{Colors.RESET}")
+            return {}
+
+    def save_file_fingerprint(self, file_path, stat_result, content_hash, commit=True):
+        """
+        保存配额文件的指纹，并更新最后一次看到该文件的时间
+
+        Args:
+            commit: 是否立即提交事务；批量写入时传 False，最后统一调用 commit()
+        """
+        if not self.ensure_connection():
+            return False
+
+        try:
+            self.upsert_file_fingerprint(self.conn.cursor(), file_path, stat_result, content_hash)
+            if commit:
+                self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"{Colors.INFO}{t('fingerprint_error').format(error=e)}{Colors.RESET}")
+            return False
+
+    @staticmethod
+    def upsert_file_fingerprint(cursor, file_path, stat_result, content_hash):
+        """写入配额文件的指纹和最后一次看到该文件的时间，不提交事务"""
+        cursor.execute('''
+                       INSERT OR REPLACE INTO file_fingerprints
+                           (file_path, inode, mtime_ns, size, content_hash, last_seen)
+                       VALUES (?, ?, ?, ?, ?, ?)
+                       ''', (
+                           file_path, stat_result.st_ino, stat_result.st_mtime_ns,
+                           stat_result.st_size, content_hash, datetime.now().isoformat()
+                       ))
+
+    def load_discovery_index(self):
+        """
+        加载配额文件发现索引
+
+        Returns:
+            {路径: (mtime_ns, 扫描结果列表)} 字典
+        """
+        if not self.ensure_connection():
+            return {}
+
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT path, mtime_ns, entries FROM discovery_index')
+            return {path: (mtime_ns, json.loads(entries)) for path, mtime_ns, entries in cursor.fetchall()}
+        except (sqlite3.Error, ValueError) as e:
+            print(f"{Colors.INFO}{t('discovery_index_error').format(error=e)}{Colors.RESET}")
+            return {}
+
+    def save_discovery_index(self, index):
+        """用本次扫描得到的索引替换已保存的配额文件发现索引"""
+        if not self.ensure_connection():
+            return False
+
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('DELETE FROM discovery_index')
+            cursor.executemany(
+                'INSERT INTO discovery_index (path, mtime_ns, entries) VALUES (?, ?, ?)',
+                [(path, mtime_ns, json.dumps(entries)) for path, (mtime_ns, entries) in index.items()]
+            )
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"{Colors.INFO}{t('discovery_index_error').format(error=e)}{Colors.RESET}")
+            self.conn.rollback()
+            return False
+
+    def get_log_checkpoint(self, log_path):
+        """
+        获取日志文件的导入检查点
+
+        Returns:
+            (inode, offset) 元组，没有检查点时返回 None
+        """
+        if not self.ensure_connection():
+            return None
+
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT inode, offset FROM log_checkpoints WHERE log_path = ?', (log_path,))
+            return cursor.fetchone()
+        except sqlite3.Error as e:
+            print(f"{Colors.INFO}{t('log_ingest_error').format(error=e)}{Colors.RESET}")
+            return None
+
+    def save_log_events(self, log_path, events, inode, offset):
+        """
+        在同一个事务中保存配额日志事件并更新检查点
+
+        Returns:
+            新插入的事件数量，失败时返回 None
+        """
+        if not self.ensure_connection():
+            return None
+
+        try:
+            cursor = self.conn.cursor()
+            changes_before = self.conn.total_changes
+            # 轮转文件无法定位时会重新读取，已导入的事件通过唯一约束忽略
+            cursor.executemany('''
+                               INSERT OR IGNORE INTO log_events
+                                   (log_path, timestamp, message, current, maximum, until)
+                               VALUES (?, ?, ?, ?, ?, ?)
+                               ''', [
+                                   (log_path, event.timestamp, event.message, _to_number(event.current),
+                                    _to_number(event.maximum), event.until)
+                                   for event in events
+                               ])
+            inserted = self.conn.total_changes - changes_before
+            cursor.execute('''
+                           INSERT OR REPLACE INTO log_checkpoints (log_path, inode, offset, updated)
+                           VALUES (?, ?, ?, ?)
+                           ''', (log_path, inode, offset, datetime.now().isoformat()))
+            self.conn.commit()
+            return inserted
+        except sqlite3.Error as e:
+            print(f"{Colors.INFO}{t('log_ingest_error').format(error=e)}{Colors.RESET}")
+            self.conn.rollback()
+            return None
+
+    def load_history(self, limit=50, file_path=None, expand=True):
+        """
+        从数据库加载历史记录
+
+        Args:
+            limit: 最多返回的记录数
+            file_path: 文件路径或目录，为空时加载所有记录
+            expand: 是否把合并存储的区间展开为最后一次和第一次看到的两条快照；
+                    为 False 时每个区间返回一条记录，seen_count 为合并的次数
+        """
+        return list(itertools.islice(self.iter_history(file_path=file_path, page_size=limit, expand=expand), limit))
+
+    def iter_history(self, file_path=None, page_size=HISTORY_PAGE_SIZE, before=None, after=None, expand=True,
+                     product=None):
+        """
+        按时间倒序逐页读取历史记录
+
+        合并存储的记录按最后一次看到快照的时间排序，使用 (最后看到时间, id) 键集分页：每一页都从
+        上一页最后一条记录之后继续查询，沿 idx_history_path_seen 或 idx_history_seen 索引读取，
+        翻到很深的页也不需要 OFFSET 跳过前面的行。展开区间时，第一次看到的快照先放入堆中，
+        等读到更早的记录时再按时间顺序输出，因此多个路径的区间交错时输出仍按时间倒序。
+
+        Args:
+            file_path: 文件路径或目录，为空时读取所有记录
+            page_size: 每次查询读取的行数
+            before: 只返回早于该毫秒时间戳的快照
+            after: 只返回晚于该毫秒时间戳的快照；仍在持续的区间按最后一次看到的时间判断
+            expand: 是否展开合并存储的区间，见 load_history
+            product: 只返回该 IDE 产品的记录，见 _path_condition
+
+        Yields:
+            QuotaInfo 对象
+        """
+        if not self.ensure_connection():
+            print(f"{Colors.INFO}{t('load_history_failed')}{Colors.RESET}")
+            return
+
+        # 先等待后台写入器提交已排队的记录，保证能读到刚保存的数据
+        self.flush_history()
+        page_size = max(1, page_size)
+
+        try:
+            cursor = self._reader().cursor()
+
+            condition, params = self._path_condition(cursor, file_path, "h.path_id", product=product)
+            if condition is None:
+                return
+            if after is not None:
+                condition += f" AND {HISTORY_SEEN_TS} > ?"
+                params += (after,)
+
+            # 尚未输出的区间第一次看到的快照：(-ts, -id, QuotaInfo)，堆顶是时间最晚的
+            pending = []
+            if before is not None and expand:
+                # 跨越 before 的区间：最后一次看到的快照不在范围内，第一次看到的快照在范围内；每个路径最多一条
+                cursor.execute(f'''
+                               SELECT {HISTORY_COLUMNS}, h.id
+                               FROM {HISTORY_FROM}
+                               WHERE {condition} AND {HISTORY_SEEN_TS} >= ? AND h.ts < ?
+                               ''', params + (before, before))
+                for row in cursor.fetchall():
+                    first = self._row_to_quota_info(row)
+                    first.seen_count = 1
+                    heapq.heappush(pending, (-row[9], -row[13], first))
+
+            last_seen, last_id = before, None
+            while True:
+                page_condition, page_params = condition, params
+                if last_id is not None:
+                    # (最后看到时间, id) < (last_seen, last_id)，先用时间范围走索引
+                    page_condition += f" AND {HISTORY_SEEN_TS} <= ? AND ({HISTORY_SEEN_TS} < ? OR h.id < ?)"
+                    page_params += (last_seen, last_seen, last_id)
+                elif last_seen is not None:
+                    page_condition += f" AND {HISTORY_SEEN_TS} < ?"
+                    page_params += (last_seen,)
+
+                cursor.execute(f'''
+                               SELECT {HISTORY_COLUMNS}, h.id, {HISTORY_SEEN_TS}
+                               FROM {HISTORY_FROM}
+                               WHERE {page_condition}
+                               ORDER BY {HISTORY_SEEN_TS} DESC, h.id DESC
+                               LIMIT ?
+                               ''', page_params + (page_size,))
+                rows = cursor.fetchall()
+
+                # 转换为QuotaInfo对象
+                for row in rows:
+                    if not expand:
+                        yield self._row_to_quota_info(row)
+                        continue
+                    # 先输出比这条记录更晚的区间起点
+                    while pending and -pending[0][0] > row[14]:
+                        yield heapq.heappop(pending)[2]
+                    expanded = self._expand_run(row)
+                    yield expanded[0]
+                    if len(expanded) > 1 and (after is None or row[9] > after):
+                        heapq.heappush(pending, (-row[9], -row[13], expanded[1]))
+
+                if len(rows) < page_size:
+                    break
+                last_seen, last_id = rows[-1][14], rows[-1][13]
+
+            while pending:
+                yield heapq.heappop(pending)[2]
+        except sqlite3.Error as e:
+            print(f"{Colors.INFO}{t('load_records_failed').format(error=e)}{Colors.RESET}")
+
+    def _path_condition(self, cursor, file_path, column, product=None):
+        """
+        生成按路径和 IDE 产品过滤的 WHERE 条件
+
+        目录匹配其下所有路径，使用 idx_paths_path_nocase 索引上的半开区间 [目录/, 目录0) 查询，
+        与之前的 LIKE 一样不区分 ASCII 字母大小写（Windows 和 macOS 上输入的目录大小写可能与记录不同），
+        但不会把路径中的 _ 和 % 当作通配符；文件先查出 path_id 再按 id 过滤。
 
-            # 转换为QuotaInfo对象
-            result = []
-            for row in rows:
-                data = {
-                    "type": row[1],
-                    "current": row[2],
-                    "maximum": row[3],
-                    "until": row[4],
-                    "percentage": row[5],
-                    "refill_type": row[6],
-                    "next_refill": row[7],
-                    "refill_amount": row[8],
-                    "refill_duration": row[9],
-                    "timestamp": row[10],
-                    "file_path": row[11]
-                }
-                result.append(QuotaInfo.from_dict(data))
-
-            return result
+        Args:
+            product: IDE 产品名（如 PyCharm，不区分大小写），或带版本的配置目录名（如 PyCharm2024.1）
+
+        Returns:
+            (WHERE 条件, 参数元组)；不过滤时条件为 "1"，文件不在路径表中时条件为 None
+        """
+        conditions = []
+        params = ()
+
+        if file_path:
+            # 检查是否是目录，如果是则匹配目录下的所有路径
+            if os.path.isdir(file_path):
+                # 确保目录路径以 / 结尾，以便正确匹配子路径
+                dir_path = os.path.join(file_path, '')  # 添加路径分隔符
+                conditions.append(f"{column} IN (SELECT id FROM paths "
+                                  f"WHERE path >= ? COLLATE NOCASE AND path < ? COLLATE NOCASE)")
+                params += (dir_path, _prefix_upper_bound(dir_path))
+            else:
+                path_id = self._lookup_path_id(cursor, file_path)
+                if path_id is None:
+                    return None, ()
+                conditions.append(f"{column} = ?")
+                params += (path_id,)
+
+        if product:
+            match = IDE_DIR_PATTERN.match(product)
+            if match:
+                conditions.append(f"{column} IN (SELECT id FROM paths "
+                                  f"WHERE product = ? COLLATE NOCASE AND version = ?)")
+                params += (match.group(1), match.group(2))
+            else:
+                conditions.append(f"{column} IN (SELECT id FROM paths WHERE product = ? COLLATE NOCASE)")
+                params += (product,)
+
+        return " AND ".join(conditions) or "1", params
+
+    def load_latest_snapshots(self, file_path=None, product=None):
+        """
+        从 latest_snapshot 表读取每个路径的最新快照，不查询 history 表，也不解析配额文件
+
+        Returns:
+            QuotaInfo 列表，按路径排序，timestamp 为最后一次看到该快照的时间
+        """
+        if not self.ensure_connection():
+            print(f"{Colors.INFO}{t('load_history_failed')}{Colors.RESET}")
+            return []
+
+        # 先等待后台写入器提交已排队的记录
+        self.flush_history()
+
+        try:
+            cursor = self._reader().cursor()
+            where, params = self._path_condition(cursor, file_path, "s.path_id", product=product)
+            if where is None:
+                return []
+            cursor.execute(f'''
+                           SELECT s.type, s.current, s.maximum, s.until, s.percentage, s.refill_type,
+                                  s.next_refill, s.refill_amount, s.refill_duration, s.ts, p.path, NULL, 1
+                           FROM latest_snapshot s
+                                    JOIN paths p ON p.id = s.path_id
+                           WHERE {where}
+                           ORDER BY p.path
+                           ''', params)
+            return [self._row_to_quota_info(row) for row in cursor.fetchall()]
         except sqlite3.Error as e:
             print(f"{Colors.INFO}{t('load_records_failed').format(error=e)}{Colors.RESET}")
             return []
 
+    def load_rollups(self, granularity="daily", limit=50, file_path=None, product=None, before=None, after=None):
+        """
+        从小时或天汇总表加载历史统计，用于查看超出原始记录保留期的长期趋势
+
+        Args:
+            limit: 最多返回的时间段数，为 None 时返回所有匹配的时间段
+            before: 只返回早于该毫秒时间戳开始的时间段
+            after: 只返回包含该毫秒时间戳之后记录的时间段
+
+        Returns:
+            字典列表，按时间段倒序，包含 bucket（ISO 时间）、file_path、samples 以及
+            current/percentage 的 min/max/last 和 maximum_last
+        """
+        if not self.ensure_connection():
+            print(f"{Colors.INFO}{t('load_history_failed')}{Colors.RESET}")
+            return []
+
+        try:
+            cursor = self._reader().cursor()
+            where, params = self._path_condition(cursor, file_path, "r.path_id", product=product)
+            if where is None:
+                return []
+            if before is not None:
+                where += " AND r.bucket < ?"
+                params += (before,)
+            if after is not None:
+                where += " AND r.last_ts > ?"
+                params += (after,)
+            cursor.execute(f'''
+                           SELECT r.bucket, p.path, r.current_min, r.current_max, r.current_last,
+                                  r.percentage_min, r.percentage_max, r.percentage_last, r.maximum_last, r.samples
+                           FROM {ROLLUP_TABLES[granularity]} r
+                                    JOIN paths p ON p.id = r.path_id
+                           WHERE {where}
+                           ORDER BY r.bucket DESC, p.path
+                           LIMIT ?
+                           ''', params + (-1 if limit is None else limit,))
+            keys = ("bucket", "file_path", "current_min", "current_max", "current_last",
+                    "percentage_min", "percentage_max", "percentage_last", "maximum_last", "samples")
+            rollups = []
+            for row in cursor.fetchall():
+                rollup = dict(zip(keys, row))
+                rollup["bucket"] = _epoch_ms_to_iso(rollup["bucket"])
+                rollups.append(rollup)
+            return rollups
+        except sqlite3.Error as e:
+            print(f"{Colors.INFO}{t('load_records_failed').format(error=e)}{Colors.RESET}")
+            return []
+
+    @staticmethod
+    def _row_to_quota_info(row):
+        """将按 HISTORY_COLUMNS 顺序查询的历史记录行转换为 QuotaInfo 对象"""
+        data = {
+            "type": row[0],
+            "current": row[1],
+            "maximum": row[2],
+            "until": row[3],
+            "percentage": row[4],
+            "refill_type": row[5],
+            "next_refill": row[6],
+            "refill_amount": row[7],
+            "refill_duration": row[8],
+            "timestamp": _epoch_ms_to_iso(row[9]),
+            "file_path": row[10]
+        }
+        quota_info = QuotaInfo.from_dict(data)
+        quota_info.seen_count = row[12]
+        return quota_info
+
+    @classmethod
+    def _expand_run(cls, row):
+        """把合并存储的记录展开为最后一次和第一次看到的快照（按时间倒序）"""
+        first = cls._row_to_quota_info(row)
+        if row[11] is None or row[12] <= 1:
+            return [first]
+        last = cls._row_to_quota_info(row)
+        last.timestamp = _epoch_ms_to_iso(row[11])
+        first.seen_count = 1
+        return [last, first]
+
     def get_unique_paths(self):
         """获取历史记录中的唯一路径"""
         if not self.ensure_connection():
             return []
 
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
+            # 路径字典很小，逐个用 (path_id, ts) 索引确认是否还有历史记录，不需要扫描整个 history 表
             cursor.execute('''
-                           SELECT DISTINCT file_path
-                           FROM history
-                           WHERE file_path != ''
-                           ORDER BY file_path
+                           SELECT path
+                           FROM paths
+                           WHERE path != ''
+                             AND EXISTS (SELECT 1 FROM history WHERE path_id = paths.id)
+                           ORDER BY path
                            ''')
 
             rows = cursor.fetchall()
@@ -817,6 +2545,8 @@ class DatabaseManager:
             print(error_msg)
             return False
 
+        self.flush_history()
+
         try:
             cursor = self.conn.cursor()
 
@@ -828,14 +2558,20 @@ class DatabaseManager:
 
             # 获取记录数
             if file_path:
-                cursor.execute('SELECT COUNT(*) FROM history WHERE file_path = ?', (file_path,))
+                path_id = self._lookup_path_id(cursor, file_path)
+                cursor.execute('SELECT COUNT(*) FROM history WHERE path_id = ?', (path_id,))
                 count = cursor.fetchone()[0]
                 if count == 0:
                     print(f"{Colors.WARNING}{t('no_path_history').format(path=file_path)}{Colors.RESET}")
                     return True
 
                 # 执行删除指定路径的历史记录
-                cursor.execute('DELETE FROM history WHERE file_path = ?', (file_path,))
+                cursor.execute('DELETE FROM history WHERE path_id = ?', (path_id,))
+                for table in ROLLUP_TABLES.values():
+                    cursor.execute(f'DELETE FROM {table} WHERE path_id = ?', (path_id,))
+                cursor.execute('DELETE FROM latest_snapshot WHERE path_id = ?', (path_id,))
+                cursor.execute('DELETE FROM paths WHERE id = ?', (path_id,))
+                cursor.execute('DELETE FROM file_fingerprints WHERE file_path = ?', (file_path,))
                 success_msg = t('clear_success').format(message=t('clear_path_success').format(path=file_path))
             else:
                 cursor.execute('SELECT COUNT(*) FROM history')
@@ -846,13 +2582,18 @@ class DatabaseManager:
 
                 # 执行删除所有历史记录
                 cursor.execute('DELETE FROM history')
+                for table in ROLLUP_TABLES.values():
+                    cursor.execute(f'DELETE FROM {table}')
+                cursor.execute('DELETE FROM latest_snapshot')
+                cursor.execute('DELETE FROM paths')
+                cursor.execute('DELETE FROM file_fingerprints')
                 success_msg = t('clear_all_success_count').format(count=count)
 
             self.conn.commit()
 
             # 验证删除结果
             if file_path:
-                cursor.execute('SELECT COUNT(*) FROM history WHERE file_path = ?', (file_path,))
+                cursor.execute('SELECT COUNT(*) FROM history WHERE path_id = ?', (path_id,))
             else:
                 cursor.execute('SELECT COUNT(*) FROM history')
 
@@ -883,6 +2624,13 @@ class DatabaseManager:
 
     def close(self):
         """关闭数据库连接"""
+        self.stop_history_writer()
+        if self.read_conn:
+            try:
+                self.read_conn.close()
+            except sqlite3.Error:
+                pass
+            self.read_conn = None
         if self.conn:
             try:
                 self.conn.close()
@@ -895,10 +2643,22 @@ class DatabaseManager:
 class QuotaAnalyzer:
     """配额分析器"""
 
-    def __init__(self, db_manager):
-        """初始化配额分析器"""
+    def __init__(self, db_manager, use_cache=True, rescan=False):
+        """
+        初始化配额分析器
+
+        Args:
+            db_manager: 数据库管理器
+            use_cache: 是否使用文件指纹缓存跳过未变化的配额文件
+            rescan: 是否忽略配额文件发现索引，重新完整扫描文件系统
+        """
         self.db_manager = db_manager
         self.config_manager = db_manager.config_manager
+        self.use_cache = use_cache
+        self.rescan = rescan
+        # 文件指纹缓存的命中/未命中次数
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def _find_quota_file(self, directory):
         """在指定目录中查找配额文件"""
@@ -969,21 +2729,144 @@ class QuotaAnalyzer:
                 print(f"Linux: ~/.config/JetBrains/{t('product_placeholder')}/options/AIAssistantQuotaManager2.xml")
                 return
 
-            # 解析XML文件
-            quota_info = QuotaInfo.from_xml_file(file_path)
-            if not quota_info:
-                return None
-
-            # 保存到历史记录
-            self.db_manager.save_history_item(quota_info)
-
-            return quota_info
+            return self._analyze_quota_file(file_path)
 
         except Exception as e:
             print(f"{Colors.INFO}{t('analyze_error').format(error=e)}{Colors.RESET}")
             traceback.print_exc()
             return None
 
+    def _analyze_quota_file(self, file_path):
+        """
+        解析配额文件并保存到历史记录
+
+        如果文件的 inode、修改时间和大小与上次记录一致（或内容哈希一致），
+        则跳过解析和写入，直接返回上次记录的配额信息。
+        """
+        file_path = os.path.abspath(file_path)
+        fingerprint = self.db_manager.get_file_fingerprint(file_path) if self.use_cache else None
+        _, stat_result, content_hash, quota_info = self._inspect_quota_file(file_path, fingerprint)
+
+        if quota_info is None:
+            last_record = self._load_unchanged(file_path, stat_result, content_hash)
+            if last_record:
+                print(f"{Colors.INFO}{t('quota_file_unchanged').format(path=file_path)}{Colors.RESET}")
+                return last_record
+            quota_info = QuotaInfo.from_xml_file(file_path)
+
+        if quota_info.parse_error is not None:
+            return None
+        self._record(file_path, stat_result, content_hash, quota_info)
+        return quota_info
+
+    @staticmethod
+    def _inspect_quota_file(file_path, fingerprint):
+        """
+        检查配额文件是否变化，变化时解析文件（不访问数据库，可以在工作线程中调用）
+
+        Args:
+            file_path: 配额文件的绝对路径
+            fingerprint: 上次记录的指纹 (inode, mtime_ns, size, content_hash)，没有时为 None
+
+        Returns:
+            (file_path, stat_result, content_hash, quota_info)；文件未变化时 quota_info 为 None
+        """
+        stat_result = os.stat(file_path)
+        content_hash = None
+
+        if fingerprint:
+            inode, mtime_ns, size, cached_hash = fingerprint
+            unchanged = (inode, mtime_ns, size) == (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+            if not unchanged:
+                # 元数据变化时再比较内容，IDE 可能重写了相同的内容
+                content_hash = _hash_file(file_path)
+                unchanged = content_hash == cached_hash
+
+            if unchanged:
+                return file_path, stat_result, cached_hash, None
+
+        if content_hash is None:
+            content_hash = _hash_file(file_path)
+
+        return file_path, stat_result, content_hash, QuotaInfo.from_xml_file(file_path)
+
+    def _load_unchanged(self, file_path, stat_result, content_hash, commit=True):
+        """
+        文件未变化时不重新解析，以当前时间再记录一次上次的配额信息并返回；没有历史记录时返回 None
+
+        合并存储时这只更新上一条记录的 last_seen_ts 和 seen_count，压缩历史记录和汇总统计
+        不会把文件没有变化的时段当作没有快照；文件指纹与记录在同一个事务中保存
+        """
+        last_records = self.db_manager.load_history(limit=1, file_path=file_path)
+        if not last_records:
+            return None
+
+        self.cache_hits += 1
+        quota_info = copy.copy(last_records[0])
+        quota_info.timestamp = datetime.now().isoformat()
+        quota_info.seen_count = 1
+        self.db_manager.save_history_item(quota_info, commit=commit,
+                                          fingerprint=(file_path, stat_result, content_hash))
+        return quota_info
+
+    def _record(self, file_path, stat_result, content_hash, quota_info, commit=True):
+        """保存新解析的配额信息，文件指纹与记录在同一个事务中保存"""
+        self.cache_misses += 1
+        self.db_manager.save_history_item(quota_info, commit=commit,
+                                          fingerprint=(file_path, stat_result, content_hash))
+
+    def analyze_files_batch(self, file_paths):
+        """
+        批量分析配额文件
+
+        在线程池中并发检查和解析文件，所有结果在同一个事务中写入数据库。
+
+        Args:
+            file_paths: 配额文件路径列表
+
+        Returns:
+            (成功分析的 QuotaInfo 列表, 耗时秒数)
+        """
+        start = time.perf_counter()
+        file_paths = [os.path.abspath(path) for path in file_paths]
+        fingerprints = self.db_manager.load_file_fingerprints() if self.use_cache else {}
+
+        def inspect(path):
+            try:
+                return self._inspect_quota_file(path, fingerprints.get(path))
+            except Exception as e:
+                print(f"{Colors.INFO}{t('analyze_error').format(error=e)}{Colors.RESET}")
+                return None
+
+        # 工作线程解析XML和计算哈希，先在主线程中加载这两个延迟导入的模块
+        _load_lazy_modules(ET, hashlib)
+        with concurrent_futures.ThreadPoolExecutor(max_workers=ANALYSIS_MAX_WORKERS) as executor:
+            results = [result for result in executor.map(inspect, file_paths) if result]
+
+        # 所有写入在同一个事务中完成，只提交一次
+        quota_infos = []
+        for file_path, stat_result, content_hash, quota_info in results:
+            if quota_info is None:
+                last_record = self._load_unchanged(file_path, stat_result, content_hash, commit=False)
+                if last_record:
+                    quota_infos.append(last_record)
+                    continue
+                quota_info = QuotaInfo.from_xml_file(file_path)
+
+            # 解析失败的文件不保存，也不记录指纹，下次仍会重新解析
+            if quota_info.parse_error is not None:
+                continue
+            self._record(file_path, stat_result, content_hash, quota_info, commit=False)
+            quota_infos.append(quota_info)
+        self.db_manager.commit()
+
+        return quota_infos, time.perf_counter() - start
+
+    def _print_cache_stats(self):
+        """打印文件指纹缓存的命中情况"""
+        if self.use_cache:
+            print(f"{Colors.INFO}{t('fingerprint_cache_stats').format(hits=self.cache_hits, misses=self.cache_misses)}{Colors.RESET}")
+
     def _get_progress_bar(self, percentage, width=30):
         """
         生成一个带颜色的文本进度条
@@ -1055,13 +2938,85 @@ class QuotaAnalyzer:
             input(f"\n{Colors.MENU_PROMPT}{t('press_enter')}{Colors.RESET}")
             print()  # 添加一个空行
 
-    def display_history(self, file_path=None, limit=10):
-        """显示历史记录"""
-        history = self.db_manager.load_history(limit=limit, file_path=file_path)
+    def display_summary(self, quota_infos, title=None, show_time=False):
+        """
+        以表格形式显示多个配额文件的汇总信息
 
-        if not history:
-            print(f"{Colors.INFO}{t('no_history')}{Colors.RESET}")
+        Args:
+            quota_infos: 配额信息列表
+            title: 表格标题，默认为批量分析汇总标题
+            show_time: 是否显示记录时间列
+        """
+        print(f"\n{Colors.HEADER}{title or t('batch_summary_title')}{Colors.RESET}")
+        header = f"{Colors.TABLE_HEADER}{t('column_num'):<4} {t('column_type'):<15} {t('column_usage'):<10} {t('column_current_max'):<25} {t('column_valid_until'):<25} "
+        if show_time:
+            header += f"{t('column_time'):<20} "
+        header += t('column_filepath')
+        print(f"{header}{Colors.RESET}")
+        print(f"{Colors.DIM}{'-' * 100}{Colors.RESET}")
+
+        for i, item in enumerate(quota_infos, 1):
+            # 根据使用率选择颜色
+            if item.percentage < 30:
+                percent_color = Colors.PROGRESS_LOW
+            elif item.percentage < 70:
+                percent_color = Colors.PROGRESS_MEDIUM
+            else:
+                percent_color = Colors.PROGRESS_HIGH
+
+            current_max = f"{item.current:.2f}/{item.maximum:.2f}"
+            row = f"{Colors.BOLD}{i:<4} {Colors.SUCCESS}{item.type:<15} "
+            row += f"{percent_color}{item.percentage:>8.2f}%{Colors.RESET}  "
+            row += f"{Colors.INFO}{current_max:<25}{Colors.RESET} {item.until:<25} "
+            if show_time:
+                row += f"{datetime.fromisoformat(item.timestamp).strftime('%Y-%m-%d %H:%M:%S'):<20} "
+            row += f"{Colors.DIM}{item.file_path}{Colors.RESET}"
+
+            # 交替行颜色
+            if i % 2 == 0:
+                row = f"{Colors.TABLE_ROW_EVEN}{row}{Colors.RESET}"
+            else:
+                row = f"{Colors.TABLE_ROW_ODD}{row}{Colors.RESET}"
+
+            print(row)
+
+        print(f"{Colors.DIM}{'-' * 100}{Colors.RESET}")
+
+    def display_history(self, file_path=None, limit=10, page_size=None, before=None, after=None, product=None):
+        """
+        显示历史记录
+
+        Args:
+            file_path: 文件路径或目录，为空时显示所有记录
+            limit: 最多显示的记录数，为 None 时显示所有匹配的记录
+            page_size: 每页显示的记录数；在终端中每页之后等待用户确认
+            before: 只显示早于该毫秒时间戳的记录
+            after: 只显示晚于该毫秒时间戳的记录；早于原始记录保留期时，之后再显示该范围内的汇总统计
+            product: 只显示该 IDE 产品（如 PyCharm 或 PyCharm2024.1）的记录
+        """
+        # 超过保留期的原始记录已汇总后删除，这部分时间范围从汇总表读取
+        retention_days = self.config_manager.get_history_retention_days()
+        rollup_before = None
+        if after is not None and retention_days > 0:
+            cutoff = int((time.time() - retention_days * 86400) * 1000)
+            if after < cutoff:
+                rollup_before = cutoff if before is None else min(before, cutoff)
+
+        records = self.db_manager.iter_history(file_path=file_path, page_size=page_size or limit or HISTORY_PAGE_SIZE,
+                                               before=before, after=after, product=product)
+        if limit:
+            records = itertools.islice(records, limit)
+
+        first = next(records, None)
+        if first is None:
+            if rollup_before is None:
+                print(f"{Colors.INFO}{t('no_history')}{Colors.RESET}")
+            else:
+                self._display_rollup_range(file_path, limit, product, rollup_before, after, retention_days)
             return
+        history = itertools.chain([first], records)
+        # 循环中使用的翻译模板只查找一次
+        seen_count_text = t('history_seen_count').format
 
         # 打印表头
         header = f"{Colors.TABLE_HEADER}{t('column_num'):<4} {t('column_time'):<25} {t('column_type'):<15} {t('column_usage'):<15} {t('column_current_max'):<20}"
@@ -1090,6 +3045,8 @@ class QuotaAnalyzer:
             row = f"{Colors.BOLD}{i:<4} {Colors.SUCCESS}{timestamp:<25} {item.type:<15} "
             row += f"{percent_color}{item.percentage:>6.2f}%{Colors.RESET} "
             row += f"{Colors.INFO}({item.current:>6.2f}/{item.maximum:<6.2f}){Colors.RESET}"
+            if item.seen_count > 1:
+                row += f" {Colors.DIM}{seen_count_text(count=item.seen_count)}{Colors.RESET}"
 
             # 如果不过滤路径，添加文件路径
             if file_path is None:
@@ -1103,10 +3060,65 @@ class QuotaAnalyzer:
                 row = f"{Colors.TABLE_ROW_ODD}{row}{Colors.RESET}"
 
             print(row)
+            shown = i
+
+            # 分页显示时，每页之后等待用户确认
+            if page_size and i % page_size == 0 and sys.stdin.isatty():
+                answer = input(f"{Colors.MENU_PROMPT}{t('history_next_page')}{Colors.RESET}")
+                if answer.strip().lower() == 'q':
+                    break
 
         # 打印页脚
         print(f"{Colors.DIM}{'-' * 100}{Colors.RESET}")
-        print(f"{Colors.INFO}{t('total_records').format(count=len(history))}{Colors.RESET}\n")
+        print(f"{Colors.INFO}{t('total_records').format(count=shown)}{Colors.RESET}\n")
+
+        if rollup_before is not None:
+            self._display_rollup_range(file_path, limit, product, rollup_before, after, retention_days)
+
+    def _display_rollup_range(self, file_path, limit, product, before, after, retention_days):
+        """显示超出保留期的时间范围内的汇总统计，范围较短时按小时，否则按天"""
+        granularity = "hourly" if before - after <= ROLLUP_HOURLY_MAX_DAYS * 86400000 else "daily"
+        print(f"{Colors.INFO}{t('history_rollup_range').format(days=retention_days)}{Colors.RESET}")
+        self.display_rollups(granularity=granularity, file_path=file_path, limit=limit, product=product,
+                             before=before, after=after)
+
+    def display_status(self, file_path=None, product=None):
+        """显示每个配额文件最近一次记录的配额状态（只读取 latest_snapshot 表）"""
+        snapshots = self.db_manager.load_latest_snapshots(file_path=file_path, product=product)
+        if not snapshots:
+            print(f"{Colors.INFO}{t('no_history')}{Colors.RESET}")
+            return
+
+        self.display_summary(snapshots, title=t('status_title'), show_time=True)
+        print(f"{Colors.INFO}{t('status_count').format(count=len(snapshots))}{Colors.RESET}")
+
+    def display_rollups(self, granularity="daily", file_path=None, limit=10, product=None, before=None, after=None):
+        """显示按小时或按天汇总的历史统计"""
+        rollups = self.db_manager.load_rollups(granularity=granularity, limit=limit, file_path=file_path,
+                                               product=product, before=before, after=after)
+
+        if not rollups:
+            print(f"{Colors.INFO}{t('no_rollups')}{Colors.RESET}")
+            return
+
+        header = f"{Colors.TABLE_HEADER}{t('column_num'):<4} {t('column_period'):<20} {t('column_usage_range'):<22} {t('column_usage_last'):<10} {t('column_samples'):<8}"
+        if file_path is None:
+            header += f" {t('column_filepath')}"
+        print(f"\n{header}{Colors.RESET}")
+        print(f"{Colors.DIM}{'-' * 100}{Colors.RESET}")
+
+        time_format = '%Y-%m-%d' if granularity == "daily" else '%Y-%m-%d %H:00'
+        for i, item in enumerate(rollups, 1):
+            period = datetime.fromisoformat(item["bucket"]).strftime(time_format)
+            usage_range = f"{item['percentage_min']:6.2f}% - {item['percentage_max']:6.2f}%"
+            row = f"{Colors.BOLD}{i:<4} {Colors.SUCCESS}{period:<20} {usage_range:<22} "
+            row += f"{item['percentage_last']:>6.2f}%   {Colors.INFO}{item['samples']:<8}{Colors.RESET}"
+            if file_path is None:
+                row += f" {Colors.DIM}{item['file_path']}{Colors.RESET}"
+            print(row)
+
+        print(f"{Colors.DIM}{'-' * 100}{Colors.RESET}")
+        print(f"{Colors.INFO}{t('total_records').format(count=len(rollups))}{Colors.RESET}\n")
 
     def get_paths(self):
         """获取历史记录中的唯一路径"""
@@ -1115,7 +3127,8 @@ class QuotaAnalyzer:
     def find_and_analyze_quota_files(self, non_interactive=False):
         """查找并分析配额文件"""
         # 查找配额文件
-        quota_files = find_quota_files()
+        quota_files = find_quota_files(self.config_manager.get_discovery_roots(),
+                                       db_manager=self.db_manager, rescan=self.rescan)
 
         if not quota_files:
             print(f"{Colors.INFO}{t('no_quota_file')}{Colors.RESET}")
@@ -1127,16 +3140,15 @@ class QuotaAnalyzer:
         print()
 
         if non_interactive:
-            # 非交互模式，分析所有文件
+            # 非交互模式，批量分析所有文件并显示汇总表
             print(f"{Colors.INFO}{t('auto_analyzing_all_files')}{Colors.RESET}")
-            success_count = 0
-            for file_path in quota_files:
-                print(f"{Colors.INFO}{t('analyzing_file').format(path=file_path)}{Colors.RESET}")
-                quota_info = self.analyze_file(file_path)
-                if quota_info:
-                    self.display_quota_info(quota_info)
-                    success_count += 1
-            print(f"\n{Colors.INFO}{t('analysis_success_count').format(count=success_count)}{Colors.RESET}")
+            quota_infos, elapsed = self.analyze_files_batch(quota_files)
+            if quota_infos:
+                self.display_summary(quota_infos)
+            print(f"\n{Colors.INFO}{t('analysis_success_count').format(count=len(quota_infos))}{Colors.RESET}")
+            self._print_cache_stats()
+            rate = len(quota_files) / elapsed if elapsed > 0 else 0.0
+            print(f"{Colors.INFO}{t('batch_throughput').format(count=len(quota_files), seconds=elapsed, rate=rate)}{Colors.RESET}")
         else:
             # 交互模式，让用户选择
             while True:
@@ -1155,6 +3167,7 @@ class QuotaAnalyzer:
                             self.display_quota_info(quota_info)
                             success_count += 1
                     print(f"\n{Colors.INFO}{t('analysis_success_count').format(count=success_count)}{Colors.RESET}")
+                    self._print_cache_stats()
                     break
 
                 if choice.isdigit():
@@ -1170,6 +3183,22 @@ class QuotaAnalyzer:
                 else:
                     print(f"{Colors.INFO}{t('invalid_input_simple')}{Colors.RESET}")
 
+    def watch_quota_files(self, debounce=WATCH_DEBOUNCE_SECONDS, poll_interval=WATCH_POLL_INTERVAL):
+        """持续监视自动找到的配额文件，文件变化时记录历史"""
+        quota_files = find_quota_files(self.config_manager.get_discovery_roots(),
+                                       db_manager=self.db_manager, rescan=self.rescan)
+
+        if not quota_files:
+            print(f"{Colors.INFO}{t('no_quota_file')}{Colors.RESET}")
+            return
+
+        # 监视模式下历史记录由后台写入器攒批提交，文件频繁变化时不会因磁盘同步而卡住
+        self.db_manager.start_history_writer()
+        try:
+            QuotaFileWatcher(self, quota_files, debounce=debounce, poll_interval=poll_interval).run()
+        finally:
+            self.db_manager.stop_history_writer()
+
     def close(self):
         """关闭资源"""
         pass  # 所有资源由db_manager关闭
@@ -1213,6 +3242,11 @@ class CommandLineInterface:
             # 重新抛出异常，让上层处理
             raise e
 
+    def _remember_path(self, file_path):
+        """记录用户使用的路径：加入最近使用列表，并累加数据库中的使用次数"""
+        self.config_manager.add_recent_path(file_path)
+        self.db_manager.record_path_use(file_path)
+
     def show_menu(self):
         """显示主菜单"""
         print("\n" + Colors.HEADER + "=" * 60 + Colors.RESET)
@@ -1243,7 +3277,7 @@ class CommandLineInterface:
             prompt = f"\n{t('enter_file_path_or_select')}: "
 
         # 获取推荐的历史路径
-        recommended_paths = self.config_manager.get_recommended_paths(max_count=3)
+        recommended_paths = self.db_manager.get_recommended_paths(max_count=3)
 
         # 显示推荐的历史路径
         if recommended_paths:
@@ -1298,12 +3332,12 @@ class CommandLineInterface:
         if quota_info:
             self.quota_analyzer.display_quota_info(quota_info)
             # 添加到最近使用的路径
-            self.config_manager.add_recent_path(file_path)
+            self._remember_path(file_path)
 
     def _view_history(self):
         """查看历史记录"""
         # 获取推荐的历史路径
-        recommended_paths = self.config_manager.get_recommended_paths(max_count=3)
+        recommended_paths = self.db_manager.get_recommended_paths(max_count=3)
 
         # 显示推荐的历史路径
         if recommended_paths:
@@ -1325,7 +3359,7 @@ class CommandLineInterface:
                     limit = int(limit_str)
                 self.quota_analyzer.display_history(file_path=file_path, limit=limit)
                 # 添加到最近使用的路径
-                self.config_manager.add_recent_path(file_path)
+                self._remember_path(file_path)
                 return
 
         # 显示所有历史记录
@@ -1393,7 +3427,7 @@ class CommandLineInterface:
             return
 
         # 获取推荐的历史路径
-        recommended_paths = self.config_manager.get_recommended_paths(max_count=3)
+        recommended_paths = self.db_manager.get_recommended_paths(max_count=3)
 
         # 显示推荐的历史路径
         if recommended_paths:
@@ -1454,7 +3488,7 @@ class CommandLineInterface:
                         self.quota_analyzer.display_history(file_path=file_path, limit=limit)
 
                         # 添加到最近使用的路径
-                        self.config_manager.add_recent_path(file_path)
+                        self._remember_path(file_path)
 
                         break
                     else:
@@ -1473,7 +3507,7 @@ class CommandLineInterface:
                     self.quota_analyzer.display_history(file_path=file_path, limit=limit)
 
                     # 添加到最近使用的路径
-                    self.config_manager.add_recent_path(file_path)
+                    self._remember_path(file_path)
 
                     break
                 else:
@@ -1540,12 +3574,103 @@ class CommandLineInterface:
         print(f"{t('supported_languages_info').format(languages=', '.join(SUPPORTED_LANGUAGES))}")
         print("  python JetBrainsAIQuotaAnalyzer_CLI.py --lang en")
 
-        print(f"\n{Colors.INFO}{t('other_help')}{Colors.RESET}")
-        print("  python JetBrainsAIQuotaAnalyzer_CLI.py --help")
+        print(f"\n{Colors.INFO}{t('other_help')}{Colors.RESET}")
+        print("  python JetBrainsAIQuotaAnalyzer_CLI.py --help")
+
+        # 等待用户按回车键继续
+        if sys.stdin.isatty():
+            input(f"\n{Colors.MENU_PROMPT}{t('press_enter')}{Colors.RESET}")
+
+    def _resolve_log_file(self, path):
+        """
+        确定要分析的 idea.log 路径
+
+        Args:
+            path: 日志文件或IDE基础路径；为空时使用上次缓存的日志路径
+
+        Returns:
+            日志文件路径，无法确定或文件不存在时返回 None
+        """
+        if path:
+            log_file = QuotaLogAnalyzer.resolve_log_file(path)
+            self.config_manager.set_log_file(log_file)
+            print(f"{Colors.INFO}{t('log_path_cached').format(path=log_file)}{Colors.RESET}")
+        else:
+            log_file = self.config_manager.get_log_file()
+            if not log_file:
+                print(f"{Colors.ERROR}{t('log_path_missing')}{Colors.RESET}")
+                return None
+
+        if not os.path.isfile(log_file):
+            print(f"{Colors.ERROR}{t('log_file_not_found').format(path=log_file)}{Colors.RESET}")
+            return None
+
+        return log_file
+
+    def show_quota_logs(self, path, count):
+        """
+        分析 idea.log 中的配额日志
+
+        Args:
+            path: 日志文件或IDE基础路径；为空时使用上次缓存的日志路径
+            count: 显示的最近事件数量
+        """
+        log_file = self._resolve_log_file(path)
+        if not log_file:
+            return
+
+        try:
+            QuotaLogAnalyzer(log_file).display(count)
+        except OSError as e:
+            print(f"{Colors.ERROR}{t('log_read_error').format(error=e)}{Colors.RESET}")
+
+    def scan_quota_logs(self, paths):
+        """
+        使用多进程扫描日志文件，按时间顺序输出所有配额事件
+
+        Args:
+            paths: 日志文件路径列表
+        """
+        log_files = []
+        for path in paths:
+            log_file = QuotaLogAnalyzer.resolve_log_file(path)
+            if os.path.isfile(log_file):
+                log_files.append(log_file)
+            else:
+                print(f"{Colors.ERROR}{t('log_file_not_found').format(path=log_file)}{Colors.RESET}")
+
+        if not log_files:
+            return
+
+        start = time.perf_counter()
+        try:
+            timeline = QuotaLogScanner().scan(log_files)
+        except (OSError, ValueError) as e:
+            print(f"{Colors.ERROR}{t('log_read_error').format(error=e)}{Colors.RESET}")
+            return
+        elapsed = time.perf_counter() - start
+
+        for log_file, event in timeline:
+            print(f"[{event.timestamp}] {Colors.DIM}{log_file}{Colors.RESET} {event.message}")
+
+        total_size = sum(os.path.getsize(log_file) for log_file in log_files)
+        print(f"\n{Colors.INFO}{t('log_scan_result').format(files=len(log_files), size=total_size, count=len(timeline), seconds=elapsed)}{Colors.RESET}")
+
+    def ingest_quota_logs(self, path):
+        """
+        将 idea.log 中新增的配额事件导入数据库
+
+        Args:
+            path: 日志文件或IDE基础路径；为空时使用上次缓存的日志路径
+        """
+        log_file = self._resolve_log_file(path)
+        if not log_file:
+            return
 
-        # 等待用户按回车键继续
-        if sys.stdin.isatty():
-            input(f"\n{Colors.MENU_PROMPT}{t('press_enter')}{Colors.RESET}")
+        try:
+            QuotaLogImporter(self.db_manager).ingest(log_file)
+        except OSError as e:
+            print(f"{Colors.ERROR}{t('log_ingest_error').format(error=e)}{Colors.RESET}")
 
     def run_interactive(self):
         """运行交互式界面"""
@@ -1573,25 +3698,27 @@ class CommandLineInterface:
                 self.show_menu()
                 choice = self._safe_input(f"{t('select_operation')} ")
 
-                if choice == "0":
-                    self.running = False
-                    print(f"{Colors.INFO}{t('thank_you')}{Colors.RESET}")
-                elif choice == "1":
-                    self._analyze_file()
-                elif choice == "2":
-                    self.quota_analyzer.find_and_analyze_quota_files(non_interactive=not self.is_interactive)
-                elif choice == "3":
-                    self._view_history()
-                elif choice == "4":
-                    self._clear_history()
-                elif choice == "5":
-                    self._filter_history()
-                elif choice == "6":
-                    self.show_common_paths()
-                elif choice == "7":
-                    self.show_help()
-                else:
-                    print(f"{Colors.INFO}{t('invalid_option_retry_dot')}{Colors.RESET}")
+                # 每个菜单操作中的配置修改合并为操作结束时的一次写入
+                with self.config_manager.batch_updates():
+                    if choice == "0":
+                        self.running = False
+                        print(f"{Colors.INFO}{t('thank_you')}{Colors.RESET}")
+                    elif choice == "1":
+                        self._analyze_file()
+                    elif choice == "2":
+                        self.quota_analyzer.find_and_analyze_quota_files(non_interactive=not self.is_interactive)
+                    elif choice == "3":
+                        self._view_history()
+                    elif choice == "4":
+                        self._clear_history()
+                    elif choice == "5":
+                        self._filter_history()
+                    elif choice == "6":
+                        self.show_common_paths()
+                    elif choice == "7":
+                        self.show_help()
+                    else:
+                        print(f"{Colors.INFO}{t('invalid_option_retry_dot')}{Colors.RESET}")
             except (EOFError, KeyboardInterrupt):
                 print(f"\n{Colors.INFO}{t('operation_cancelled')}{Colors.RESET}")
                 self.running = False
@@ -1628,77 +3755,847 @@ class CommandLineInterface:
         self.quota_analyzer.close()
 
 
-def find_quota_files():
-    """
-    自动查找系统中的JetBrains AI Assistant配额文件
-    返回找到的文件路径列表
-    """
-    quota_files = []
-
-    # 根据操作系统确定JetBrains配置目录
+def _default_config_roots():
+    """返回当前操作系统下 JetBrains 配置目录的默认位置"""
     if platform.system() == "Windows":
         # Windows: %APPDATA%\JetBrains\<产品>\options\AIAssistantQuotaManager2.xml
-        base_dir = os.path.join(os.environ.get("APPDATA", ""), "JetBrains")
+        return [os.path.join(os.environ.get("APPDATA", ""), "JetBrains")]
     elif platform.system() == "Darwin":  # macOS
         # macOS: ~/Library/Application Support/JetBrains/<产品>/options/AIAssistantQuotaManager2.xml
-        base_dir = os.path.join(os.path.expanduser("~"), "Library", "Application Support", "JetBrains")
+        return [os.path.join(os.path.expanduser("~"), "Library", "Application Support", "JetBrains")]
     else:  # Linux and others
         # Linux: ~/.config/JetBrains/<产品>/options/AIAssistantQuotaManager2.xml
-        base_dir = os.path.join(os.path.expanduser("~"), ".config", "JetBrains")
+        return [os.path.join(os.path.expanduser("~"), ".config", "JetBrains")]
+
+
+def _toolbox_roots():
+    """返回当前操作系统下 JetBrains Toolbox 的 IDE 安装目录"""
+    if platform.system() == "Windows":
+        return [os.path.join(os.environ.get("LOCALAPPDATA", ""), "JetBrains", "Toolbox", "apps")]
+    elif platform.system() == "Darwin":  # macOS
+        return [os.path.join(os.path.expanduser("~"), "Library", "Application Support", "JetBrains", "Toolbox", "apps")]
+    else:  # Linux and others
+        return [os.path.join(os.path.expanduser("~"), ".local", "share", "JetBrains", "Toolbox", "apps")]
 
-    # 如果基础目录不存在，返回空列表
-    if not os.path.exists(base_dir):
-        print(f"{Colors.INFO}{t('jetbrains_dir_not_found').format(path=base_dir)}{Colors.RESET}")
-        return quota_files
 
-    # 遍历基础目录下的所有子目录
+def _read_idea_config_path(properties_file):
+    """从 idea.properties 中读取自定义的 idea.config.path，未设置时返回 None"""
     try:
-        for product_dir in os.listdir(base_dir):
-            product_path = os.path.join(base_dir, product_dir)
+        with open(properties_file, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line.startswith("idea.config.path"):
+                    continue
+                key, sep, value = line.partition("=")
+                if sep and key.strip() == "idea.config.path":
+                    value = value.strip().replace("${user.home}", os.path.expanduser("~"))
+                    return os.path.expanduser(value) if value else None
+    except OSError:
+        pass
+    return None
+
+
+class QuotaFileDiscovery:
+    """
+    配额文件发现引擎
+
+    同时扫描多个根目录：JetBrains 默认配置目录、配置文件中额外指定的根目录，
+    以及 Toolbox 安装目录中 idea.properties 指定的 idea.config.path。
+    各根目录在线程池中并发扫描，目录遍历使用 os.scandir 以复用 DirEntry 缓存的类型信息。
+
+    扫描结果按路径的修改时间缓存在发现索引中，下次运行时只有修改时间变化的目录才会重新扫描；
+    配置根目录没有变化时，其下已经找到的配额文件直接沿用，不再访问各 IDE 配置目录。
+    """
+
+    def __init__(self, extra_roots=None, max_workers=DISCOVERY_MAX_WORKERS, index=None):
+        """
+        初始化发现引擎
+
+        Args:
+            extra_roots: 额外的根目录列表，可以是 JetBrains 配置目录，也可以是单个 IDE 的配置目录
+            max_workers: 线程池大小
+            index: 上次运行保存的发现索引 {路径: (mtime_ns, 扫描结果列表)}
+        """
+        self.config_roots = _default_config_roots() + [os.path.expanduser(root) for root in (extra_roots or [])]
+        self.toolbox_roots = _toolbox_roots()
+        self.max_workers = max_workers
+        self.index = index or {}
+        # 本次运行访问过的路径及其扫描结果，用于替换旧索引
+        self.new_index = {}
+        # 本次运行中修改时间与索引一致的路径（已规范化）
+        self.unchanged = set()
+
+    def _cached(self, path, loader):
+        """
+        按修改时间缓存路径的扫描结果
+
+        路径的 mtime 与索引中一致时直接返回索引中的结果，否则调用 loader 重新扫描。
+        路径不存在时抛出 OSError。
+        """
+        mtime_ns = os.stat(path).st_mtime_ns
+        cached = self.index.get(path)
+        if cached and cached[0] == mtime_ns:
+            entries = cached[1]
+            self.unchanged.add(os.path.normpath(path))
+        else:
+            entries = loader(path)
+
+        if time.time_ns() - mtime_ns > DISCOVERY_INDEX_RACY_SECONDS * 1_000_000_000:
+            self.new_index[path] = (mtime_ns, entries)
+        return entries
+
+    @staticmethod
+    def _scan_subdir_names(directory):
+        """列出目录下的子目录名"""
+        with os.scandir(directory) as entries:
+            return [entry.name for entry in entries if entry.is_dir()]
+
+    def discover(self):
+        """查找所有配额文件，返回排序后的路径列表"""
+        with concurrent_futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # 第一步：并发列出所有可能的 IDE 配置目录
+            tasks = [executor.submit(self._list_config_dirs, root) for root in self.config_roots]
+            tasks += [executor.submit(self._list_toolbox_config_dirs, root) for root in self.toolbox_roots]
+
+            candidates = []
+            seen = set()
+            for task in tasks:
+                for directory in task.result():
+                    directory = os.path.normpath(directory)
+                    if directory not in seen:
+                        seen.add(directory)
+                        candidates.append(directory)
+
+            # 第二步：并发检查每个配置目录下是否存在配额文件
+            return sorted(path for path in executor.map(self._quota_file_in, candidates) if path)
+
+    def _list_config_dirs(self, root):
+        """列出根目录下的 IDE 配置目录（根目录本身也可能就是一个 IDE 配置目录）"""
+        try:
+            directories = [os.path.join(root, name) for name in self._cached(root, self._scan_subdir_names)]
+        except FileNotFoundError:
+            print(f"{Colors.INFO}{t('jetbrains_dir_not_found').format(path=root)}{Colors.RESET}")
+            return []
+        except OSError as e:
+            print(f"{Colors.INFO}{t('find_quota_files_error').format(error=e)}{Colors.RESET}")
+            return []
+
+        return [root] + directories
 
-            # 检查是否是目录
-            if not os.path.isdir(product_path):
+    def _list_toolbox_config_dirs(self, root):
+        """列出 Toolbox 安装的 IDE 通过 idea.config.path 指定的配置目录"""
+        config_dirs = []
+        for properties_file in self._find_idea_properties(root, TOOLBOX_SCAN_DEPTH):
+            try:
+                config_dirs.extend(self._cached(properties_file, self._load_idea_config_path))
+            except OSError:
                 continue
+        return config_dirs
 
-            # 构建可能的配额文件路径
-            quota_file = os.path.join(product_path, "options", "AIAssistantQuotaManager2.xml")
+    @staticmethod
+    def _load_idea_config_path(properties_file):
+        """以列表形式返回 idea.properties 中的 idea.config.path，便于写入索引"""
+        config_path = _read_idea_config_path(properties_file)
+        return [config_path] if config_path else []
 
-            # 检查文件是否存在
-            if os.path.exists(quota_file):
-                quota_files.append(quota_file)
+    def _find_idea_properties(self, directory, depth):
+        """在目录中查找 bin/idea.properties，找到 bin 目录后不再深入其同级目录"""
+        try:
+            subdirs = self._cached(directory, self._scan_subdir_names)
+        except OSError:
+            return []
+
+        if "bin" in subdirs:
+            properties_file = os.path.join(directory, "bin", "idea.properties")
+            return [properties_file] if os.path.isfile(properties_file) else []
+
+        found = []
+        if depth > 0:
+            for name in subdirs:
+                found.extend(self._find_idea_properties(os.path.join(directory, name), depth - 1))
+        return found
+
+    def _quota_file_in(self, directory):
+        """
+        返回配置目录中的配额文件路径，不存在时返回 None
+
+        查找结果按 options 目录的修改时间缓存。上级目录的修改时间没有变化时，上次找到的配额文件
+        直接沿用，不再访问文件系统（文件之后被删除时由分析步骤发现，--rescan 重新完整扫描）；
+        上次没有找到时仍检查 options 目录，IDE 第一次写入配额文件后就能发现
+        """
+        options_dir = os.path.join(directory, "options")
+        cached = self.index.get(options_dir)
+        if cached and cached[1] and os.path.dirname(directory) in self.unchanged:
+            self.new_index[options_dir] = cached
+            return cached[1][0]
+
+        try:
+            entries = self._cached(options_dir, self._list_quota_file)
+        except OSError:
+            return None
+        return entries[0] if entries else None
+
+    @staticmethod
+    def _list_quota_file(options_dir):
+        """以列表形式返回 options 目录中的配额文件，便于写入索引"""
+        quota_file = os.path.join(options_dir, QUOTA_FILE_NAME)
+        return [quota_file] if os.path.isfile(quota_file) else []
+
+
+def find_quota_files(extra_roots=None, db_manager=None, rescan=False):
+    """
+    自动查找系统中的JetBrains AI Assistant配额文件
+    返回找到的文件路径列表
+
+    Args:
+        extra_roots: 额外的查找根目录（来自配置文件的 discovery_roots）
+        db_manager: 数据库管理器，提供时从数据库读取并更新发现索引
+        rescan: 是否忽略已保存的发现索引，重新完整扫描
+    """
+    try:
+        index = db_manager.load_discovery_index() if db_manager and not rescan else {}
+        discovery = QuotaFileDiscovery(extra_roots, index=index)
+        quota_files = discovery.discover()
+
+        if db_manager and discovery.new_index != index:
+            db_manager.save_discovery_index(discovery.new_index)
+
+        return quota_files
     except Exception as e:
         print(f"{Colors.INFO}{t('find_quota_files_error').format(error=e)}{Colors.RESET}")
+        return []
+
+
+class _InotifyBackend:
+    """基于 Linux inotify 的文件变化通知，监视配额文件所在的目录以兼容先写临时文件再重命名的写入方式"""
+
+    name = "inotify"
+
+    # inotify 事件掩码，见 <sys/inotify.h>
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, file_paths):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+
+        # 监视描述符 -> (目录, 该目录下被监视的文件名集合)
+        self.watches = {}
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        try:
+            for directory in sorted({os.path.dirname(path) for path in file_paths}):
+                wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+                if wd < 0:
+                    raise OSError(ctypes.get_errno(), f"{os.strerror(ctypes.get_errno())}: {directory}")
+                names = {os.path.basename(path) for path in file_paths if os.path.dirname(path) == directory}
+                self.watches[wd] = (directory, names)
+        except OSError:
+            self.close()
+            raise
+
+    def wait(self, timeout):
+        """等待文件变化，返回发生变化的文件路径集合；超时返回空集合"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        data = os.read(self.fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            wd, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", errors="replace")
+            offset += length
+
+            directory, names = self.watches.get(wd, (None, ()))
+            if name in names:
+                changed.add(os.path.join(directory, name))
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class _PollingBackend:
+    """通过定期 stat 检测文件变化，用于不支持 inotify 的系统"""
+
+    name = "polling"
+
+    def __init__(self, file_paths, poll_interval=WATCH_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.states = {path: self._state(path) for path in file_paths}
+
+    @staticmethod
+    def _state(path):
+        try:
+            stat_result = os.stat(path)
+            return stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size
+        except OSError:
+            return None
+
+    def wait(self, timeout):
+        """等待文件变化，返回发生变化的文件路径集合；超时返回空集合"""
+        time.sleep(self.poll_interval if timeout is None else min(timeout, self.poll_interval))
+
+        changed = set()
+        for path, old_state in self.states.items():
+            state = self._state(path)
+            if state != old_state:
+                self.states[path] = state
+                changed.add(path)
+        return changed
+
+    def close(self):
+        pass
+
+
+class QuotaFileWatcher:
+    """
+    配额文件监视器
+
+    在 Linux 上使用 inotify 等待配额文件变化，其他系统使用 stat 轮询。
+    IDE 写入文件时往往会连续触发多次事件，变化会在防抖时间内合并后再记录一次历史。
+    """
+
+    def __init__(self, quota_analyzer, file_paths, debounce=WATCH_DEBOUNCE_SECONDS,
+                 poll_interval=WATCH_POLL_INTERVAL):
+        """
+        初始化监视器
+
+        Args:
+            quota_analyzer: 配额分析器，用于解析配额文件并保存历史记录
+            file_paths: 需要监视的配额文件路径列表
+            debounce: 防抖时间（秒）
+            poll_interval: 轮询间隔（秒），仅在 inotify 不可用时使用
+        """
+        self.quota_analyzer = quota_analyzer
+        self.file_paths = [os.path.abspath(path) for path in file_paths]
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+
+    def _create_backend(self):
+        """优先使用 inotify，不可用时退回到轮询"""
+        if platform.system() == "Linux":
+            try:
+                return _InotifyBackend(self.file_paths)
+            except (OSError, AttributeError) as e:
+                print(f"{Colors.WARNING}{t('watch_inotify_unavailable').format(error=e)}{Colors.RESET}")
+        return _PollingBackend(self.file_paths, self.poll_interval)
+
+    def _record(self, file_path):
+        """解析变化后的配额文件并记录历史"""
+        quota_info = self.quota_analyzer.analyze_file(file_path)
+        # 长时间监视时逐步压缩过期的原始记录，每次只执行一个短事务
+        self.quota_analyzer.db_manager.compact_history(max_batches=1)
+        if quota_info:
+            print(f"{Colors.SUCCESS}{t('watch_recorded').format(time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'), path=file_path, current=quota_info.current, maximum=quota_info.maximum, percentage=quota_info.percentage)}{Colors.RESET}")
+
+    def run(self):
+        """持续监视配额文件，直到用户按下 Ctrl+C"""
+        backend = self._create_backend()
+        print(f"{Colors.INFO}{t('watch_started').format(count=len(self.file_paths), backend=backend.name, debounce=self.debounce)}{Colors.RESET}")
+
+        # 文件路径 -> 防抖结束的时间点
+        pending = {}
+        try:
+            while True:
+                timeout = None
+                if pending:
+                    timeout = max(0.0, min(pending.values()) - time.monotonic())
+
+                for path in backend.wait(timeout):
+                    pending[path] = time.monotonic() + self.debounce
+
+                now = time.monotonic()
+                for path in [path for path, deadline in pending.items() if deadline <= now]:
+                    del pending[path]
+                    self._record(path)
+        except KeyboardInterrupt:
+            print(f"\n{Colors.INFO}{t('watch_stopped')}{Colors.RESET}")
+        finally:
+            backend.close()
+
+
+class QuotaLogEvent:
+    """idea.log 中的一条配额事件"""
+
+    CURRENT_PATTERN = re.compile(r"current=([0-9.]*)")
+    MAXIMUM_PATTERN = re.compile(r"maximum=([^,)]*)")
+    UNTIL_PATTERN = re.compile(r"until=([^Z,)]*)")
+
+    def __init__(self, timestamp, message):
+        self.timestamp = timestamp
+        self.message = message
+        # 以下字段只在 "New quota state is: Available" 事件中存在，保留日志中的原始文本
+        self.current = ""
+        self.maximum = ""
+        self.until = ""
+
+        if self.is_available:
+            match = self.CURRENT_PATTERN.search(message)
+            self.current = match.group(1) if match else ""
+            match = self.MAXIMUM_PATTERN.search(message)
+            self.maximum = match.group(1).strip() if match else ""
+            match = self.UNTIL_PATTERN.search(message)
+            self.until = match.group(1).strip() + "Z" if match else ""
+
+    @property
+    def is_available(self):
+        """是否是包含配额数值的 Available 状态事件"""
+        return QUOTA_LOG_AVAILABLE in self.message
+
+    @classmethod
+    def from_line(cls, line):
+        """
+        从日志行解析配额事件
+
+        Args:
+            line: 原始日志行（bytes），先按字节匹配标记，不相关的行不会被解码
+
+        Returns:
+            QuotaLogEvent 对象，不是配额事件时返回 None
+        """
+        if QUOTA_LOG_MARKER not in line:
+            return None
+
+        text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+        if not any(keyword in text for keyword in QUOTA_LOG_KEYWORDS):
+            return None
 
-    return quota_files
+        # 日志格式: "2025-05-01 10:00:00,123 [  12345]   INFO - #c.i.m.QuotaManager2 - 消息"
+        timestamp = " ".join(text.split(" ", 2)[:2])
+        marker = QUOTA_LOG_MARKER.decode() + " - "
+        message = text.rpartition(marker)[2] if marker in text else text
+        return cls(timestamp, message)
 
 
-def get_app_lock():
-    """获取应用程序锁，确保只有一个实例在运行"""
+def _to_number(text):
+    """将日志中的数值文本转换为浮点数，无法转换时返回 None"""
     try:
-        # 创建套接字
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        sock.bind(('localhost', LOCK_PORT))
-        # 保存套接字引用，防止被垃圾回收
-        global app_lock_socket
-        app_lock_socket = sock
-        print(f"{Colors.INFO}{t('app_lock_success').format(port=LOCK_PORT)}{Colors.RESET}")
-
-        # 检查并清理残留进程
-        check_and_clean_processes()
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _iter_lines_reversed(file_obj, block_size=LOG_READ_BLOCK_SIZE):
+    """从文件末尾开始按块倒序读取，逐行返回（bytes，不含换行符）"""
+    file_obj.seek(0, os.SEEK_END)
+    position = file_obj.tell()
+    remainder = b""
+
+    while position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        file_obj.seek(position)
+        lines = (file_obj.read(read_size) + remainder).split(b"\n")
+        # 块的第一行可能不完整，留到读取前一个块时拼接
+        remainder = lines[0]
+        for line in reversed(lines[1:]):
+            yield line
+
+    if remainder:
+        yield remainder
+
+
+class QuotaLogAnalyzer:
+    """
+    idea.log 配额日志分析器
+
+    替代 scripts/check_quota_logs.sh：只需要最后 N 条事件时从文件末尾倒序读取，
+    按字节匹配 QuotaManager2 标记，不相关的行不会被解码。
+    """
+
+    def __init__(self, log_file):
+        self.log_file = log_file
+
+    @staticmethod
+    def resolve_log_file(path):
+        """
+        根据日志文件或IDE基础路径确定 idea.log 的位置
+
+        Args:
+            path: idea.log 文件路径，或 IDE 基础路径/日志目录
+        """
+        path = os.path.expanduser(path)
+        if not os.path.isdir(path):
+            return path
+
+        candidates = [
+            os.path.join(path, "idea.log"),
+            os.path.join(path, "system", "log", "idea.log"),
+            os.path.join(path, "log", "idea.log"),
+        ]
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                return candidate
+
+        # 都不存在时按操作系统返回默认位置，便于提示
+        if platform.system() == "Darwin":
+            return candidates[0]
+        return candidates[1]
+
+    def scan(self, count):
+        """
+        倒序扫描日志，找到最后 count 条配额事件和最新的 Available 事件后立即停止
+
+        Returns:
+            (按时间顺序排列的最近事件列表, 最新的 Available 事件或 None)
+        """
+        if _is_compressed_log(self.log_file):
+            return self._scan_archive(count)
+
+        recent = []
+        latest = None
+
+        with open(self.log_file, "rb") as f:
+            for line in _iter_lines_reversed(f):
+                event = QuotaLogEvent.from_line(line)
+                if event is None:
+                    continue
+
+                if len(recent) < count:
+                    recent.append(event)
+                if latest is None and event.is_available:
+                    latest = event
+                if len(recent) >= count and latest is not None:
+                    break
+
+        recent.reverse()
+        return recent, latest
+
+    def _scan_archive(self, count):
+        """日志包无法倒序读取，流式解压扫描全部事件后取最后 count 条"""
+        events = [event for _, event in QuotaLogScanner(max_workers=1).scan([self.log_file])]
+        recent = events[-count:] if count > 0 else []
+        latest = next((event for event in reversed(events) if event.is_available), None)
+        return recent, latest
+
+    def display(self, count):
+        """以 check_quota_logs.sh 相同的格式显示配额日志"""
+        separator = "-" * 54
+        print(f"{Colors.INFO}{t('log_analyzing').format(path=self.log_file)}{Colors.RESET}")
+        print(separator)
+
+        recent, latest = self.scan(count)
+
+        print(f"{Colors.HEADER}{t('log_recent_entries').format(count=count)}{Colors.RESET}")
+        print()
+
+        # 上一条 Available 事件的 current 值，用于计算相邻 Available 事件之间的差值
+        previous_current = None
+        diff_format = t('log_diff').format
+        for event in recent:
+            diff_text = ""
+            if event.is_available:
+                current = _to_number(event.current)
+                if current is not None and previous_current is not None:
+                    diff_text = diff_format(diff=f"{current - previous_current:.4f}")
+                previous_current = current
+            print(f"[{event.timestamp}] {event.message}{Colors.SUCCESS}{diff_text}{Colors.RESET}")
+
+        print()
+        print(separator)
+        print(f"{Colors.HEADER}{t('log_latest_title')}{Colors.RESET}")
+        print()
+
+        if latest:
+            print(f"{Colors.INFO}{t('log_last_updated').format(time=latest.timestamp)}{Colors.RESET}")
+            print(t('log_current_usage').format(value=latest.current))
+            print(t('log_maximum_quota').format(value=latest.maximum))
+            print(t('log_valid_until').format(value=latest.until))
+
+            current = _to_number(latest.current)
+            maximum = _to_number(latest.maximum)
+            if current is not None and maximum:
+                print(t('log_percentage_used').format(value=f"{current / maximum * 100:.2f}"))
+        else:
+            print(f"{Colors.WARNING}{t('log_no_quota')}{Colors.RESET}")
+
+        print(separator)
+        print(f"{Colors.DIM}{t('log_note')}{Colors.RESET}")
+
+
+class QuotaLogImporter:
+    """
+    增量导入 idea.log 中的配额事件
+
+    每个日志文件保存一个 (inode, offset) 检查点，每次只读取新追加的字节。
+    idea.log 的 inode 变化时说明发生了轮转（idea.log -> idea.1.log -> idea.2.log ...），
+    此时先在轮转文件中找到检查点对应的文件读完剩余部分，再依次读取更新的文件。
+    """
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    @staticmethod
+    def _rotated_siblings(log_file):
+        """返回轮转产生的日志文件 [(路径, stat)]，从最新的 idea.1.log 开始"""
+        base, ext = os.path.splitext(log_file)
+        siblings = []
+        index = 1
+        while True:
+            path = f"{base}.{index}{ext}"
+            try:
+                siblings.append((path, os.stat(path)))
+            except OSError:
+                return siblings
+            index += 1
+
+    @staticmethod
+    def _read_events(path, offset):
+        """
+        从 offset 开始读取完整的行并解析配额事件，末尾不完整的行留到下次读取
+
+        Returns:
+            (事件列表, 读取结束的位置, 文件 inode)
+        """
+        events = []
+        with open(path, "rb") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            f.seek(offset)
+            position = offset
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                position += len(line)
+                event = QuotaLogEvent.from_line(line)
+                if event:
+                    events.append(event)
+        return events, position, inode
+
+    def _plan(self, log_file):
+        """根据检查点确定需要读取的文件和起始位置 [(路径, offset)]，按从旧到新的顺序"""
+        checkpoint = self.db_manager.get_log_checkpoint(log_file)
+        stat_result = os.stat(log_file)
+
+        if checkpoint is None:
+            # 首次导入：先导入已轮转的旧日志
+            rotated = self._rotated_siblings(log_file)
+            return [(path, 0) for path, _ in reversed(rotated)] + [(log_file, 0)]
+
+        inode, offset = checkpoint
+        if stat_result.st_ino == inode:
+            # 文件被截断时从头读取
+            return [(log_file, offset if stat_result.st_size >= offset else 0)]
+
+        # 发生了轮转，找到检查点对应的文件
+        rotated = self._rotated_siblings(log_file)
+        for index, (path, rotated_stat) in enumerate(rotated):
+            if rotated_stat.st_ino == inode:
+                print(f"{Colors.INFO}{t('log_rotation_detected').format(path=path)}{Colors.RESET}")
+                newer = [(newer_path, 0) for newer_path, _ in reversed(rotated[:index])]
+                return [(path, offset)] + newer + [(log_file, 0)]
+
+        # 检查点对应的文件已被删除，读取所有轮转文件（重复的事件会被忽略）
+        return [(path, 0) for path, _ in reversed(rotated)] + [(log_file, 0)]
+
+    def ingest(self, log_file):
+        """
+        导入日志文件中新增的配额事件
+
+        Returns:
+            新导入的事件数量，失败时返回 None
+        """
+        log_file = os.path.abspath(log_file)
+        events = []
+        bytes_read = 0
+        inode, offset = None, 0
+
+        plan = self._plan(log_file)
+        for path, start in plan:
+            file_events, offset, inode = self._read_events(path, start)
+            events.extend(file_events)
+            bytes_read += offset - start
+
+        # 最后读取的总是 idea.log 本身，检查点记录它的 inode 和位置
+        inserted = self.db_manager.save_log_events(log_file, events, inode, offset)
+        if inserted is not None:
+            print(f"{Colors.SUCCESS}{t('log_ingest_result').format(count=inserted, files=len(plan), size=bytes_read)}{Colors.RESET}")
+        return inserted
+
+
+def _scan_buffer(buffer, start, end):
+    """
+    扫描缓冲区 [start, end) 范围内的配额事件
+
+    直接在缓冲区（bytes 或内存映射）上查找 QuotaManager2 标记，只截取包含标记的行，
+    其余内容不会被拆分或解码。start 必须位于行首。
+    """
+    events = []
+    position = buffer.find(QUOTA_LOG_MARKER, start, end)
+    while position != -1:
+        line_start = buffer.rfind(b"\n", start, position) + 1 or start
+        line_end = buffer.find(b"\n", position, end)
+        if line_end == -1:
+            line_end = end
+
+        event = QuotaLogEvent.from_line(buffer[line_start:line_end])
+        if event:
+            events.append(event)
+        position = buffer.find(QUOTA_LOG_MARKER, line_end, end)
+    return events
+
+
+def _scan_log_chunk(path, start, end):
+    """扫描日志文件中 [start, end) 范围内的配额事件（在工作进程中执行），start 和 end 必须位于行首"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _scan_buffer(mm, start, end)
+
+
+def _scan_stream(stream):
+    """按块读取解压后的数据流并扫描配额事件，块末尾不完整的行与下一块拼接"""
+    events = []
+    remainder = b""
+    while True:
+        block = stream.read(LOG_DECOMPRESS_BLOCK_SIZE)
+        if not block:
+            break
+
+        data = remainder + block
+        cut = data.rfind(b"\n") + 1
+        remainder = data[cut:]
+        events.extend(_scan_buffer(data, 0, cut))
+
+    if remainder:
+        events.extend(_scan_buffer(remainder, 0, len(remainder)))
+    return events
+
+
+def _scan_compressed_log(path, member=None):
+    """
+    流式解压并扫描日志包中的配额事件（在工作进程中执行），不会解压到磁盘
+
+    Args:
+        path: .gz 或 .zip 文件路径
+        member: zip 包中的日志文件名；读取 .gz 文件时为 None
+    """
+    if member is None:
+        with gzip.open(path, "rb") as stream:
+            return _scan_stream(stream)
+
+    with zipfile.ZipFile(path) as archive, archive.open(member) as stream:
+        return _scan_stream(stream)
+
+
+def _is_compressed_log(path):
+    """是否是 .gz/.zip 日志包"""
+    return path.lower().endswith(COMPRESSED_LOG_SUFFIXES)
+
+
+class QuotaLogScanner:
+    """
+    大日志文件的多进程扫描器
+
+    用于批量分析收集到的 idea.log：文件被内存映射并按行边界切成多个块，
+    各块在进程池中并发扫描，最后把所有文件的事件按时间顺序合并。
+    .gz 和 .zip 日志包在工作进程中流式解压扫描，zip 包中的每个 .log 文件作为独立的来源。
+    """
+
+    def __init__(self, max_workers=None, chunk_size=LOG_SCAN_CHUNK_SIZE):
+        """
+        初始化扫描器
+
+        Args:
+            max_workers: 进程池大小，默认为 CPU 核数
+            chunk_size: 每个块的大致字节数
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def _chunks(self, path):
+        """把文件切分成以换行符对齐的块，返回 [(start, end)]"""
+        size = os.path.getsize(path)
+        if size == 0:
+            return []
+
+        chunks = []
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                end = start + self.chunk_size
+                if end >= size:
+                    end = size
+                else:
+                    newline = mm.find(b"\n", end)
+                    end = size if newline == -1 else newline + 1
+                chunks.append((start, end))
+                start = end
+        return chunks
+
+    @staticmethod
+    def _zip_log_members(path):
+        """列出 zip 包中的日志文件"""
+        with zipfile.ZipFile(path) as archive:
+            return [info.filename for info in archive.infolist()
+                    if not info.is_dir() and info.filename.lower().endswith(".log")]
+
+    def scan(self, paths):
+        """
+        扫描多个日志文件或日志包
+
+        Returns:
+            按时间顺序排列的 [(来源, QuotaLogEvent)] 列表；zip 包中文件的来源为 "包路径!文件名"
+        """
+        # [(来源, 扫描函数, 参数)]
+        tasks = []
+        for path in paths:
+            lower_path = path.lower()
+            if lower_path.endswith(".gz"):
+                tasks.append((path, _scan_compressed_log, (path, None)))
+            elif lower_path.endswith(".zip"):
+                for member in self._zip_log_members(path):
+                    tasks.append((f"{path}!{member}", _scan_compressed_log, (path, member)))
+            else:
+                tasks.extend((path, _scan_log_chunk, (path, start, end)) for start, end in self._chunks(path))
+
+        if len(tasks) <= 1 or self.max_workers == 1:
+            results = [function(*arguments) for _, function, arguments in tasks]
+        else:
+            with concurrent_futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(function, *arguments) for _, function, arguments in tasks]
+                results = [future.result() for future in futures]
 
+        # 同一来源的块按顺序拼接，不同来源之间按时间戳归并
+        per_source = {}
+        for (source, _, _), events in zip(tasks, results):
+            per_source.setdefault(source, []).extend((source, event) for event in events)
+
+        return list(heapq.merge(*per_source.values(), key=lambda item: item[1].timestamp))
+
+
+def is_read_only_command(args):
+    """判断命令行参数对应的命令是否只读取数据库"""
+    return bool(args.help_paths or args.status or args.history or args.filter or args.rollup or args.product
+                or args.logs is not None or args.scan_logs) and not (
+        args.interactive or args.ingest_logs is not None or args.watch or args.auto_find or args.analyze)
+
+
+def is_long_running_command(args):
+    """判断命令是否会长时间运行：交互式界面（包括没有指定命令时）和监视模式"""
+    if args.interactive or args.watch:
         return True
-    except socket.error:
-        print(f"{Colors.INFO}{t('app_lock_failure_simple').format(port=LOCK_PORT)}{Colors.RESET}")
-        return False
+    return not (args.help_paths or args.logs is not None or args.ingest_logs is not None or args.scan_logs
+                or args.auto_find or args.analyze or args.status or args.rollup
+                or args.history or args.filter or args.product)
 
 
-def release_app_lock():
-    """释放应用程序锁"""
-    global app_lock_socket
-    if 'app_lock_socket' in globals() and app_lock_socket:
-        app_lock_socket.close()
-        print(f"{Colors.INFO}{t('app_lock_released').format(port=LOCK_PORT)}{Colors.RESET}")
+def _parse_time_arg(value):
+    """解析 --before/--after 的时间参数（ISO 格式，例如 2025-05-01 或 2025-05-01T12:00），返回毫秒时间戳"""
+    try:
+        return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp() * 1000)
+    except ValueError:
+        raise argparse.ArgumentTypeError(t('invalid_time_arg').format(value=value))
 
 
 def create_argument_parser():
@@ -1713,16 +4610,39 @@ def create_argument_parser():
     parser.add_argument("-a", "--analyze", metavar="PATH", help=t('menu_analyze_file'))
     parser.add_argument("-A", "--auto-find", action="store_true", help=t('menu_auto_find'))
     parser.add_argument("--all", action="store_true", help=t('auto_analyze'))
+    parser.add_argument("--no-cache", action="store_true", help=t('no_cache_option'))
+    parser.add_argument("--rescan", action="store_true", help=t('rescan_option'))
+
+    # 日志选项
+    parser.add_argument("--logs", nargs="?", const="", metavar="PATH", help=t('logs_option'))
+    parser.add_argument("--ingest-logs", nargs="?", const="", metavar="PATH", help=t('ingest_logs_option'))
+    parser.add_argument("--scan-logs", nargs="+", metavar="PATH", help=t('scan_logs_option'))
+
+    # 监视选项
+    parser.add_argument("--watch", action="store_true", help=t('watch_option'))
+    parser.add_argument("--debounce", type=float, default=WATCH_DEBOUNCE_SECONDS, metavar="SECONDS",
+                        help=t('debounce_option'))
+    parser.add_argument("--poll-interval", type=float, default=WATCH_POLL_INTERVAL, metavar="SECONDS",
+                        help=t('poll_interval_option'))
 
     # 历史记录选项
     parser.add_argument("-H", "--history", action="store_true", help=t('menu_view_history'))
-    parser.add_argument("-l", "--limit", type=int, default=10, help=t('enter_record_limit'))
+    parser.add_argument("-l", "--limit", type=int, help=t('enter_record_limit'))
     parser.add_argument("-f", "--filter", metavar="PATH", help=t('menu_filter_history'))
+    parser.add_argument("--rollup", choices=sorted(ROLLUP_TABLES), help=t('rollup_option'))
+    parser.add_argument("--status", action="store_true", help=t('status_option'))
+    parser.add_argument("--product", metavar="NAME", help=t('product_option'))
+    parser.add_argument("--page-size", type=int, metavar="N", help=t('page_size_option'))
+    parser.add_argument("--before", type=_parse_time_arg, metavar="TIME", help=t('before_option'))
+    parser.add_argument("--after", type=_parse_time_arg, metavar="TIME", help=t('after_option'))
 
     # 语言选项
     parser.add_argument("--lang", choices=SUPPORTED_LANGUAGES, default=None,
                         help=t('set_language_option').format(languages=', '.join(SUPPORTED_LANGUAGES)))
 
+    # 诊断选项
+    parser.add_argument("--diagnostics", action="store_true", help=t('diagnostics_option'))
+
     # 版本信息
     parser.add_argument("-v", "--version", action="version", version=t('version_info').format(version=VERSION))
 
@@ -1820,68 +4740,97 @@ def main():
         if not get_language() in SUPPORTED_LANGUAGES:
             set_language(config_manager.get_language())
 
-        # 打印配置路径信息
-        config_manager.print_config_paths()
-
         # 解析命令行参数
         args = parse_arguments()
 
+        # 配置路径和诊断信息只在 --diagnostics 时打印
+        if args.diagnostics:
+            config_manager.print_config_paths()
+
         # 如果通过命令行指定了语言，保存到配置
         if args.lang:
             config_manager.set_language(args.lang)
 
-        # 获取应用程序锁
-        if not get_app_lock():
-            sys.exit(1)
+        # 只读命令以只读方式打开数据库；所有实例运行期间都持有共享锁，
+        # 压缩历史记录时才转换为排他锁，因此其他实例运行期间不会删除原始记录。
+        # 数据库使用 WAL 模式和忙等待超时，多个实例可以同时运行；其他实例正在压缩时等待它完成
+        read_only = is_read_only_command(args)
+        app_lock = AppLock(os.path.join(config_manager.config_dir, LOCK_FILE_NAME))
+        app_lock.acquire(exclusive=False, blocking=True)
 
-        # 打印诊断信息
-        print_diagnostic_info()
+        # 打印诊断信息和应用程序锁的获取耗时
+        if args.diagnostics:
+            print_diagnostic_info()
+            app_lock.print_status()
 
         # 创建数据库管理器
-        db_manager = DatabaseManager(config_manager)
+        db_manager = DatabaseManager(config_manager, read_only=read_only, app_lock=app_lock)
 
         # 创建命令行界面
         cli = CommandLineInterface(config_manager, db_manager)
+        cli.quota_analyzer.use_cache = not args.no_cache
+        cli.quota_analyzer.rescan = args.rescan
 
-        try:
-            # 处理命令行参数
-            if args.help_paths:
-                print_help_paths()
-            elif args.interactive:
-                cli.run_interactive()
-            elif args.auto_find:
-                cli.quota_analyzer.find_and_analyze_quota_files(non_interactive=args.all)
-            elif args.analyze:
-                quota_info = cli.quota_analyzer.analyze_file(args.analyze)
-                if quota_info:
-                    cli.quota_analyzer.display_quota_info(quota_info)
-            elif args.history:
-                limit = args.limit if args.limit else 10
-                cli.quota_analyzer.display_history(limit=limit)
-            elif args.filter:
-                limit = args.limit if args.limit else 10
-                cli.quota_analyzer.display_history(file_path=args.filter, limit=limit)
-            else:
-                # 如果没有提供参数，运行交互式界面
-                cli.run_interactive()
-        except KeyboardInterrupt:
-            print(f"\n{t('operation_cancelled')}")
-        except EOFError:
-            print(f"\n{t('eof_interrupt')}")
-            print(f"{t('use_command_line')}")
-            print("  python JetBrainsAIQuotaAnalyzer_CLI.py -A --all")
-            print("  python JetBrainsAIQuotaAnalyzer_CLI.py -a /path/to/file.xml")
-            print("  python JetBrainsAIQuotaAnalyzer_CLI.py --help")
-        except Exception as e:
-            print(f"{t('unexpected_error').format(error=e)}")
-            print(f"{t('examples')}:")
-            traceback.print_exc()
+        # 单个命令执行期间的配置修改（最近路径、日志路径等）合并为退出时的一次写入；
+        # 交互式界面按菜单操作批量写入，监视模式的修改立即写入，长时间运行时被终止也不会丢失
+        batch = contextlib.nullcontext() if is_long_running_command(args) else config_manager.batch_updates()
+        with batch:
+            try:
+                # 处理命令行参数
+                if args.help_paths:
+                    print_help_paths()
+                elif args.interactive:
+                    cli.run_interactive()
+                elif args.logs is not None:
+                    cli.show_quota_logs(args.logs, args.limit if args.limit else LOG_DEFAULT_ENTRIES)
+                elif args.ingest_logs is not None:
+                    cli.ingest_quota_logs(args.ingest_logs)
+                elif args.scan_logs:
+                    cli.scan_quota_logs(args.scan_logs)
+                elif args.watch:
+                    cli.quota_analyzer.watch_quota_files(debounce=args.debounce, poll_interval=args.poll_interval)
+                elif args.auto_find:
+                    cli.quota_analyzer.find_and_analyze_quota_files(non_interactive=args.all)
+                elif args.analyze:
+                    quota_info = cli.quota_analyzer.analyze_file(args.analyze)
+                    if quota_info:
+                        cli.quota_analyzer.display_quota_info(quota_info)
+                elif args.status:
+                    cli.quota_analyzer.display_status(file_path=args.filter, product=args.product)
+                elif args.rollup:
+                    limit = args.limit if args.limit else 10
+                    cli.quota_analyzer.display_rollups(granularity=args.rollup, file_path=args.filter, limit=limit,
+                                                       product=args.product)
+                elif args.history or args.filter or args.product:
+                    # 指定了每页行数时默认显示所有匹配的记录，-l 仍可限制总数
+                    limit = args.limit if args.limit else (None if args.page_size else 10)
+                    cli.quota_analyzer.display_history(file_path=args.filter, limit=limit, page_size=args.page_size,
+                                                       before=args.before, after=args.after, product=args.product)
+                else:
+                    # 如果没有提供参数，运行交互式界面
+                    cli.run_interactive()
+            except KeyboardInterrupt:
+                print(f"\n{t('operation_cancelled')}")
+            except EOFError:
+                print(f"\n{t('eof_interrupt')}")
+                print(f"{t('use_command_line')}")
+                print("  python JetBrainsAIQuotaAnalyzer_CLI.py -A --all")
+                print("  python JetBrainsAIQuotaAnalyzer_CLI.py -a /path/to/file.xml")
+                print("  python JetBrainsAIQuotaAnalyzer_CLI.py --help")
+            except Exception as e:
+                print(f"{t('unexpected_error').format(error=e)}")
+                print(f"{t('examples')}:")
+                traceback.print_exc()
+
+        # 写入命令结束后逐步压缩过期的原始历史记录（只在没有其他实例运行时进行，见 compact_history）
+        if not read_only:
+            db_manager.compact_history()
 
         # 关闭数据库连接
         db_manager.close()
 
         # 释放应用程序锁
-        release_app_lock()
+        app_lock.release()
     except Exception as e:
         print(f"{t('unexpected_error').format(error=e)}")
         print(f"{t('examples')}:")
@@ -1890,4 +4839,9 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包后的程序中，--scan-logs 的工作进程会重新启动可执行文件，freeze_support() 让它们执行扫描任务
+    # 而不是再次运行命令行；从源码运行时不需要，也就不必在启动时导入 multiprocessing
+    if getattr(sys, 'frozen', False):
+        import multiprocessing
+        multiprocessing.freeze_support()
     main()
@@ -14,10 +14,8 @@ a = Analysis(
         'datetime',
         'argparse',
         'platform',
-        'socket',
         'signal',
         'traceback',
-        'subprocess',
         'time',
         'json',
         'pathlib',
@@ -25,6 +23,17 @@ a = Analysis(
         'sys',
         're',
         'glob',
+        'hashlib',
+        'select',
+        'struct',
+        'ctypes',
+        'concurrent.futures',
+        # 只通过 _lazy_import 按模块名导入，PyInstaller 无法自动发现（--scan-logs 读取 .gz 和 .zip 日志包时使用）
+        'gzip',
+        'zipfile',
+        # 翻译目录按语言动态导入，PyInstaller 无法自动发现
+        'translations.catalog_zh_cn',
+        'translations.catalog_en',
     ],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+历史记录过滤基准测试
+--------------------------------------------------
+生成包含数百万条历史记录、数千个路径的合成数据库，比较按目录过滤时
+LIKE 前缀匹配与路径索引半开区间查询的耗时，以及按 IDE 产品过滤的耗时。
+
+用法:
+    python benchmarks/bench_history_filter.py [--rows 2000000] [--paths 2000] [-n 次数]
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from JetBrainsAIQuotaAnalyzer_CLI import (  # noqa: E402
+    HISTORY_COLUMNS, HISTORY_FROM, HISTORY_SEEN_TS, QUOTA_FILE_NAME, DatabaseManager, _prefix_upper_bound)
+
+PRODUCTS = ("PyCharm", "IntelliJIdea", "WebStorm", "GoLand", "CLion", "Rider", "DataGrip", "RustRover")
+VERSIONS = ("2023.3", "2024.1", "2024.2", "2024.3")
+INSERT_BATCH = 100000
+
+
+class BenchConfig:
+    """只提供 DatabaseManager 需要的配置项，数据库放在临时目录中"""
+
+    def __init__(self, config_dir):
+        self.config_dir = config_dir
+
+    def get_history_journal_state(self):
+        return None
+
+    def get_history_run_length(self):
+        return False
+
+    def get_recent_paths(self):
+        return []
+
+    def get_history_retention_days(self):
+        return 0
+
+
+def build_paths(root, count):
+    """在 root 下创建 count 个配额文件目录（每个用户目录下一个 IDE），返回配额文件路径列表"""
+    paths = []
+    for i in range(count):
+        ide_dir = f"{PRODUCTS[i % len(PRODUCTS)]}{VERSIONS[i // len(PRODUCTS) % len(VERSIONS)]}"
+        options_dir = os.path.join(root, f"user{i // 4:05d}", "JetBrains", ide_dir, "options")
+        os.makedirs(options_dir, exist_ok=True)
+        paths.append(os.path.join(options_dir, QUOTA_FILE_NAME))
+    return paths
+
+
+def populate(db, paths, rows):
+    """直接批量写入 rows 条历史记录，时间戳覆盖最近一年"""
+    cursor = db.conn.cursor()
+    path_ids = list(db.intern_paths(cursor, paths).values())
+    now = int(time.time() * 1000)
+    year_ms = 365 * 86400 * 1000
+    rng = random.Random(42)
+    for start in range(0, rows, INSERT_BATCH):
+        batch = []
+        for _ in range(min(INSERT_BATCH, rows - start)):
+            current = rng.uniform(0, 2000000)
+            batch.append(("Available", current, 2000000.0, "2026-06-01T00:00:00Z", current / 20000,
+                          "Known", "2025-06-01T00:00:00Z", 2000000.0, "PT720H",
+                          now - rng.randrange(year_ms), rng.choice(path_ids)))
+        cursor.executemany('''
+                           INSERT INTO history
+                           (type, current, maximum, until, percentage, refill_type,
+                            next_refill, refill_amount, refill_duration, ts, path_id)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                           ''', batch)
+    db.conn.commit()
+
+
+def bench(run, runs):
+    """返回单次查询的平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(runs):
+        run()
+    return (time.perf_counter() - start) * 1000 / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark directory and product history filters")
+    parser.add_argument("--rows", type=int, default=2000000, help="history rows in the synthetic database")
+    parser.add_argument("--paths", type=int, default=2000, help="distinct quota file paths")
+    parser.add_argument("-n", "--runs", type=int, default=20, help="runs per query")
+    parser.add_argument("--limit", type=int, default=50, help="records returned per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db = DatabaseManager(BenchConfig(tmp))
+        root = os.path.join(tmp, "home")
+        paths = build_paths(root, args.paths)
+
+        print(f"Generating {args.rows} rows over {args.paths} paths...")
+        start = time.perf_counter()
+        populate(db, paths, args.rows)
+        print(f"done in {time.perf_counter() - start:.1f} s\n")
+
+        one_user = os.path.join(root, "user00042")
+        all_users = root
+
+        def like_paths(directory):
+            # 改用区间查询之前的 LIKE 前缀匹配，需要逐行扫描路径表
+            return db.conn.execute("SELECT id FROM paths WHERE path LIKE ? || '%'",
+                                   (os.path.join(directory, ''),)).fetchall()
+
+        def range_paths(directory):
+            prefix = os.path.join(directory, '')
+            return db.conn.execute("SELECT id FROM paths WHERE path >= ? COLLATE NOCASE AND path < ? COLLATE NOCASE",
+                                   (prefix, _prefix_upper_bound(prefix))).fetchall()
+
+        def like_history(directory):
+            return db.conn.execute(f'''
+                                   SELECT {HISTORY_COLUMNS}
+                                   FROM {HISTORY_FROM}
+                                   WHERE h.path_id IN (SELECT id FROM paths WHERE path LIKE ? || '%')
+                                   ORDER BY {HISTORY_SEEN_TS} DESC, h.id DESC
+                                   LIMIT ?
+                                   ''', (os.path.join(directory, ''), args.limit)).fetchall()
+
+        def product_query(product):
+            return list(itertools.islice(db.iter_history(page_size=args.limit, product=product), args.limit))
+
+        cases = [
+            ("paths LIKE, one user", lambda: like_paths(one_user)),
+            ("paths range, one user", lambda: range_paths(one_user)),
+            ("history LIKE, one user", lambda: like_history(one_user)),
+            ("load_history, one user", lambda: db.load_history(limit=args.limit, file_path=one_user)),
+            ("history LIKE, all", lambda: like_history(all_users)),
+            ("load_history, all", lambda: db.load_history(limit=args.limit, file_path=all_users)),
+            ("product PyCharm", lambda: product_query("PyCharm")),
+            ("product PyCharm2024.1", lambda: product_query("PyCharm2024.1")),
+        ]
+
+        print(f"{'query':<26} {'rows':>6} {'ms/query':>10}")
+        for name, run in cases:
+            count = len(run())
+            print(f"{name:<26} {count:>6} {bench(run, args.runs):>10.2f}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
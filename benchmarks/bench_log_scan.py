@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+大日志扫描基准测试
+--------------------------------------------------
+生成合成的 idea.log，比较逐行读取与 QuotaLogScanner 多进程扫描的吞吐量（行/秒）。
+
+用法:
+    python benchmarks/bench_log_scan.py [--size-mb 2048] [--workers N] [--skip-baseline]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from JetBrainsAIQuotaAnalyzer_CLI import QuotaLogEvent, QuotaLogScanner  # noqa: E402
+
+LINES_PER_BLOCK = 10000
+QUOTA_EVERY = 500  # 每隔多少行插入一条配额事件
+
+
+def build_block(block_index):
+    """生成一个日志块，返回 (文本, 行数)"""
+    lines = []
+    hour, minute = divmod(block_index, 60)
+    for i in range(LINES_PER_BLOCK):
+        timestamp = f"2025-05-01 {hour % 24:02d}:{minute:02d}:{i * 60 // LINES_PER_BLOCK:02d},{i % 1000:03d}"
+        if i % QUOTA_EVERY == 0:
+            current = block_index * 100 + i / 100
+            lines.append(f"{timestamp} [  12345]   INFO - #c.i.m.a.QuotaManager2 - New quota state is: "
+                         f"Available(current={current:.4f}, maximum=2000000, until=2026-06-01T00:00:00Z)")
+        else:
+            lines.append(f"{timestamp} [  12345]   INFO - #c.i.o.a.i.SomeComponent - "
+                         f"background task {i} finished in {i % 97} ms, nothing to see here")
+    return "\n".join(lines) + "\n", LINES_PER_BLOCK
+
+
+def write_log(path, size_mb):
+    """生成约 size_mb 大小的合成日志，返回总行数"""
+    target = size_mb * 1024 * 1024
+    written = 0
+    total_lines = 0
+    block_index = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            text, line_count = build_block(block_index)
+            f.write(text)
+            written += len(text)
+            total_lines += line_count
+            block_index += 1
+    return total_lines
+
+
+def bench_baseline(path):
+    """逐行读取并解析，返回 (事件数, 耗时)"""
+    start = time.perf_counter()
+    count = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if QuotaLogEvent.from_line(line):
+                count += 1
+    return count, time.perf_counter() - start
+
+
+def bench_scanner(path, workers):
+    """使用 QuotaLogScanner 扫描，返回 (事件数, 耗时)"""
+    start = time.perf_counter()
+    events = QuotaLogScanner(max_workers=workers).scan([path])
+    return len(events), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark large idea.log scanning")
+    parser.add_argument("--size-mb", type=int, default=2048, help="size of the synthetic log in MB")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes for the parallel run")
+    parser.add_argument("--skip-baseline", action="store_true", help="skip the line-by-line baseline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "idea.log")
+        print(f"Generating {args.size_mb} MB synthetic log...")
+        total_lines = write_log(path, args.size_mb)
+        print(f"{total_lines} lines, {os.path.getsize(path)} bytes\n")
+
+        runs = []
+        if not args.skip_baseline:
+            runs.append(("line-by-line", lambda: bench_baseline(path)))
+        runs.append(("mmap, 1 process", lambda: bench_scanner(path, 1)))
+        if args.workers > 1:
+            runs.append((f"mmap, {args.workers} processes", lambda: bench_scanner(path, args.workers)))
+
+        print(f"{'mode':<22} {'events':>10} {'seconds':>10} {'lines/s':>14}")
+        for name, run in runs:
+            count, elapsed = run()
+            print(f"{name:<22} {count:>10} {elapsed:>10.2f} {total_lines / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
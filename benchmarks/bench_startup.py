@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+启动耗时基准测试
+--------------------------------------------------
+测量导入 JetBrainsAIQuotaAnalyzer_CLI 模块的耗时（python -X importtime），列出耗时最多的
+顶层导入，并测量几个常用命令从启动到退出的总耗时。每个命令分别以脚本方式和 python -m 方式运行：
+脚本方式每次都要重新编译整个源文件，python -m 方式使用 __pycache__ 中的字节码缓存。
+命令在临时的 HOME 中运行，不会修改真实配置。
+
+用法:
+    python benchmarks/bench_startup.py [-n 次数] [--top 10] [--home 目录]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "JetBrainsAIQuotaAnalyzer_CLI.py")
+MODULE = "JetBrainsAIQuotaAnalyzer_CLI"
+
+# 在 shell 提示符和钩子中常用的命令
+COMMANDS = (
+    ("--version", ["--version"]),
+    ("--help", ["--help"]),
+    ("--status", ["--status"]),
+    ("-H -l 1", ["-H", "-l", "1"]),
+)
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure_import(env):
+    """导入模块一次，返回 (总耗时微秒, [(累计耗时微秒, 顶层模块名)])"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    total = 0
+    children = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        if indent == 1:
+            # 子模块先于父模块输出：遇到本模块时，之前收集的就是它直接导入的模块
+            if name == MODULE:
+                total = cumulative
+                break
+            children = []
+        elif indent == 3:
+            children.append((cumulative, name))
+    return total, children
+
+
+def measure_command(argv, env):
+    """运行一次 python 命令，返回从启动到退出的耗时（毫秒）"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *argv], cwd=ROOT, env=env,
+                   stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark module import time and CLI startup")
+    parser.add_argument("-n", "--runs", type=int, default=10, help="runs per measurement")
+    parser.add_argument("--top", type=int, default=10, help="slowest direct imports to list")
+    parser.add_argument("--home", help="HOME for the commands (default: a new temporary directory)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, HOME=args.home or tmp)
+        # 预热一次并写入字节码缓存，避免编译源码和冷文件缓存影响结果
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        measure_import(env)
+        measure_command([SCRIPT, "--version"], env)
+
+        samples = [measure_import(env) for _ in range(args.runs)]
+        totals = [total / 1000 for total, _ in samples]
+        print(f"import {MODULE}: median {statistics.median(totals):.1f} ms, min {min(totals):.1f} ms\n")
+
+        _, children = min(samples)
+        print(f"{'direct import':<32} {'ms':>8}")
+        for cumulative, name in sorted(children, reverse=True)[:args.top]:
+            print(f"{name:<32} {cumulative / 1000:>8.1f}")
+
+        # 解释器本身的启动耗时作为参照
+        interpreter = [measure_command(["-c", "pass"], env) for _ in range(args.runs)]
+        print(f"\npython -c pass: median {statistics.median(interpreter):.1f} ms\n")
+
+        print(f"{'command':<12} {'script ms':>10} {'-m ms':>10}")
+        for name, argv in COMMANDS:
+            script = [measure_command([SCRIPT, *argv], env) for _ in range(args.runs)]
+            module = [measure_command(["-m", MODULE, *argv], env) for _ in range(args.runs)]
+            print(f"{name:<12} {statistics.median(script):>10.1f} {statistics.median(module):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
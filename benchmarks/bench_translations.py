@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+翻译加载与格式化基准测试
+--------------------------------------------------
+比较加载完整的多语言翻译字典与只加载当前语言的翻译目录的耗时，以及逐行输出时
+在完整字典中嵌套查找后 str.format、t(key).format 以及循环外只查找一次模板的耗时。
+
+用法:
+    python benchmarks/bench_translations.py [-n 次数] [--lang zh_cn]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import JetBrainsAIQuotaAnalyzer_CLI as cli  # noqa: E402
+
+LOAD_RUNS = 20
+
+
+def bench_import(module_name, runs):
+    """在新的解释器中导入模块（python -X importtime），返回模块自身导入耗时的中位数（毫秒）"""
+    env = dict(os.environ)
+    # 第一次导入时写入字节码缓存，之后的导入不包含编译源码的时间
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    pattern = re.compile(r"^import time:\s+(\d+) \|\s+\d+ \|\s+%s$" % re.escape(module_name), re.M)
+    times = []
+    for i in range(runs + 1):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+                                cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+        if i:
+            times.append(int(pattern.search(result.stderr).group(1)) / 1000)
+    return statistics.median(times)
+
+
+def bench(run, runs):
+    """返回单次调用的平均耗时（微秒）"""
+    start = time.perf_counter()
+    for _ in range(runs):
+        run()
+    return (time.perf_counter() - start) * 1000000 / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark translation loading and formatting")
+    parser.add_argument("-n", "--runs", type=int, default=200000, help="calls per formatting case")
+    parser.add_argument("--lang", choices=cli.SUPPORTED_LANGUAGES, default=cli.DEFAULT_LANGUAGE)
+    args = parser.parse_args()
+
+    print(f"{'load':<36} {'ms':>8}")
+    print(f"{'translations.translations (all)':<36} {bench_import('translations.translations', LOAD_RUNS):>8.2f}")
+    catalog_module = f"translations.catalog_{args.lang}"
+    print(f"{catalog_module:<36} {bench_import(catalog_module, LOAD_RUNS):>8.2f}\n")
+
+    from translations import get_translations
+    translations = get_translations()
+    cli.set_language(args.lang)
+    lang = args.lang
+
+    def nested(key, **kwargs):
+        # 改用扁平目录之前的 t()：在完整的多语言字典中嵌套查找
+        if key in translations and lang in translations[key]:
+            return translations[key][lang].format(**kwargs)
+        return key
+
+    cases = [
+        ("history_seen_count", {"count": 4}),
+        ("watch_recorded", {"time": "2025-05-01 10:00:00", "path": "/tmp/AIAssistantQuotaManager2.xml",
+                            "current": 1234.5, "maximum": 2000000.0, "percentage": 0.06}),
+    ]
+    print(f"{'key':<20} {'nested us':>10} {'t().format us':>14} {'hoisted us':>11}")
+    for key, kwargs in cases:
+        template = cli.t(key).format
+        assert nested(key, **kwargs) == cli.t(key).format(**kwargs) == template(**kwargs)
+        nested_us = bench(lambda: nested(key, **kwargs), args.runs)
+        format_us = bench(lambda: cli.t(key).format(**kwargs), args.runs)
+        hoisted_us = bench(lambda: template(**kwargs), args.runs)
+        print(f"{key:<20} {nested_us:>10.3f} {format_us:>14.3f} {hoisted_us:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
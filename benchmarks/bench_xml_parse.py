@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+配额文件解析基准测试
+--------------------------------------------------
+比较 QuotaInfo.from_xml_file 的流式解析与完整 ElementTree 解析的耗时。
+
+用法:
+    python benchmarks/bench_xml_parse.py [-n 次数] [--padding 填充option数量]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from JetBrainsAIQuotaAnalyzer_CLI import QuotaInfo  # noqa: E402
+
+QUOTA_COMPONENT = (
+    '  <component name="AIAssistantQuotaManager2">\n'
+    '    <option name="nextRefill" value="{&#10;  &quot;type&quot;: &quot;Known&quot;,&#10;'
+    '  &quot;next&quot;: &quot;2025-06-01T00:00:00.000Z&quot;,&#10;  &quot;amount&quot;: &quot;2000000&quot;,&#10;'
+    '  &quot;duration&quot;: &quot;PT720H&quot;&#10;}" />\n'
+    '    <option name="quotaInfo" value="{&#10;  &quot;type&quot;: &quot;Available&quot;,&#10;'
+    '  &quot;current&quot;: &quot;1000000.0000&quot;,&#10;  &quot;maximum&quot;: &quot;2000000&quot;,&#10;'
+    '  &quot;until&quot;: &quot;2026-06-01T00:00:00Z&quot;&#10;}" />\n'
+    '  </component>\n'
+)
+
+
+def write_quota_file(path, padding):
+    """生成合成配额文件，配额组件之后追加 padding 个无关 option"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<application>\n")
+        f.write(QUOTA_COMPONENT)
+        if padding:
+            f.write('  <component name="Padding">\n')
+            for i in range(padding):
+                f.write(f'    <option name="padding{i}" value="{"x" * 64}" />\n')
+            f.write("  </component>\n")
+        f.write("</application>\n")
+
+
+def bench(path, streaming, runs):
+    """返回单次解析的平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(runs):
+        QuotaInfo.from_xml_file(path, streaming=streaming)
+    return (time.perf_counter() - start) * 1000 / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quota XML parsing")
+    parser.add_argument("-n", "--runs", type=int, default=200, help="runs per case")
+    parser.add_argument("--padding", type=int, default=50000, help="extra options in the inflated file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [("small", 0), ("inflated", args.padding)]
+        print(f"{'case':<10} {'size':>12} {'tree (ms)':>12} {'stream (ms)':>12} {'speedup':>8}")
+        for name, padding in cases:
+            path = os.path.join(tmp, f"{name}.xml")
+            write_quota_file(path, padding)
+            runs = args.runs if padding == 0 else max(1, args.runs // 20)
+
+            tree_ms = bench(path, False, runs)
+            stream_ms = bench(path, True, runs)
+            size = os.path.getsize(path)
+            print(f"{name:<10} {size:>12} {tree_ms:>12.3f} {stream_ms:>12.3f} {tree_ms / stream_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
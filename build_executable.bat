@@ -13,6 +13,14 @@ if %ERRORLEVEL% NEQ 0 (
     )
 )
 
+REM 检查缺失的翻译并生成各语言的翻译目录
+echo 检查翻译并生成翻译目录...
+python -m translations.build_catalog
+if %ERRORLEVEL% NEQ 0 (
+    echo 存在缺失的翻译，请补全 translations/translations.py 后重试。
+    exit /b 1
+)
+
 REM 清理之前的构建文件
 echo 清理之前的构建文件...
 if exist build rmdir /s /q build
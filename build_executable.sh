@@ -30,6 +30,13 @@ esac
 
 echo "检测到操作系统: $OS_TYPE"
 
+# 检查缺失的翻译并生成各语言的翻译目录
+echo "检查翻译并生成翻译目录..."
+if ! python -m translations.build_catalog; then
+    echo "存在缺失的翻译，请补全 translations/translations.py 后重试"
+    exit 1
+fi
+
 # 清理之前的构建文件
 echo "清理之前的构建文件..."
 rm -rf build dist
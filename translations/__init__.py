@@ -3,6 +3,47 @@
 
 """翻译模块，用于支持多语言"""
 
-from .translations import get_translations
+import binascii
+import importlib
+import os
 
-__all__ = ['get_translations']
\ No newline at end of file
+
+def get_translations():
+    """返回完整的多语言翻译字典 {键: {语言: 文本}}"""
+    from .translations import TRANSLATIONS
+    return TRANSLATIONS
+
+
+def load_catalog(language):
+    """
+    返回指定语言的扁平翻译目录 {键: 文本}。
+    优先加载 build_catalog 生成的 catalog_<语言>.py；目录模块不存在，或者 translations.py
+    修改后还没有重新生成时，才从完整的翻译字典中提取
+    """
+    try:
+        catalog = importlib.import_module(f"{__name__}.catalog_{language}")
+        if not _is_stale(catalog):
+            return catalog.CATALOG
+    except ImportError:
+        pass
+    return {key: texts[language] for key, texts in get_translations().items() if language in texts}
+
+
+def _is_stale(catalog):
+    """
+    判断目录模块是否落后于 translations.py：先比较源文件大小（以 CRLF 换行检出时每行多一个字节），
+    大小一致时再比较按 LF 换行计算的 CRC32，大小不变的修改也能发现。
+    打包后的程序没有源文件，视为最新；打包前运行的 build_catalog --check 仍是最终检查
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "translations.py")
+    try:
+        if os.path.getsize(path) not in (catalog.SOURCE_SIZE, catalog.SOURCE_SIZE + catalog.SOURCE_NEWLINES):
+            return True
+        with open(path, "rb") as f:
+            content = f.read()
+    except OSError:
+        return False
+    return binascii.crc32(content.replace(b"\r\n", b"\n")) != catalog.SOURCE_CRC
+
+
+__all__ = ['get_translations', 'load_catalog']
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+编译翻译目录
+--------------------------------------------------
+把 translations.py 中的多语言翻译字典编译为每种语言一个的扁平目录模块 catalog_<语言>.py，
+运行时只需加载当前语言的目录。编译前检查缺失的翻译：
+- 某个键缺少某种语言的文本
+- 代码中通过 t('键') 使用、但翻译字典中不存在的键
+
+发现缺失的翻译时不生成目录模块并返回非零退出码，打包脚本在构建前运行本检查。
+
+用法:
+    python -m translations.build_catalog          # 检查并生成目录模块
+    python -m translations.build_catalog --check  # 只检查，目录模块过期时也返回非零退出码
+"""
+
+import argparse
+import binascii
+import json
+import os
+import re
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_FILE = os.path.join(PACKAGE_DIR, "translations.py")
+LANGUAGES = ("zh_cn", "en")  # 需要生成目录的语言，与主程序的 SUPPORTED_LANGUAGES 一致
+CODE_FILES = (os.path.join(os.path.dirname(PACKAGE_DIR), "JetBrainsAIQuotaAnalyzer_CLI.py"),)  # 检查使用了哪些键的代码
+
+# 以字面量键调用 t() 的位置；t('lock_mode_' + mode) 这类拼接出来的键无法静态检查
+USED_KEY_PATTERN = re.compile(r"\bt\(\s*['\"]([A-Za-z0-9_]+)['\"]\s*[,)]")
+
+
+def catalog_path(language):
+    """返回指定语言的目录模块路径"""
+    return os.path.join(PACKAGE_DIR, f"catalog_{language}.py")
+
+
+def source_size():
+    """
+    返回 translations.py 以 LF 换行时的字节数、换行数和 CRC32，写入目录模块；
+    运行时先比较源文件大小，大小一致时再比较 CRC32 判断目录是否过期
+    """
+    with open(SOURCE_FILE, "rb") as f:
+        content = f.read().replace(b"\r\n", b"\n")
+    return len(content), content.count(b"\n"), binascii.crc32(content)
+
+
+def find_missing(translations, code_files=CODE_FILES):
+    """返回缺失翻译的说明列表，没有缺失时返回空列表"""
+    missing = []
+    for key, texts in translations.items():
+        for language in LANGUAGES:
+            if language not in texts:
+                missing.append(f"{key}: missing '{language}' text")
+
+    for code_file in code_files:
+        with open(code_file, encoding="utf-8") as f:
+            source = f.read()
+        for line_number, line in enumerate(source.splitlines(), 1):
+            for key in USED_KEY_PATTERN.findall(line):
+                if key not in translations:
+                    missing.append(f"{key}: used at {os.path.basename(code_file)}:{line_number} but not defined")
+    return missing
+
+
+def render_catalog(language, translations, size):
+    """生成指定语言的目录模块源码"""
+    lines = [
+        "# -*- coding: utf-8 -*-",
+        "# 由 python -m translations.build_catalog 根据 translations.py 生成，请勿手动修改",
+        "",
+        f"SOURCE_SIZE = {size[0]}",
+        f"SOURCE_NEWLINES = {size[1]}",
+        f"SOURCE_CRC = {size[2]}",
+        "",
+        "CATALOG = {",
+    ]
+    for key, texts in translations.items():
+        lines.append(f"    {json.dumps(key)}: {json.dumps(texts[language], ensure_ascii=False)},")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check translations and compile per-language catalogs")
+    parser.add_argument("--check", action="store_true", help="only check; fail if a catalog is out of date")
+    args = parser.parse_args()
+
+    from translations.translations import TRANSLATIONS
+
+    missing = find_missing(TRANSLATIONS)
+    if missing:
+        print(f"{len(missing)} missing translations:")
+        for message in missing:
+            print(f"  {message}")
+        return 1
+
+    size = source_size()
+    stale = []
+    for language in LANGUAGES:
+        path = catalog_path(language)
+        content = render_catalog(language, TRANSLATIONS, size)
+        try:
+            with open(path, encoding="utf-8") as f:
+                up_to_date = f.read() == content
+        except OSError:
+            up_to_date = False
+        if up_to_date:
+            continue
+        if args.check:
+            stale.append(os.path.basename(path))
+            continue
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(content)
+        print(f"Wrote {os.path.basename(path)} ({len(TRANSLATIONS)} keys)")
+
+    if stale:
+        print(f"Out of date: {', '.join(stale)}; run python -m translations.build_catalog")
+        return 1
+    print(f"{len(TRANSLATIONS)} keys, {len(LANGUAGES)} languages, no missing translations")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+# 由 python -m translations.build_catalog 根据 translations.py 生成，请勿手动修改
+
+SOURCE_SIZE = 41015
+SOURCE_NEWLINES = 1233
+SOURCE_CRC = 1543821321
+
+CATALOG = {
+    "environment_info": "Environment Info:",
+    "operating_system": "Operating System:",
+    "python_version": "Python Version:",
+    "sqlite_version": "SQLite Version:",
+    "file_system_permissions": "File System Permissions:",
+    "normal": "Normal",
+    "error_with_msg": "Error - {error}",
+    "app_lock_success": "Acquired {mode} application lock: {path} (took {ms:.2f} ms)",
+    "app_lock_failure": "Could not acquire application lock: {path} (took {ms:.2f} ms)",
+    "lock_mode_shared": "shared",
+    "lock_mode_exclusive": "exclusive",
+    "check_processes": "Checking for residual processes...",
+    "found_processes": "Found {count} residual processes, cleaning up...",
+    "terminated_process": "Terminated process {pid}",
+    "terminate_failed": "Failed to terminate process {pid}: {error}",
+    "process_still_running": "Process {pid} is still running, trying to forcefully terminate...",
+    "process_cleanup_complete": "Process cleanup complete",
+    "no_process_found": "No residual processes found",
+    "xml_parse_error": "Error parsing XML file: {error}",
+    "create_config_dir_error": "Cannot create config directory: {error}",
+    "app_path": "Application Path:",
+    "config_dir": "Config Directory:",
+    "config_file": "Config File:",
+    "history_file": "History File:",
+    "app_path_error": "Error getting application path: {error}",
+    "path_not_writable": "Path {path} not writable: {error}",
+    "db_connected": "Successfully connected to database: {path}",
+    "db_connect_failed": "Failed to connect to database: {error}",
+    "use_memory_db": "Using in-memory database as fallback",
+    "memory_db_failed": "Failed to connect to in-memory database: {error}",
+    "db_init_failed": "Cannot initialize database: connection failed",
+    "db_init_error": "Failed to initialize database: {error}",
+    "migrate_from_json": "Migrating {count} history records from JSON to SQLite...",
+    "migration_complete": "Migration complete",
+    "migration_failed": "Data migration failed: {error}",
+    "save_history_failed": "Cannot save history: database connection failed",
+    "save_record_failed": "Failed to save history record: {error}",
+    "load_history_failed": "Cannot load history: database connection failed",
+    "load_records_failed": "Failed to load history records: {error}",
+    "get_paths_failed": "Failed to get unique paths: {error}",
+    "no_history_table": "History table does not exist, no need to clear",
+    "no_path_history": "No history records found for path '{path}'",
+    "history_empty": "History is already empty",
+    "clear_success": "{message}",
+    "db_closed": "Database connection closed",
+    "db_close_error": "Error closing database connection: {error}",
+    "path_not_exist": "Error: Path does not exist: {path}",
+    "quota_file_not_found": "Quota file not found in directory: {path}",
+    "file_not_exist": "Error: File does not exist: {path}",
+    "common_paths_hint": "Hint: Common quota file paths include:",
+    "analyze_error": "Error analyzing file: {error}",
+    "file_path": "File path:",
+    "quota_info": "Quota information:",
+    "quota_type": "Type:",
+    "current_usage": "Current usage:",
+    "max_limit": "Maximum limit:",
+    "usage_percentage": "Usage percentage:",
+    "valid_until": "Valid until:",
+    "refill_info": "Refill information:",
+    "refill_type": "Refill type:",
+    "next_refill": "Next refill:",
+    "refill_amount": "Refill amount:",
+    "refill_period": "Refill period:",
+    "other_info": "Other information:",
+    "timestamp": "Timestamp:",
+    "usage_status": "Usage status:",
+    "press_enter": "Press Enter to return to menu...",
+    "no_history": "No history records",
+    "total_records": "Displaying {count} records in total",
+    "no_quota_file": "No quota file found",
+    "found_quota_files": "Found {count} quota files:",
+    "auto_analyze": "Auto-analyzing all files...",
+    "analyzing_file": "Analyzing file: {path}",
+    "invalid_option": "Invalid option",
+    "invalid_input": "Invalid input",
+    "non_interactive_warning": "Warning: Running in non-interactive environment, cannot get user input",
+    "use_command_line": "Please use command line arguments instead of interactive mode, for example:",
+    "app_title": "JetBrains AI Assistant Quota Analyzer (v1.0.0)",
+    "menu_analyze_file": "Analyze single file",
+    "menu_auto_find": "Auto-find and analyze all files",
+    "menu_view_history": "View history",
+    "menu_filter_history": "Filter history by path",
+    "menu_common_paths": "Show common paths",
+    "menu_clear_history": "Clear history (delete data)",
+    "menu_help": "Help",
+    "menu_exit": "Exit",
+    "menu_hint": "Hint: Enter a number to select an operation, press Ctrl+C to go back",
+    "recommended_paths": "✨ Recommended history paths:",
+    "recommended_tag": "[Recommended]",
+    "invalid_recommendation": "Invalid recommendation number, please try again",
+    "file_not_exist_error": "Error: File or directory does not exist - {path}",
+    "retry_prompt": "Retry? (y/n, default y):",
+    "no_file_path": "No file path provided",
+    "choose_clear_range": "Please select the range of history to clear:",
+    "clear_all_history": "Clear all history (dangerous: delete all data)",
+    "clear_by_path": "Clear history by file path",
+    "cancel_return": "Cancel and return",
+    "select_operation": "Select operation",
+    "confirm_clear_all": "Are you sure you want to delete all history records? This action cannot be undone (y/n): ",
+    "clear_all_success": "Successfully cleared all history records",
+    "operation_cancelled": "Operation cancelled",
+    "available_paths": "Available file paths",
+    "select_path_clear": "Select the path number to clear history (0 to cancel): ",
+    "operation_cancelled_simple": "Operation cancelled",
+    "confirm_clear_path": "Are you sure you want to delete history records for path {path}? This action cannot be undone (y/n): ",
+    "clear_path_success": "Successfully cleared history records for path {path}",
+    "invalid_choice": "Invalid choice",
+    "recommended_paths_view": "✨ Recommended history paths (you can enter the number to select):",
+    "enter_record_limit_filter": "Please enter the number of records to display, or select a recommended path number (default 10)",
+    "enter_record_limit": "Please enter the number of records to display (default 10)",
+    "all_available_paths": "All available file paths",
+    "only_one_path": "Only one path available: {path}",
+    "select_path_number": "Please select a file path number",
+    "select_path_hint": " (or use R1-R{count} to select a recommended path)",
+    "select_path_return": " (enter 0 to return): ",
+    "common_paths_title": "Common quota file paths:",
+    "idea_paths": "IntelliJ IDEA:",
+    "pycharm_paths": "PyCharm:",
+    "webstorm_paths": "WebStorm:",
+    "paths_tip": "Tip: Replace <version> with your IDE version number (e.g., 2023.1)",
+    "help_title": "Help Information",
+    "usage_tip": "Usage Instructions:",
+    "application_description": "This application is used to analyze JetBrains AI Assistant quota usage",
+    "key_features": "Key Features:",
+    "feature_analyze": "Analyze a single quota file",
+    "feature_auto": "Automatically find and analyze quota files for all IDEs",
+    "feature_history": "View and filter history records",
+    "feature_clear": "Clear history records",
+    "command_line_usage": "Command Line Usage:",
+    "interactive_mode": "Interactive Mode:",
+    "analyze_example": "Analyze Specified File:",
+    "auto_find_example": "Auto-find All Quota Files:",
+    "view_history_example": "View History:",
+    "filter_history_example": "Filter History by Path:",
+    "common_paths_example": "View Common Paths:",
+    "other_help": "For more help information, use the --help parameter",
+    "language_settings": "Language Settings (--lang):",
+    "supported_languages_info": "Supported languages: {languages}",
+    "checking_processes": "Checking for residual processes...",
+    "found_processes_info": "Found residual processes:",
+    "no_processes_found": "No residual processes found",
+    "process_check_error": "Process check failed: {error}",
+    "unsupported_os": "Unsupported operating system: {os}",
+    "app_description": "JetBrains AI Assistant Quota Analyzer",
+    "eof_interrupt": "EOF detected, possibly running in a non-interactive environment",
+    "unexpected_error": "Unexpected error occurred: {error}",
+    "examples": "Examples",
+    "auto_analyzing_all_files": "Auto-analyzing all files...",
+    "analysis_success_count": "Successfully analyzed {count} quota files",
+    "select_file_to_analyze": "Please select a file number to analyze (enter 'a' to analyze all, 'q' to return)",
+    "invalid_option_simple": "Invalid option",
+    "invalid_input_simple": "Invalid input",
+    "process_check_error_simple": "Process check failed: {error}",
+    "unsupported_os_simple": "Unsupported operating system: {os}",
+    "environment_info_detailed": "Environment Information:",
+    "os_info_detailed": "Operating System: {os} {release} ({version})",
+    "python_version_detailed": "Python Version: {version}",
+    "sqlite_version_detailed": "SQLite Version: {version}",
+    "app_path_detailed": "Application Path: {path}",
+    "working_dir_detailed": "Current Working Directory: {path}",
+    "home_dir_detailed": "User Home Directory: {path}",
+    "temp_dir_detailed": "Temporary Directory: {path}",
+    "path_var_detailed": "PATH Environment Variable: {path}",
+    "env_var_error": "Error getting environment variables: {error}",
+    "clear_history_db_error": "Failed to clear history: {count} records still remain",
+    "clear_history_error": "Error clearing history: {error}",
+    "clear_all_success_count": "Successfully cleared all {count} history records",
+    "continue_prompt": "Continue? (y/n):",
+    "welcome": "Welcome to JetBrains AI Assistant Quota Analyzer!",
+    "interactive_warning": "Warning: Running in a non-interactive environment",
+    "interactive_error": "Error: Interactive terminal support required, cannot get user input",
+    "thank_you": "Thank you for using JetBrains AI Assistant Quota Analyzer!",
+    "invalid_option_retry_dot": "Invalid option, please try again.",
+    "version_placeholder": "<version>",
+    "product_placeholder": "<product>",
+    "jetbrains_dir_not_found": "JetBrains directory not found: {path}",
+    "find_quota_files_error": "Error finding quota files: {error}",
+    "enter_file_path_or_select": "Please enter file path or select a recommended path",
+    "username": "Username",
+    "etc": "etc...",
+    "example": "Example",
+    "column_num": "Number",
+    "column_time": "Time",
+    "column_type": "Type",
+    "column_usage": "Usage",
+    "column_current_max": "Current/Max",
+    "column_filepath": "File Path",
+    "set_language_option": "Set interface language (supported: {languages})",
+    "quota_file_unchanged": "Quota file unchanged, using last record: {path}",
+    "fingerprint_cache_stats": "Fingerprint cache: {hits} hits, {misses} misses",
+    "fingerprint_error": "Failed to read file fingerprint: {error}",
+    "no_cache_option": "Ignore the fingerprint cache and always re-parse and record",
+    "rescan_option": "Ignore the quota file discovery index and rescan the filesystem",
+    "discovery_index_error": "Failed to read or write the quota file discovery index: {error}",
+    "batch_summary_title": "Quota Summary",
+    "column_valid_until": "Valid Until",
+    "batch_throughput": "Analyzed {count} files in {seconds:.3f} s ({rate:.1f} files/s)",
+    "watch_option": "Keep watching the auto-found quota files and record history whenever they change",
+    "debounce_option": "Debounce time in seconds after a change in watch mode",
+    "poll_interval_option": "Polling interval in seconds in watch mode, used only when inotify is unavailable",
+    "watch_started": "Watching {count} quota files ({backend}, debounce {debounce} s), press Ctrl+C to stop",
+    "watch_recorded": "[{time}] {path}: {current:.2f}/{maximum:.2f} ({percentage:.2f}%)",
+    "watch_inotify_unavailable": "inotify unavailable, falling back to polling: {error}",
+    "watch_stopped": "Stopped watching",
+    "logs_option": "Analyze quota events in idea.log (log file or IDE base path; the last used path if omitted)",
+    "log_path_cached": "Log file path cached: {path}",
+    "log_path_missing": "No log file or IDE path given and no cached log path, please provide the path once",
+    "log_file_not_found": "Log file not found: {path}",
+    "log_analyzing": "Analyzing AI Assistant quota logs from: {path}",
+    "log_recent_entries": "Recent quota updates (last {count} entries):",
+    "log_diff": " (Diff: {diff})",
+    "log_latest_title": "Latest quota information:",
+    "log_last_updated": "Last Updated: [{time}]",
+    "log_current_usage": "Current Usage: {value} tokens",
+    "log_maximum_quota": "Maximum Quota: {value} tokens",
+    "log_valid_until": "Valid Until: {value}",
+    "log_percentage_used": "Percentage Used: {value}%",
+    "log_no_quota": "No quota information found in the logs.",
+    "log_note": "Note: This information is based on the log file and may not reflect real-time usage.",
+    "log_read_error": "Error reading log file: {error}",
+    "ingest_logs_option": "Import new quota events from idea.log into the database (log file or IDE base path; the last used path if omitted)",
+    "log_rotation_detected": "Log rotation detected, continuing from: {path}",
+    "log_ingest_result": "Imported {count} quota events ({files} files, {size} bytes read)",
+    "log_ingest_error": "Failed to import quota logs: {error}",
+    "scan_logs_option": "Scan one or more (possibly very large) log files or .gz/.zip log bundles with multiple processes and print all quota events in timestamp order",
+    "log_scan_result": "Scanned {files} files ({size} bytes), found {count} quota events in {seconds:.2f} s",
+    "db_schema_upgrade": "Upgrading database schema from version {old} to version {new}...",
+    "db_connected_read_only": "Connected to database (read-only): {path}",
+    "history_writer_started": "Background history writer enabled (up to {batch} rows per batch, {delay}s max delay)",
+    "history_writer_stats": "Background writer: {rows} rows in {batches} batches, {avg_ms:.2f} ms avg / {max_ms:.2f} ms max per batch, max queue depth {max_depth}",
+    "history_seen_count": "(same for {count} snapshots)",
+    "history_compacted": "Rolled up {count} history records older than {days} days into hourly and daily tables",
+    "history_compaction_failed": "Failed to compact history: {error}",
+    "rollup_option": "Show long-range history from hourly or daily rollups (can be combined with -f)",
+    "no_rollups": "No rolled-up history",
+    "column_period": "Period",
+    "column_usage_range": "Usage range",
+    "column_usage_last": "Last usage",
+    "column_samples": "Snapshots",
+    "page_size_option": "Page through history N records at a time (press Enter for the next page in a terminal)",
+    "before_option": "Only show history recorded before this time (ISO format, e.g. 2025-05-01T12:00)",
+    "after_option": "Only show history recorded after this time (ISO format)",
+    "invalid_time_arg": "Invalid time: {value}, use ISO format such as 2025-05-01 or 2025-05-01T12:00",
+    "history_next_page": "Press Enter for the next page, q to stop: ",
+    "product_option": "Only show history of one IDE product, e.g. PyCharm or PyCharm2024.1",
+    "status_option": "Show the latest recorded quota of every IDE (reads only the latest-snapshot table; works with -f and --product)",
+    "status_title": "Current quota status",
+    "status_count": "{count} quota files",
+    "history_journal_compact_failed": "Failed to compact the history journal: {error}",
+    "diagnostics_option": "Print config paths, environment diagnostics and the application lock acquisition time",
+    "history_rollup_range": "History older than {days} days has been rolled up; rollups for that range follow:",
+    "version_info": "JetBrains AI Assistant Quota Analyzer v{version}",
+}
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+# 由 python -m translations.build_catalog 根据 translations.py 生成，请勿手动修改
+
+SOURCE_SIZE = 41015
+SOURCE_NEWLINES = 1233
+SOURCE_CRC = 1543821321
+
+CATALOG = {
+    "environment_info": "环境信息:",
+    "operating_system": "操作系统:",
+    "python_version": "Python版本:",
+    "sqlite_version": "SQLite版本:",
+    "file_system_permissions": "文件系统权限:",
+    "normal": "正常",
+    "error_with_msg": "异常 - {error}",
+    "app_lock_success": "已获取应用程序{mode}锁: {path}（耗时 {ms:.2f} ms）",
+    "app_lock_failure": "未能获取应用程序锁: {path}（耗时 {ms:.2f} ms）",
+    "lock_mode_shared": "共享",
+    "lock_mode_exclusive": "排他",
+    "check_processes": "检查是否存在残留进程...",
+    "found_processes": "发现 {count} 个残留进程，正在清理...",
+    "terminated_process": "已终止进程 {pid}",
+    "terminate_failed": "终止进程 {pid} 失败: {error}",
+    "process_still_running": "进程 {pid} 仍在运行，尝试强制终止...",
+    "process_cleanup_complete": "进程清理完成",
+    "no_process_found": "未发现残留进程",
+    "xml_parse_error": "解析XML文件时出错: {error}",
+    "create_config_dir_error": "无法创建配置目录: {error}",
+    "app_path": "应用程序路径:",
+    "config_dir": "配置目录:",
+    "config_file": "配置文件:",
+    "history_file": "历史文件:",
+    "app_path_error": "获取应用程序路径出错: {error}",
+    "path_not_writable": "路径 {path} 不可写: {error}",
+    "db_connected": "成功连接到数据库: {path}",
+    "db_connect_failed": "连接数据库失败: {error}",
+    "use_memory_db": "使用内存数据库作为备选",
+    "memory_db_failed": "连接内存数据库也失败: {error}",
+    "db_init_failed": "无法初始化数据库：连接失败",
+    "db_init_error": "初始化数据库失败: {error}",
+    "migrate_from_json": "从JSON迁移 {count} 条历史记录到SQLite...",
+    "migration_complete": "迁移完成",
+    "migration_failed": "迁移数据失败: {error}",
+    "save_history_failed": "无法保存历史记录：数据库连接失败",
+    "save_record_failed": "保存历史记录失败: {error}",
+    "load_history_failed": "无法加载历史记录：数据库连接失败",
+    "load_records_failed": "加载历史记录失败: {error}",
+    "get_paths_failed": "获取唯一路径失败: {error}",
+    "no_history_table": "历史记录表不存在，无需清除",
+    "no_path_history": "未找到路径 '{path}' 的历史记录",
+    "history_empty": "历史记录已为空",
+    "clear_success": "{message}",
+    "db_closed": "数据库连接已关闭",
+    "db_close_error": "关闭数据库连接时出错: {error}",
+    "path_not_exist": "错误: 路径不存在: {path}",
+    "quota_file_not_found": "在目录中未找到配额文件: {path}",
+    "file_not_exist": "错误: 文件不存在: {path}",
+    "common_paths_hint": "提示: 常见的配额文件路径包括:",
+    "analyze_error": "分析文件时出错: {error}",
+    "file_path": "文件路径:",
+    "quota_info": "配额信息:",
+    "quota_type": "类型:",
+    "current_usage": "当前使用:",
+    "max_limit": "最大限制:",
+    "usage_percentage": "使用百分比:",
+    "valid_until": "有效期至:",
+    "refill_info": "补充信息:",
+    "refill_type": "补充类型:",
+    "next_refill": "下次补充:",
+    "refill_amount": "补充数量:",
+    "refill_period": "补充周期:",
+    "other_info": "其他信息:",
+    "timestamp": "时间戳:",
+    "usage_status": "使用情况:",
+    "press_enter": "按回车键返回菜单...",
+    "no_history": "没有历史记录",
+    "total_records": "共显示 {count} 条记录",
+    "no_quota_file": "未找到配额文件",
+    "found_quota_files": "找到 {count} 个配额文件:",
+    "auto_analyze": "自动分析所有文件...",
+    "analyzing_file": "分析文件: {path}",
+    "invalid_option": "无效的选项",
+    "invalid_input": "无效的输入",
+    "non_interactive_warning": "警告: 在非交互式环境中运行，无法获取用户输入",
+    "use_command_line": "请使用命令行参数代替交互式模式，例如:",
+    "app_title": "JetBrains AI Assistant 配额分析器 (v1.0.0)",
+    "menu_analyze_file": "分析单个文件",
+    "menu_auto_find": "自动查找并分析所有文件",
+    "menu_view_history": "查看历史记录",
+    "menu_filter_history": "按路径筛选历史记录",
+    "menu_common_paths": "显示常见路径",
+    "menu_clear_history": "清除历史记录 (删除数据)",
+    "menu_help": "帮助",
+    "menu_exit": "退出",
+    "menu_hint": "提示: 输入数字选择操作，按Ctrl+C返回上一级",
+    "recommended_paths": "✨ 推荐的历史路径:",
+    "recommended_tag": "[推荐]",
+    "invalid_recommendation": "无效的推荐路径编号，请重试",
+    "file_not_exist_error": "错误: 文件或目录不存在 - {path}",
+    "retry_prompt": "是否重试? (y/n, 默认y):",
+    "no_file_path": "未提供文件路径",
+    "choose_clear_range": "请选择要清除的历史记录范围:",
+    "clear_all_history": "清除所有历史记录 (危险: 删除所有数据)",
+    "clear_by_path": "按文件路径清除历史记录",
+    "cancel_return": "取消并返回",
+    "select_operation": "选择操作",
+    "confirm_clear_all": "确定要删除所有历史记录吗? 此操作不可恢复 (y/n): ",
+    "clear_all_success": "已成功清除所有历史记录",
+    "operation_cancelled": "操作已取消",
+    "available_paths": "可用的文件路径",
+    "select_path_clear": "选择要清除历史记录的路径编号 (0表示取消): ",
+    "operation_cancelled_simple": "操作已取消",
+    "confirm_clear_path": "确定要删除路径 {path} 的历史记录吗? 此操作不可恢复 (y/n): ",
+    "clear_path_success": "已成功清除路径 {path} 的历史记录",
+    "invalid_choice": "无效的选择",
+    "recommended_paths_view": "✨ 推荐的历史路径 (可以直接输入编号进行选择):",
+    "enter_record_limit_filter": "请输入要显示的记录数量，或选择推荐路径的编号 (默认10)",
+    "enter_record_limit": "请输入要显示的记录数量 (默认10)",
+    "all_available_paths": "所有可用的文件路径",
+    "only_one_path": "只有一个路径可选: {path}",
+    "select_path_number": "请选择文件路径编号",
+    "select_path_hint": " (或使用R1-R{count}选择推荐路径)",
+    "select_path_return": " (输入0返回): ",
+    "common_paths_title": "常见配额文件路径:",
+    "idea_paths": "IntelliJ IDEA:",
+    "pycharm_paths": "PyCharm:",
+    "webstorm_paths": "WebStorm:",
+    "paths_tip": "提示: 将 <版本> 替换为您的IDE版本号 (例如: 2023.1)",
+    "help_title": "帮助信息",
+    "usage_tip": "使用说明:",
+    "application_description": "本应用程序用于分析JetBrains AI Assistant配额使用情况",
+    "key_features": "主要功能:",
+    "feature_analyze": "分析单个配额文件",
+    "feature_auto": "自动查找并分析所有IDE的配额文件",
+    "feature_history": "查看和筛选历史记录",
+    "feature_clear": "清除历史记录",
+    "command_line_usage": "命令行使用方式:",
+    "interactive_mode": "交互式模式:",
+    "analyze_example": "分析指定文件:",
+    "auto_find_example": "自动查找所有配额文件:",
+    "view_history_example": "查看历史记录:",
+    "filter_history_example": "按路径筛选历史记录:",
+    "common_paths_example": "查看常见路径:",
+    "other_help": "更多帮助信息，请使用 --help 参数",
+    "language_settings": "语言设置 (--lang):",
+    "supported_languages_info": "支持的语言: {languages}",
+    "checking_processes": "检查是否存在残留进程...",
+    "found_processes_info": "发现残留进程:",
+    "no_processes_found": "未发现残留进程",
+    "process_check_error": "进程检查失败: {error}",
+    "unsupported_os": "不支持的操作系统: {os}",
+    "app_description": "JetBrains AI Assistant 配额分析器",
+    "eof_interrupt": "检测到EOF，可能在非交互式环境中运行",
+    "unexpected_error": "发生意外错误: {error}",
+    "examples": "示例",
+    "auto_analyzing_all_files": "自动分析所有文件...",
+    "analysis_success_count": "成功分析了 {count} 个配额文件",
+    "select_file_to_analyze": "请选择要分析的文件编号 (输入 'a' 分析所有, 'q' 返回)",
+    "invalid_option_simple": "无效的选项",
+    "invalid_input_simple": "无效的输入",
+    "process_check_error_simple": "进程检查失败: {error}",
+    "unsupported_os_simple": "不支持的操作系统: {os}",
+    "environment_info_detailed": "环境信息:",
+    "os_info_detailed": "操作系统: {os} {release} ({version})",
+    "python_version_detailed": "Python 版本: {version}",
+    "sqlite_version_detailed": "SQLite 版本: {version}",
+    "app_path_detailed": "应用程序路径: {path}",
+    "working_dir_detailed": "当前工作目录: {path}",
+    "home_dir_detailed": "用户主目录: {path}",
+    "temp_dir_detailed": "临时目录: {path}",
+    "path_var_detailed": "PATH 环境变量: {path}",
+    "env_var_error": "获取环境变量时出错: {error}",
+    "clear_history_db_error": "清除历史记录失败：仍有 {count} 条记录未删除",
+    "clear_history_error": "清除历史记录时出错: {error}",
+    "clear_all_success_count": "已成功清除所有 {count} 条历史记录",
+    "continue_prompt": "是否继续? (y/n):",
+    "welcome": "欢迎使用 JetBrains AI Assistant 配额分析器!",
+    "interactive_warning": "警告: 在非交互式环境中运行",
+    "interactive_error": "错误: 需要交互式终端支持, 无法获取用户输入",
+    "thank_you": "感谢使用 JetBrains AI Assistant 配额分析器!",
+    "invalid_option_retry_dot": "无效的选项，请重试。",
+    "version_placeholder": "<版本>",
+    "product_placeholder": "<产品>",
+    "jetbrains_dir_not_found": "未找到JetBrains目录: {path}",
+    "find_quota_files_error": "查找配额文件时出错: {error}",
+    "enter_file_path_or_select": "请输入文件路径或选择推荐路径",
+    "username": "用户名",
+    "etc": "等等...",
+    "example": "示例",
+    "column_num": "编号",
+    "column_time": "时间",
+    "column_type": "类型",
+    "column_usage": "使用率",
+    "column_current_max": "当前/最大",
+    "column_filepath": "文件路径",
+    "set_language_option": "设置界面语言 (支持: {languages})",
+    "quota_file_unchanged": "配额文件未变化，使用上次的记录: {path}",
+    "fingerprint_cache_stats": "文件指纹缓存: 命中 {hits} 次，未命中 {misses} 次",
+    "fingerprint_error": "读取文件指纹失败: {error}",
+    "no_cache_option": "忽略文件指纹缓存，总是重新解析并记录",
+    "rescan_option": "忽略配额文件发现索引，重新完整扫描文件系统",
+    "discovery_index_error": "读写配额文件发现索引失败: {error}",
+    "batch_summary_title": "配额汇总",
+    "column_valid_until": "有效期至",
+    "batch_throughput": "共分析 {count} 个文件，耗时 {seconds:.3f} 秒（{rate:.1f} 个文件/秒）",
+    "watch_option": "持续监视自动找到的配额文件，文件变化时记录历史",
+    "debounce_option": "监视模式下文件变化后的防抖时间（秒）",
+    "poll_interval_option": "监视模式下轮询文件状态的间隔（秒），仅在 inotify 不可用时使用",
+    "watch_started": "开始监视 {count} 个配额文件（{backend}，防抖 {debounce} 秒），按 Ctrl+C 停止",
+    "watch_recorded": "[{time}] {path}: {current:.2f}/{maximum:.2f} ({percentage:.2f}%)",
+    "watch_inotify_unavailable": "inotify 不可用，改用轮询: {error}",
+    "watch_stopped": "已停止监视",
+    "logs_option": "分析 idea.log 中的配额日志（可指定日志文件或IDE基础路径，省略时使用上次的路径）",
+    "log_path_cached": "日志文件路径已缓存: {path}",
+    "log_path_missing": "未指定日志文件或IDE路径，且没有缓存的日志路径，请先指定一次路径",
+    "log_file_not_found": "未找到日志文件: {path}",
+    "log_analyzing": "正在分析配额日志: {path}",
+    "log_recent_entries": "最近的配额更新（最后 {count} 条）:",
+    "log_diff": " (差值: {diff})",
+    "log_latest_title": "最新配额信息:",
+    "log_last_updated": "最后更新: [{time}]",
+    "log_current_usage": "当前使用量: {value} tokens",
+    "log_maximum_quota": "最大配额: {value} tokens",
+    "log_valid_until": "有效期至: {value}",
+    "log_percentage_used": "已使用百分比: {value}%",
+    "log_no_quota": "日志中未找到配额信息。",
+    "log_note": "注意: 此信息基于日志文件，可能不反映实时使用情况。",
+    "log_read_error": "读取日志文件时出错: {error}",
+    "ingest_logs_option": "将 idea.log 中新增的配额事件导入数据库（可指定日志文件或IDE基础路径，省略时使用上次的路径）",
+    "log_rotation_detected": "检测到日志轮转，继续读取: {path}",
+    "log_ingest_result": "已导入 {count} 条配额事件（读取 {files} 个文件，共 {size} 字节）",
+    "log_ingest_error": "导入配额日志失败: {error}",
+    "scan_logs_option": "使用多进程扫描一个或多个（可能很大的）日志文件或 .gz/.zip 日志包，按时间顺序输出所有配额事件",
+    "log_scan_result": "扫描了 {files} 个文件（{size} 字节），找到 {count} 条配额事件，耗时 {seconds:.2f} 秒",
+    "db_schema_upgrade": "正在将数据库结构从版本 {old} 升级到版本 {new}...",
+    "db_connected_read_only": "已以只读方式连接到数据库: {path}",
+    "history_writer_started": "已启用历史记录后台写入（每批最多 {batch} 条，最长等待 {delay} 秒）",
+    "history_writer_stats": "后台写入: {rows} 条记录，{batches} 批，平均每批 {avg_ms:.2f} 毫秒，最长 {max_ms:.2f} 毫秒，最大队列深度 {max_depth}",
+    "history_seen_count": "(连续 {count} 次相同)",
+    "history_compacted": "已将 {count} 条超过 {days} 天的历史记录汇总到小时和天统计表",
+    "history_compaction_failed": "压缩历史记录失败: {error}",
+    "rollup_option": "查看按小时 (hourly) 或按天 (daily) 汇总的长期历史，可与 -f 一起使用",
+    "no_rollups": "没有汇总的历史统计",
+    "column_period": "时间段",
+    "column_usage_range": "使用率范围",
+    "column_usage_last": "最后使用率",
+    "column_samples": "快照数",
+    "page_size_option": "分页显示历史记录，每页 N 条（在终端中每页之后按回车继续）",
+    "before_option": "只显示早于该时间的历史记录（ISO 格式，例如 2025-05-01T12:00）",
+    "after_option": "只显示晚于该时间的历史记录（ISO 格式）",
+    "invalid_time_arg": "无效的时间: {value}，请使用 ISO 格式，例如 2025-05-01 或 2025-05-01T12:00",
+    "history_next_page": "按回车显示下一页，输入 q 结束: ",
+    "product_option": "只显示某个 IDE 产品的历史记录，例如 PyCharm 或 PyCharm2024.1",
+    "status_option": "显示每个 IDE 最近一次记录的配额状态（只读取最新快照表，可与 -f、--product 一起使用）",
+    "status_title": "当前配额状态",
+    "status_count": "共 {count} 个配额文件",
+    "history_journal_compact_failed": "压缩历史日志失败: {error}",
+    "diagnostics_option": "打印配置路径、运行环境等诊断信息，以及应用程序锁的获取耗时",
+    "history_rollup_range": "超过 {days} 天的原始历史记录已汇总，以下是该时间范围内的汇总统计：",
+    "version_info": "JetBrains AI Assistant配额分析器 v{version}",
+}
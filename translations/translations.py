@@ -37,16 +37,20 @@ TRANSLATIONS = {
     
     # 应用程序锁
     "app_lock_success": {
-        "zh_cn": "成功获取应用程序锁 (端口: {port})",
-        "en": "Successfully acquired application lock (port: {port})"
+        "zh_cn": "已获取应用程序{mode}锁: {path}（耗时 {ms:.2f} ms）",
+        "en": "Acquired {mode} application lock: {path} (took {ms:.2f} ms)"
     },
     "app_lock_failure": {
-        "zh_cn": "无法获取应用程序锁 (端口: {port}): {error}，可能已有实例在运行",
-        "en": "Failed to acquire application lock (port: {port}): {error}, another instance may be running"
+        "zh_cn": "未能获取应用程序锁: {path}（耗时 {ms:.2f} ms）",
+        "en": "Could not acquire application lock: {path} (took {ms:.2f} ms)"
     },
-    "app_lock_released": {
-        "zh_cn": "已释放应用程序锁 (端口: {port})",
-        "en": "Released application lock (port: {port})"
+    "lock_mode_shared": {
+        "zh_cn": "共享",
+        "en": "shared"
+    },
+    "lock_mode_exclusive": {
+        "zh_cn": "排他",
+        "en": "exclusive"
     },
     
     # 进程相关
@@ -78,10 +82,6 @@ TRANSLATIONS = {
         "zh_cn": "未发现残留进程",
         "en": "No residual processes found"
     },
-    "process_check_failed": {
-        "zh_cn": "进程检查失败: {error}",
-        "en": "Process check failed: {error}"
-    },
     
     # 解析错误
     "xml_parse_error": {
@@ -658,18 +658,6 @@ TRANSLATIONS = {
     },
 
     # 进程检查相关的翻译键
-    "checking_processes_simple": {
-        "zh_cn": "检查是否存在残留进程...",
-        "en": "Checking for residual processes..."
-    },
-    "found_processes_simple": {
-        "zh_cn": "发现残留进程:",
-        "en": "Found residual processes:"
-    },
-    "no_processes_found_simple": {
-        "zh_cn": "未发现残留进程",
-        "en": "No residual processes found"
-    },
     "process_check_error_simple": {
         "zh_cn": "进程检查失败: {error}",
         "en": "Process check failed: {error}"
@@ -774,10 +762,6 @@ TRANSLATIONS = {
     },
 
     # 路径显示相关的翻译键
-    "app_lock_failure_simple": {
-        "zh_cn": "无法获取应用程序锁 (端口: {port})",
-        "en": "Failed to acquire application lock (port: {port})"
-    },
     "jetbrains_dir_not_found": {
         "zh_cn": "未找到JetBrains目录: {path}",
         "en": "JetBrains directory not found: {path}"
@@ -916,6 +900,10 @@ TRANSLATIONS = {
         "zh_cn": "等等...",
         "en": "etc..."
     },
+    "example": {
+        "zh_cn": "示例",
+        "en": "Example"
+    },
     "column_num": {
         "zh_cn": "编号",
         "en": "Number"
@@ -946,6 +934,294 @@ TRANSLATIONS = {
         "en": "Set interface language (supported: {languages})"
     },
     
+    # 文件指纹缓存
+    "quota_file_unchanged": {
+        "zh_cn": "配额文件未变化，使用上次的记录: {path}",
+        "en": "Quota file unchanged, using last record: {path}"
+    },
+    "fingerprint_cache_stats": {
+        "zh_cn": "文件指纹缓存: 命中 {hits} 次，未命中 {misses} 次",
+        "en": "Fingerprint cache: {hits} hits, {misses} misses"
+    },
+    "fingerprint_error": {
+        "zh_cn": "读取文件指纹失败: {error}",
+        "en": "Failed to read file fingerprint: {error}"
+    },
+    "no_cache_option": {
+        "zh_cn": "忽略文件指纹缓存，总是重新解析并记录",
+        "en": "Ignore the fingerprint cache and always re-parse and record"
+    },
+
+    # 配额文件发现索引
+    "rescan_option": {
+        "zh_cn": "忽略配额文件发现索引，重新完整扫描文件系统",
+        "en": "Ignore the quota file discovery index and rescan the filesystem"
+    },
+    "discovery_index_error": {
+        "zh_cn": "读写配额文件发现索引失败: {error}",
+        "en": "Failed to read or write the quota file discovery index: {error}"
+    },
+
+    # 批量分析
+    "batch_summary_title": {
+        "zh_cn": "配额汇总",
+        "en": "Quota Summary"
+    },
+    "column_valid_until": {
+        "zh_cn": "有效期至",
+        "en": "Valid Until"
+    },
+    "batch_throughput": {
+        "zh_cn": "共分析 {count} 个文件，耗时 {seconds:.3f} 秒（{rate:.1f} 个文件/秒）",
+        "en": "Analyzed {count} files in {seconds:.3f} s ({rate:.1f} files/s)"
+    },
+
+    # 监视模式
+    "watch_option": {
+        "zh_cn": "持续监视自动找到的配额文件，文件变化时记录历史",
+        "en": "Keep watching the auto-found quota files and record history whenever they change"
+    },
+    "debounce_option": {
+        "zh_cn": "监视模式下文件变化后的防抖时间（秒）",
+        "en": "Debounce time in seconds after a change in watch mode"
+    },
+    "poll_interval_option": {
+        "zh_cn": "监视模式下轮询文件状态的间隔（秒），仅在 inotify 不可用时使用",
+        "en": "Polling interval in seconds in watch mode, used only when inotify is unavailable"
+    },
+    "watch_started": {
+        "zh_cn": "开始监视 {count} 个配额文件（{backend}，防抖 {debounce} 秒），按 Ctrl+C 停止",
+        "en": "Watching {count} quota files ({backend}, debounce {debounce} s), press Ctrl+C to stop"
+    },
+    "watch_recorded": {
+        "zh_cn": "[{time}] {path}: {current:.2f}/{maximum:.2f} ({percentage:.2f}%)",
+        "en": "[{time}] {path}: {current:.2f}/{maximum:.2f} ({percentage:.2f}%)"
+    },
+    "watch_inotify_unavailable": {
+        "zh_cn": "inotify 不可用，改用轮询: {error}",
+        "en": "inotify unavailable, falling back to polling: {error}"
+    },
+    "watch_stopped": {
+        "zh_cn": "已停止监视",
+        "en": "Stopped watching"
+    },
+
+    # 配额日志分析
+    "logs_option": {
+        "zh_cn": "分析 idea.log 中的配额日志（可指定日志文件或IDE基础路径，省略时使用上次的路径）",
+        "en": "Analyze quota events in idea.log (log file or IDE base path; the last used path if omitted)"
+    },
+    "log_path_cached": {
+        "zh_cn": "日志文件路径已缓存: {path}",
+        "en": "Log file path cached: {path}"
+    },
+    "log_path_missing": {
+        "zh_cn": "未指定日志文件或IDE路径，且没有缓存的日志路径，请先指定一次路径",
+        "en": "No log file or IDE path given and no cached log path, please provide the path once"
+    },
+    "log_file_not_found": {
+        "zh_cn": "未找到日志文件: {path}",
+        "en": "Log file not found: {path}"
+    },
+    "log_analyzing": {
+        "zh_cn": "正在分析配额日志: {path}",
+        "en": "Analyzing AI Assistant quota logs from: {path}"
+    },
+    "log_recent_entries": {
+        "zh_cn": "最近的配额更新（最后 {count} 条）:",
+        "en": "Recent quota updates (last {count} entries):"
+    },
+    "log_diff": {
+        "zh_cn": " (差值: {diff})",
+        "en": " (Diff: {diff})"
+    },
+    "log_latest_title": {
+        "zh_cn": "最新配额信息:",
+        "en": "Latest quota information:"
+    },
+    "log_last_updated": {
+        "zh_cn": "最后更新: [{time}]",
+        "en": "Last Updated: [{time}]"
+    },
+    "log_current_usage": {
+        "zh_cn": "当前使用量: {value} tokens",
+        "en": "Current Usage: {value} tokens"
+    },
+    "log_maximum_quota": {
+        "zh_cn": "最大配额: {value} tokens",
+        "en": "Maximum Quota: {value} tokens"
+    },
+    "log_valid_until": {
+        "zh_cn": "有效期至: {value}",
+        "en": "Valid Until: {value}"
+    },
+    "log_percentage_used": {
+        "zh_cn": "已使用百分比: {value}%",
+        "en": "Percentage Used: {value}%"
+    },
+    "log_no_quota": {
+        "zh_cn": "日志中未找到配额信息。",
+        "en": "No quota information found in the logs."
+    },
+    "log_note": {
+        "zh_cn": "注意: 此信息基于日志文件，可能不反映实时使用情况。",
+        "en": "Note: This information is based on the log file and may not reflect real-time usage."
+    },
+    "log_read_error": {
+        "zh_cn": "读取日志文件时出错: {error}",
+        "en": "Error reading log file: {error}"
+    },
+
+    # 配额日志导入
+    "ingest_logs_option": {
+        "zh_cn": "将 idea.log 中新增的配额事件导入数据库（可指定日志文件或IDE基础路径，省略时使用上次的路径）",
+        "en": "Import new quota events from idea.log into the database (log file or IDE base path; the last used path if omitted)"
+    },
+    "log_rotation_detected": {
+        "zh_cn": "检测到日志轮转，继续读取: {path}",
+        "en": "Log rotation detected, continuing from: {path}"
+    },
+    "log_ingest_result": {
+        "zh_cn": "已导入 {count} 条配额事件（读取 {files} 个文件，共 {size} 字节）",
+        "en": "Imported {count} quota events ({files} files, {size} bytes read)"
+    },
+    "log_ingest_error": {
+        "zh_cn": "导入配额日志失败: {error}",
+        "en": "Failed to import quota logs: {error}"
+    },
+
+    # 批量日志扫描
+    "scan_logs_option": {
+        "zh_cn": "使用多进程扫描一个或多个（可能很大的）日志文件或 .gz/.zip 日志包，按时间顺序输出所有配额事件",
+        "en": "Scan one or more (possibly very large) log files or .gz/.zip log bundles with multiple processes and print all quota events in timestamp order"
+    },
+    "log_scan_result": {
+        "zh_cn": "扫描了 {files} 个文件（{size} 字节），找到 {count} 条配额事件，耗时 {seconds:.2f} 秒",
+        "en": "Scanned {files} files ({size} bytes), found {count} quota events in {seconds:.2f} s"
+    },
+
+    # 数据库结构版本
+    "db_schema_upgrade": {
+        "zh_cn": "正在将数据库结构从版本 {old} 升级到版本 {new}...",
+        "en": "Upgrading database schema from version {old} to version {new}..."
+    },
+
+    # 数据库并发访问
+    "db_connected_read_only": {
+        "zh_cn": "已以只读方式连接到数据库: {path}",
+        "en": "Connected to database (read-only): {path}"
+    },
+
+    # 历史记录后台写入
+    "history_writer_started": {
+        "zh_cn": "已启用历史记录后台写入（每批最多 {batch} 条，最长等待 {delay} 秒）",
+        "en": "Background history writer enabled (up to {batch} rows per batch, {delay}s max delay)"
+    },
+    "history_writer_stats": {
+        "zh_cn": "后台写入: {rows} 条记录，{batches} 批，平均每批 {avg_ms:.2f} 毫秒，最长 {max_ms:.2f} 毫秒，最大队列深度 {max_depth}",
+        "en": "Background writer: {rows} rows in {batches} batches, {avg_ms:.2f} ms avg / {max_ms:.2f} ms max per batch, max queue depth {max_depth}"
+    },
+
+    # 合并存储相同快照
+    "history_seen_count": {
+        "zh_cn": "(连续 {count} 次相同)",
+        "en": "(same for {count} snapshots)"
+    },
+
+    # 历史记录保留与汇总
+    "history_compacted": {
+        "zh_cn": "已将 {count} 条超过 {days} 天的历史记录汇总到小时和天统计表",
+        "en": "Rolled up {count} history records older than {days} days into hourly and daily tables"
+    },
+    "history_compaction_failed": {
+        "zh_cn": "压缩历史记录失败: {error}",
+        "en": "Failed to compact history: {error}"
+    },
+    "rollup_option": {
+        "zh_cn": "查看按小时 (hourly) 或按天 (daily) 汇总的长期历史，可与 -f 一起使用",
+        "en": "Show long-range history from hourly or daily rollups (can be combined with -f)"
+    },
+    "no_rollups": {
+        "zh_cn": "没有汇总的历史统计",
+        "en": "No rolled-up history"
+    },
+    "column_period": {
+        "zh_cn": "时间段",
+        "en": "Period"
+    },
+    "column_usage_range": {
+        "zh_cn": "使用率范围",
+        "en": "Usage range"
+    },
+    "column_usage_last": {
+        "zh_cn": "最后使用率",
+        "en": "Last usage"
+    },
+    "column_samples": {
+        "zh_cn": "快照数",
+        "en": "Snapshots"
+    },
+
+    # 历史记录分页
+    "page_size_option": {
+        "zh_cn": "分页显示历史记录，每页 N 条（在终端中每页之后按回车继续）",
+        "en": "Page through history N records at a time (press Enter for the next page in a terminal)"
+    },
+    "before_option": {
+        "zh_cn": "只显示早于该时间的历史记录（ISO 格式，例如 2025-05-01T12:00）",
+        "en": "Only show history recorded before this time (ISO format, e.g. 2025-05-01T12:00)"
+    },
+    "after_option": {
+        "zh_cn": "只显示晚于该时间的历史记录（ISO 格式）",
+        "en": "Only show history recorded after this time (ISO format)"
+    },
+    "invalid_time_arg": {
+        "zh_cn": "无效的时间: {value}，请使用 ISO 格式，例如 2025-05-01 或 2025-05-01T12:00",
+        "en": "Invalid time: {value}, use ISO format such as 2025-05-01 or 2025-05-01T12:00"
+    },
+    "history_next_page": {
+        "zh_cn": "按回车显示下一页，输入 q 结束: ",
+        "en": "Press Enter for the next page, q to stop: "
+    },
+
+    # 按 IDE 产品过滤
+    "product_option": {
+        "zh_cn": "只显示某个 IDE 产品的历史记录，例如 PyCharm 或 PyCharm2024.1",
+        "en": "Only show history of one IDE product, e.g. PyCharm or PyCharm2024.1"
+    },
+
+    # 最新配额状态
+    "status_option": {
+        "zh_cn": "显示每个 IDE 最近一次记录的配额状态（只读取最新快照表，可与 -f、--product 一起使用）",
+        "en": "Show the latest recorded quota of every IDE (reads only the latest-snapshot table; works with -f and --product)"
+    },
+    "status_title": {
+        "zh_cn": "当前配额状态",
+        "en": "Current quota status"
+    },
+    "status_count": {
+        "zh_cn": "共 {count} 个配额文件",
+        "en": "{count} quota files"
+    },
+
+    # JSON 历史日志
+    "history_journal_compact_failed": {
+        "zh_cn": "压缩历史日志失败: {error}",
+        "en": "Failed to compact the history journal: {error}"
+    },
+
+    # 启动与诊断
+    "diagnostics_option": {
+        "zh_cn": "打印配置路径、运行环境等诊断信息，以及应用程序锁的获取耗时",
+        "en": "Print config paths, environment diagnostics and the application lock acquisition time"
+    },
+
+    # 超出保留期的历史记录查询
+    "history_rollup_range": {
+        "zh_cn": "超过 {days} 天的原始历史记录已汇总，以下是该时间范围内的汇总统计：",
+        "en": "History older than {days} days has been rolled up; rollups for that range follow:"
+    },
+
     # 版本信息
     "version_info": {
         "zh_cn": "JetBrains AI Assistant配额分析器 v{version}",